@@ -10,6 +10,7 @@ import os
 from decimal import Decimal
 from flask import Flask
 from src.models.database import init_db, db, Brand, Perfume, Note, PerfumeNote
+from src.utils.note_normalizer import luxury_classifier
 
 def create_app():
     """Flask uygulaması oluştur"""
@@ -38,27 +39,7 @@ def get_or_create_note(note_name: str, note_type: str = 'middle') -> Note:
 
 def determine_note_category(note_name: str) -> str:
     """Nota kategorisini belirle"""
-    note_name_lower = note_name.lower()
-    
-    categories = {
-        'citrus': ['bergamot', 'lemon', 'orange', 'grapefruit', 'mandarin', 'lime', 'limon', 'portakal'],
-        'floral': ['rose', 'jasmine', 'lavender', 'iris', 'neroli', 'gardenia', 'orchid', 'gül', 'yasemin'],
-        'fruity': ['apple', 'peach', 'pear', 'pineapple', 'mango', 'strawberry', 'raspberry', 'elma', 'şeftali'],
-        'spicy': ['pepper', 'cinnamon', 'clove', 'ginger', 'cardamom', 'saffron', 'biber', 'tarçın'],
-        'woody': ['cedar', 'sandalwood', 'vetiver', 'patchouli', 'oud', 'sedir', 'sandal'],
-        'sweet': ['vanilla', 'caramel', 'honey', 'sugar', 'vanilya', 'karamel'],
-        'gourmand': ['coffee', 'chocolate', 'almond', 'kahve', 'çikolata'],
-        'amber': ['amber', 'ambergris'],
-        'musk': ['musk', 'misk'],
-        'leather': ['leather', 'deri'],
-        'tobacco': ['tobacco', 'tütün']
-    }
-    
-    for category, keywords in categories.items():
-        if any(keyword in note_name_lower for keyword in keywords):
-            return category
-    
-    return 'other'
+    return luxury_classifier.classify(note_name)
 
 def add_perfume_notes(perfume, notes_data):
     """Parfüme notaları ekle"""
@@ -8,6 +8,15 @@ import requests
 from bs4 import BeautifulSoup
 import urllib.parse
 
+import numpy as np
+
+from src.utils.catalog_cache import CatalogCache
+from src.utils.json_stream import iter_json_records
+from src.utils.note_registry import note_key, note_registry
+from src.utils.note_vectors import NoteVectorStore
+from src.utils.search_index import PerfumeSearchIndex, iter_note_names
+from src.utils.similarity_engine import NoteMatrix
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
@@ -15,23 +24,23 @@ app = Flask(__name__, static_folder='.')
 CORS(app)  # Enable CORS for all routes
 
 # Load data files
-def load_bargello_data():
-    """Load Bargello perfume data"""
+# The loaders are generators over src.utils.json_stream: records are parsed
+# incrementally from JSON arrays or NDJSON and consumed by the processing
+# loops below, so a whole dump never sits in memory as one parsed list.
+def iter_catalog_file(path):
+    """Yield perfume records from a JSON array / NDJSON file"""
     try:
-        with open('bargello_parfumler.json', 'r', encoding='utf-8') as f:
-            return json.load(f)
+        yield from iter_json_records(path)
     except FileNotFoundError:
-        logging.warning("bargello_parfumler.json not found")
-        return []
+        logging.warning(f"{path} not found")
+
+def load_bargello_data():
+    """Load Bargello perfume data"""
+    return iter_catalog_file('bargello_parfumler.json')
 
 def load_muscent_data():
     """Load Muscent perfume data"""
-    try:
-        with open('muscent_parfumler.json', 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        logging.warning("muscent_parfumler.json not found")
-        return []
+    return iter_catalog_file('muscent_parfumler.json')
 
 def load_zara_data():
     """Load Zara perfume data"""
@@ -41,21 +50,11 @@ def load_zara_data():
         'zara_mens_perfumes_20250610_020110.json'
     ]
     
-    all_data = []
+    # A file holding a single object yields that object as one record
     for file in zara_files:
-        try:
-            with open(file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                if isinstance(data, list):
-                    all_data.extend(data)
-                else:
-                    all_data.append(data)
-        except FileNotFoundError:
-            logging.warning(f"{file} not found")
-    
-    return all_data
+        yield from iter_catalog_file(file)
 
-# Load all data at startup
+# Stream all data at startup
 bargello_perfumes = load_bargello_data()
 muscent_perfumes = load_muscent_data()
 zara_perfumes = load_zara_data()
@@ -98,6 +97,7 @@ for perfume in bargello_perfumes:
         },
         'gender': perfume.get('cinsiyet', 'Unisex'),
         'family': perfume.get('aile', ''),
+        'description': perfume.get('aciklama', ''),
         'source': 'bargello',
         'product_url': perfume.get('link', '')
     }
@@ -118,6 +118,7 @@ for perfume in muscent_perfumes:
         },
         'gender': perfume.get('gender', 'Unisex'),
         'family': perfume.get('family', ''),
+        'description': perfume.get('aciklama', '') or perfume.get('description', ''),
         'source': 'muscent',
         'product_url': perfume.get('url', '')
     }
@@ -152,6 +153,7 @@ for perfume in zara_perfumes:
         },
         'gender': perfume.get('gender', 'Unisex'),
         'family': perfume.get('family', ''),
+        'description': perfume.get('description', ''),
         'source': 'zara',
         'product_url': perfume.get('url', '')
     }
@@ -159,6 +161,120 @@ for perfume in zara_perfumes:
 
 logging.info(f"Loaded {len(all_perfumes)} perfumes from all sources")
 
+def note_names_of(perfume):
+    """Note names of a perfume, skipping empty / whitespace-only names (as NoteVectorStore does)"""
+    return [name for name in iter_note_names(perfume) if note_key(name)]
+
+def build_indexes():
+    """Build the lookup and search structures for the loaded catalog"""
+    global search_index, note_vectors, note_vocabulary, catalog_matrix, catalog_genders
+    # Inverted search index, BM25 text index and id / (source, name) lookup maps
+    search_index = PerfumeSearchIndex(all_perfumes)
+    # Note bitsets and the lazily filled top-K alternatives cache
+    note_vectors = NoteVectorStore(all_perfumes)
+    # Packed-bit note matrix for vectorized Jaccard scoring, columns are canonical note ids
+    note_vocabulary = note_registry
+    catalog_matrix = NoteMatrix.from_note_sets(note_vocabulary, (note_names_of(p) for p in all_perfumes))
+    catalog_genders = np.array([(p.get('gender') or '').lower() for p in all_perfumes])
+    # Serialized brand / family / note listings belong to the previous catalog
+    catalog_cache.bump()
+
+# Pre-serialized JSON for the catalog listing endpoints (own instance, not shared with server.py)
+catalog_cache = CatalogCache()
+
+build_indexes()
+
+def resolve_product_url(perfume):
+    """Product URL of the first record with the same source and name"""
+    first = search_index.get_by_source_name(perfume.get('source'), perfume.get('name'))
+    return (first or perfume).get('product_url', '')
+
+# Mock luxury perfumes for the main page
+# In a real app, you'd have a separate luxury perfumes database
+LUXURY_PERFUMES = [
+    {
+        'id': 1,
+        'name': 'Sauvage',
+        'brand': {'name': 'Dior'},
+        'price': 2500,
+        'currency': 'TRY',
+        'gender': 'men',
+        'notes': {
+            'top': [{'name': 'Bergamot'}, {'name': 'Pink Pepper'}],
+            'middle': [{'name': 'Lavender'}, {'name': 'Geranium'}],
+            'base': [{'name': 'Ambroxan'}, {'name': 'Cedar'}]
+        }
+    },
+    {
+        'id': 2,
+        'name': 'Black Opium',
+        'brand': {'name': 'Yves Saint Laurent'},
+        'price': 2800,
+        'currency': 'TRY',
+        'gender': 'women',
+        'notes': {
+            'top': [{'name': 'Pink Pepper'}, {'name': 'Orange Blossom'}],
+            'middle': [{'name': 'Jasmine'}, {'name': 'Coffee'}],
+            'base': [{'name': 'Vanilla'}, {'name': 'Patchouli'}]
+        }
+    },
+    {
+        'id': 3,
+        'name': 'Aventus',
+        'brand': {'name': 'Creed'},
+        'price': 4500,
+        'currency': 'TRY',
+        'gender': 'men',
+        'notes': {
+            'top': [{'name': 'Pineapple'}, {'name': 'Bergamot'}, {'name': 'Apple'}],
+            'middle': [{'name': 'Rose'}, {'name': 'Dry Birch'}, {'name': 'Moroccan Jasmine'}],
+            'base': [{'name': 'Oak Moss'}, {'name': 'Musk'}, {'name': 'Ambergris'}]
+        }
+    },
+    {
+        'id': 4,
+        'name': 'La Vie Est Belle',
+        'brand': {'name': 'Lancôme'},
+        'price': 2200,
+        'currency': 'TRY',
+        'gender': 'women',
+        'notes': {
+            'top': [{'name': 'Pear'}, {'name': 'Black Currant'}],
+            'middle': [{'name': 'Iris'}, {'name': 'Jasmine'}, {'name': 'Orange Blossom'}],
+            'base': [{'name': 'Vanilla'}, {'name': 'Praline'}, {'name': 'Tonka Bean'}]
+        }
+    },
+    {
+        'id': 5,
+        'name': 'Tom Ford Black Orchid',
+        'brand': {'name': 'Tom Ford'},
+        'price': 3200,
+        'currency': 'TRY',
+        'gender': 'unisex',
+        'notes': {
+            'top': [{'name': 'Truffle'}, {'name': 'Gardenia'}, {'name': 'Black Currant'}],
+            'middle': [{'name': 'Orchid'}, {'name': 'Spices'}, {'name': 'Lotus Wood'}],
+            'base': [{'name': 'Vanilla'}, {'name': 'Sandalwood'}, {'name': 'Patchouli'}]
+        }
+    },
+    {
+        'id': 6,
+        'name': 'Bleu de Chanel',
+        'brand': {'name': 'Chanel'},
+        'price': 2600,
+        'currency': 'TRY',
+        'gender': 'men',
+        'notes': {
+            'top': [{'name': 'Grapefruit'}, {'name': 'Lemon'}, {'name': 'Mint'}],
+            'middle': [{'name': 'Ginger'}, {'name': 'Nutmeg'}, {'name': 'Jasmine'}],
+            'base': [{'name': 'Incense'}, {'name': 'Cedar'}, {'name': 'Sandalwood'}]
+        }
+    }
+]
+
+luxury_perfumes_by_id = {perfume['id']: perfume for perfume in LUXURY_PERFUMES}
+
+
 # Static file routes
 @app.route('/')
 def index():
@@ -188,86 +304,31 @@ def health_check():
     return jsonify({
         'status': 'healthy',
         'message': 'PerfuMatch API is running',
-        'perfumes_count': len(all_perfumes)
+        'perfumes_count': len(all_perfumes),
+        'alternatives_cache': note_vectors.stats()
     })
 
 @app.route('/api/perfume/search', methods=['POST'])
 def search_perfumes():
-    """Search perfumes by name, notes, family, or advanced filters"""
+    """Search perfumes by name, notes, family, description text ('text', BM25-ranked) or advanced filters"""
     data = request.get_json()
-    search_term = data.get('searchTerm', '').lower()
+    # Not lowercased here: str.lower() turns 'İ' into 'i̇' and splits BM25 tokens;
+    # search_index lowercases non-text terms itself
+    search_term = data.get('searchTerm', '')
     search_type = data.get('searchType', 'name')
     gender = data.get('gender', 'all')
     family = data.get('family', 'all')
     selected_notes = data.get('selectedNotes', [])
     limit = data.get('limit', 10)
     
-    results = []
-    
-    for perfume in all_perfumes:
-        match = False
-        
-        # Gender filter
-        if gender != 'all':
-            perfume_gender = perfume.get('gender', '').lower()
-            if gender == 'women' and perfume_gender not in ['kadın', 'women', 'female']:
-                continue
-            elif gender == 'men' and perfume_gender not in ['erkek', 'men', 'male']:
-                continue
-        
-        # Family filter
-        if family != 'all':
-            perfume_family = perfume.get('family', '').lower()
-            if family.lower() not in perfume_family:
-                continue
-        
-        # Notes filter (if selected notes are provided)
-        if selected_notes:
-            perfume_notes = []
-            for note_type in ['top', 'middle', 'base']:
-                for note in perfume['notes'].get(note_type, []):
-                    note_name = note.get('name', '') if isinstance(note, dict) else str(note)
-                    perfume_notes.append(note_name.lower())
-            
-            # Check if any of the selected notes match
-            notes_match = any(selected_note.lower() in perfume_notes for selected_note in selected_notes)
-            if not notes_match:
-                continue
-        
-        # Search by type (only if search term is provided)
-        if search_term:
-            if search_type == 'name':
-                if search_term in perfume['name'].lower():
-                    match = True
-            elif search_type == 'notes':
-                # Search in all notes
-                search_terms = [term.strip() for term in search_term.split(',')]
-                for term in search_terms:
-                    for note_type in ['top', 'middle', 'base']:
-                        for note in perfume['notes'].get(note_type, []):
-                            note_name = note.get('name', '') if isinstance(note, dict) else str(note)
-                            if term in note_name.lower():
-                                match = True
-                                break
-                        if match:
-                            break
-                    if match:
-                        break
-            elif search_type == 'brand':
-                brand_name = perfume['brand'].get('name', '') if isinstance(perfume['brand'], dict) else str(perfume['brand'])
-                if search_term in brand_name.lower():
-                    match = True
-            elif search_type == 'family':
-                if search_term in perfume.get('family', '').lower():
-                    match = True
-        else:
-            # If no search term, include all perfumes that pass filters
-            match = True
-        
-        if match:
-            results.append(perfume)
-            if len(results) >= limit:
-                break
+    results = search_index.search(
+        search_term=search_term,
+        search_type=search_type,
+        gender=gender,
+        family=family,
+        selected_notes=selected_notes,
+        limit=limit
+    )
     
     return jsonify({
         'results': results,
@@ -313,110 +374,92 @@ def get_notes():
     """Get perfume notes by type"""
     note_type = request.args.get('type')
     
-    all_notes = set()
-    
-    for perfume in all_perfumes:
-        if note_type and note_type in perfume['notes']:
-            for note in perfume['notes'][note_type]:
-                note_name = note.get('name', '') if isinstance(note, dict) else str(note)
-                if note_name:
-                    all_notes.add(note_name)
-        elif not note_type:
-            for note_category in perfume['notes'].values():
-                for note in note_category:
+    def build():
+        all_notes = set()
+        
+        for perfume in all_perfumes:
+            if note_type and note_type in perfume['notes']:
+                for note in perfume['notes'][note_type]:
                     note_name = note.get('name', '') if isinstance(note, dict) else str(note)
                     if note_name:
                         all_notes.add(note_name)
+            elif not note_type:
+                for note_category in perfume['notes'].values():
+                    for note in note_category:
+                        note_name = note.get('name', '') if isinstance(note, dict) else str(note)
+                        if note_name:
+                            all_notes.add(note_name)
+        
+        return {
+            'notes': sorted(list(all_notes)),
+            'type': note_type,
+            'total': len(all_notes)
+        }
     
-    return jsonify({
-        'notes': sorted(list(all_notes)),
-        'type': note_type,
-        'total': len(all_notes)
-    })
+    return catalog_cache.respond('notes', build)
 
 @app.route('/api/brands', methods=['GET'])
 def get_brands():
     """Get all brands"""
-    brands = set()
-    for perfume in all_perfumes:
-        brand_name = perfume['brand'].get('name', '') if isinstance(perfume['brand'], dict) else str(perfume['brand'])
-        if brand_name:
-            brands.add(brand_name)
+    def build():
+        brands = set()
+        for perfume in all_perfumes:
+            brand_name = perfume['brand'].get('name', '') if isinstance(perfume['brand'], dict) else str(perfume['brand'])
+            if brand_name:
+                brands.add(brand_name)
+        
+        return {
+            'brands': sorted(list(brands)),
+            'total': len(brands)
+        }
     
-    return jsonify({
-        'brands': sorted(list(brands)),
-        'total': len(brands)
-    })
+    return catalog_cache.respond('brands', build)
 
 @app.route('/api/families', methods=['GET'])
 def get_families():
     """Get all perfume families"""
-    families = set()
-    for perfume in all_perfumes:
-        if perfume.get('family'):
-            families.add(perfume['family'])
+    def build():
+        families = set()
+        for perfume in all_perfumes:
+            if perfume.get('family'):
+                families.add(perfume['family'])
+        
+        return {
+            'families': sorted(list(families)),
+            'total': len(families)
+        }
     
-    return jsonify({
-        'families': sorted(list(families)),
-        'total': len(families)
-    })
+    return catalog_cache.respond('families', build)
 
 @app.route('/api/perfume/<perfume_id>', methods=['GET'])
 def get_perfume_detail(perfume_id):
     """Get perfume details by ID"""
-    for perfume in all_perfumes:
-        if perfume['id'] == perfume_id:
-            return jsonify(perfume)
+    perfume = search_index.get(perfume_id)
+    if perfume is None:
+        return jsonify({'error': 'Parfüm bulunamadı'}), 404
     
-    return jsonify({'error': 'Parfüm bulunamadı'}), 404
+    return jsonify(perfume)
 
 @app.route('/api/perfume/<perfume_id>/alternatives', methods=['GET'])
 def get_perfume_alternatives(perfume_id):
     """Get alternatives for a perfume"""
-    # Find the perfume
-    target_perfume = None
-    for perfume in all_perfumes:
-        if perfume['id'] == perfume_id:
-            target_perfume = perfume
-            break
-    
-    if not target_perfume:
+    position = search_index.position_of(perfume_id)
+    if position is None:
         return jsonify({'error': 'Parfüm bulunamadı'}), 404
     
-    # Find similar perfumes based on notes
-    alternatives = []
-    target_notes = []
-    
-    for note_type in ['top', 'middle', 'base']:
-        for note in target_perfume['notes'].get(note_type, []):
-            target_notes.append(note['name'].lower())
-    
-    for perfume in all_perfumes:
-        if perfume['id'] == perfume_id:
-            continue
-        
-        perfume_notes = []
-        for note_type in ['top', 'middle', 'base']:
-            for note in perfume['notes'].get(note_type, []):
-                perfume_notes.append(note['name'].lower())
-        
-        # Calculate similarity
-        common_notes = set(target_notes) & set(perfume_notes)
-        if len(common_notes) > 0:
-            similarity = len(common_notes) / max(len(target_notes), len(perfume_notes))
-            if similarity > 0.3:  # At least 30% similarity
-                alternatives.append({
-                    'perfume': perfume,
-                    'similarity': similarity,
-                    'common_notes': list(common_notes)
-                })
-    
-    # Sort by similarity
-    alternatives.sort(key=lambda x: x['similarity'], reverse=True)
+    top_alternatives, total = note_vectors.alternatives(position)
+    alternatives = [
+        {
+            'perfume': all_perfumes[position],
+            'similarity': similarity,
+            'common_notes': note_vectors.decode(common)
+        }
+        for position, similarity, common in top_alternatives
+    ]
     
     return jsonify({
-        'alternatives': alternatives[:5],  # Top 5 alternatives
-        'total': len(alternatives)
+        'alternatives': alternatives,  # Best note_vectors.top_k matches
+        'total': total
     })
 
 @app.route('/api/perfume/<perfume_id>/rate', methods=['POST'])
@@ -438,130 +481,28 @@ def rate_perfume(perfume_id):
 @app.route('/api/luxury-perfumes', methods=['GET'])
 def get_luxury_perfumes():
     """Get list of luxury perfumes for the main page"""
-    # For demo purposes, we'll create some mock luxury perfumes
-    # In a real app, you'd have a separate luxury perfumes database
-    luxury_perfumes = [
-        {
-            'id': 1,
-            'name': 'Sauvage',
-            'brand': {'name': 'Dior'},
-            'price': 2500,
-            'currency': 'TRY',
-            'gender': 'men',
-            'notes': {
-                'top': [{'name': 'Bergamot'}, {'name': 'Pink Pepper'}],
-                'middle': [{'name': 'Lavender'}, {'name': 'Geranium'}],
-                'base': [{'name': 'Ambroxan'}, {'name': 'Cedar'}]
-            }
-        },
-        {
-            'id': 2,
-            'name': 'Black Opium',
-            'brand': {'name': 'Yves Saint Laurent'},
-            'price': 2800,
-            'currency': 'TRY',
-            'gender': 'women',
-            'notes': {
-                'top': [{'name': 'Pink Pepper'}, {'name': 'Orange Blossom'}],
-                'middle': [{'name': 'Jasmine'}, {'name': 'Coffee'}],
-                'base': [{'name': 'Vanilla'}, {'name': 'Patchouli'}]
-            }
-        },
-        {
-            'id': 3,
-            'name': 'Aventus',
-            'brand': {'name': 'Creed'},
-            'price': 4500,
-            'currency': 'TRY',
-            'gender': 'men',
-            'notes': {
-                'top': [{'name': 'Pineapple'}, {'name': 'Bergamot'}, {'name': 'Apple'}],
-                'middle': [{'name': 'Rose'}, {'name': 'Dry Birch'}, {'name': 'Moroccan Jasmine'}],
-                'base': [{'name': 'Oak Moss'}, {'name': 'Musk'}, {'name': 'Ambergris'}]
-            }
-        },
-        {
-            'id': 4,
-            'name': 'La Vie Est Belle',
-            'brand': {'name': 'Lancôme'},
-            'price': 2200,
-            'currency': 'TRY',
-            'gender': 'women',
-            'notes': {
-                'top': [{'name': 'Pear'}, {'name': 'Black Currant'}],
-                'middle': [{'name': 'Iris'}, {'name': 'Jasmine'}, {'name': 'Orange Blossom'}],
-                'base': [{'name': 'Vanilla'}, {'name': 'Praline'}, {'name': 'Tonka Bean'}]
-            }
-        },
-        {
-            'id': 5,
-            'name': 'Tom Ford Black Orchid',
-            'brand': {'name': 'Tom Ford'},
-            'price': 3200,
-            'currency': 'TRY',
-            'gender': 'unisex',
-            'notes': {
-                'top': [{'name': 'Truffle'}, {'name': 'Gardenia'}, {'name': 'Black Currant'}],
-                'middle': [{'name': 'Orchid'}, {'name': 'Spices'}, {'name': 'Lotus Wood'}],
-                'base': [{'name': 'Vanilla'}, {'name': 'Sandalwood'}, {'name': 'Patchouli'}]
-            }
-        },
-        {
-            'id': 6,
-            'name': 'Bleu de Chanel',
-            'brand': {'name': 'Chanel'},
-            'price': 2600,
-            'currency': 'TRY',
-            'gender': 'men',
-            'notes': {
-                'top': [{'name': 'Grapefruit'}, {'name': 'Lemon'}, {'name': 'Mint'}],
-                'middle': [{'name': 'Ginger'}, {'name': 'Nutmeg'}, {'name': 'Jasmine'}],
-                'base': [{'name': 'Incense'}, {'name': 'Cedar'}, {'name': 'Sandalwood'}]
-            }
-        }
-    ]
-    
-    return jsonify({'perfumes': luxury_perfumes})
+    return jsonify({'perfumes': LUXURY_PERFUMES})
 
 @app.route('/api/luxury-perfume/<int:perfume_id>', methods=['GET'])
 def get_luxury_perfume_detail(perfume_id):
     """Get detailed information about a luxury perfume"""
-    luxury_perfumes = get_luxury_perfumes().get_json()['perfumes']
-    
-    for perfume in luxury_perfumes:
-        if perfume['id'] == perfume_id:
-            return jsonify({'perfume': perfume})
+    perfume = luxury_perfumes_by_id.get(perfume_id)
+    if perfume is None:
+        return jsonify({'error': 'Luxury perfume not found'}), 404
     
-    return jsonify({'error': 'Luxury perfume not found'}), 404
+    return jsonify({'perfume': perfume})
 
 @app.route('/api/alternative-perfume/<perfume_id>', methods=['GET'])
 def get_alternative_perfume_detail(perfume_id):
     """Get detailed information about an alternative perfume"""
-    for perfume in all_perfumes:
-        if perfume['id'] == perfume_id:
-            # Add product URL if available
-            if perfume.get('source') == 'bargello':
-                # Find original data for product URL
-                for orig_perfume in bargello_perfumes:
-                    if orig_perfume.get('isim') == perfume['name']:
-                        perfume['product_url'] = orig_perfume.get('link', '')
-                        break
-            elif perfume.get('source') == 'zara':
-                # Find original data for product URL
-                for orig_perfume in zara_perfumes:
-                    if orig_perfume.get('name') == perfume['name']:
-                        perfume['product_url'] = orig_perfume.get('url', '')
-                        break
-            elif perfume.get('source') == 'muscent':
-                # Find original data for product URL
-                for orig_perfume in muscent_perfumes:
-                    if orig_perfume.get('name') == perfume['name']:
-                        perfume['product_url'] = orig_perfume.get('url', '')
-                        break
-            
-            return jsonify({'perfume': perfume})
+    perfume = search_index.get(perfume_id)
+    if perfume is None:
+        return jsonify({'error': 'Alternative perfume not found'}), 404
+    
+    # Return a copy so the shared catalog record is never mutated
+    perfume = dict(perfume, product_url=resolve_product_url(perfume))
     
-    return jsonify({'error': 'Alternative perfume not found'}), 404
+    return jsonify({'perfume': perfume})
 
 @app.route('/api/find-alternatives', methods=['POST'])
 def find_alternatives():
@@ -572,71 +513,31 @@ def find_alternatives():
     max_results = data.get('max_results', 10)
     
     # Get luxury perfume details
-    luxury_perfume = None
-    luxury_perfumes = get_luxury_perfumes().get_json()['perfumes']
-    
-    for perfume in luxury_perfumes:
-        if perfume['id'] == luxury_perfume_id:
-            luxury_perfume = perfume
-            break
-    
+    luxury_perfume = luxury_perfumes_by_id.get(luxury_perfume_id)
     if not luxury_perfume:
         return jsonify({'error': 'Luxury perfume not found'}), 404
     
-    # Find alternatives based on notes similarity
-    alternatives = []
-    luxury_notes = []
+    # Score the luxury perfume against the whole catalog in one vectorized pass
+    luxury_notes = note_names_of(luxury_perfume)
+    note_ids = note_vocabulary.encode(luxury_notes, create=False)
+    similarities = catalog_matrix.jaccard(note_ids, note_vocabulary.distinct_count(luxury_notes))
     
-    # Collect all luxury perfume notes
-    for note_type in ['top', 'middle', 'base']:
-        for note in luxury_perfume['notes'].get(note_type, []):
-            luxury_notes.append(note['name'].lower())
+    mask = (catalog_matrix.sizes > 0) & (similarities >= min_similarity)
+    # Skip if same gender preference doesn't match
+    if luxury_perfume['gender'] != 'unisex':
+        mask &= catalog_genders == luxury_perfume['gender']
     
-    for perfume in all_perfumes:
-        # Skip if same gender preference doesn't match
-        if luxury_perfume['gender'] != 'unisex' and perfume.get('gender', '').lower() != luxury_perfume['gender']:
-            continue
-        
-        # Calculate similarity based on notes
-        perfume_notes = []
-        for note_type in ['top', 'middle', 'base']:
-            for note in perfume['notes'].get(note_type, []):
-                perfume_notes.append(note['name'].lower())
-        
-        if not perfume_notes:
-            continue
-        
-        # Calculate Jaccard similarity
-        intersection = len(set(luxury_notes) & set(perfume_notes))
-        union = len(set(luxury_notes) | set(perfume_notes))
-        similarity = intersection / union if union > 0 else 0
-        
-        if similarity >= min_similarity:
-            perfume_copy = perfume.copy()
-            perfume_copy['similarity_score'] = similarity * 100
-            
-            # Add product URL if available
-            if perfume.get('source') == 'bargello':
-                for orig_perfume in bargello_perfumes:
-                    if orig_perfume.get('isim') == perfume['name']:
-                        perfume_copy['product_url'] = orig_perfume.get('link', '')
-                        break
-            elif perfume.get('source') == 'zara':
-                for orig_perfume in zara_perfumes:
-                    if orig_perfume.get('name') == perfume['name']:
-                        perfume_copy['product_url'] = orig_perfume.get('url', '')
-                        break
-            elif perfume.get('source') == 'muscent':
-                for orig_perfume in muscent_perfumes:
-                    if orig_perfume.get('name') == perfume['name']:
-                        perfume_copy['product_url'] = orig_perfume.get('url', '')
-                        break
-            
-            alternatives.append(perfume_copy)
+    # Sort by similarity (stable, catalog order on ties) and limit results
+    positions = np.flatnonzero(mask)
+    positions = positions[np.argsort(-similarities[positions], kind='stable')][:max_results]
     
-    # Sort by similarity and limit results
-    alternatives.sort(key=lambda x: x['similarity_score'], reverse=True)
-    alternatives = alternatives[:max_results]
+    alternatives = []
+    for position in positions:
+        perfume = all_perfumes[position]
+        perfume_copy = perfume.copy()
+        perfume_copy['similarity_score'] = float(similarities[position]) * 100
+        perfume_copy['product_url'] = resolve_product_url(perfume)
+        alternatives.append(perfume_copy)
     
     return jsonify({
         'luxury_perfume': luxury_perfume,
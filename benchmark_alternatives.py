@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Alternatif Bulma Benchmark Script'i
+/api/find-alternatives endpoint'ini sentetik bir katalog üzerinde ölçer ve
+product_url için ham JSON listelerini tekrar tarayan eski yöntemle
+karşılaştırır.
+
+Kullanım:
+    python benchmark_alternatives.py --size 50000
+"""
+
+import argparse
+import random
+import time
+
+import app as perfumatch_app
+
+SOURCES = ['bargello', 'muscent', 'zara']
+GENDERS = ['men', 'women', 'unisex']
+
+
+def build_note_pool():
+    """Lüks parfüm notaları + rastgele dolgu notaları"""
+    pool = set()
+    for perfume in perfumatch_app.LUXURY_PERFUMES:
+        for notes in perfume['notes'].values():
+            pool.update(note['name'] for note in notes)
+    pool.update(f"Nota {i}" for i in range(60))
+    return sorted(pool)
+
+
+def synthetic_catalog(size, seed=42):
+    """Normalize edilmiş kayıtları ve kaynak bazlı ham listeleri üret"""
+    rng = random.Random(seed)
+    note_pool = build_note_pool()
+    perfumes = []
+    raw = {source: [] for source in SOURCES}
+
+    for i in range(size):
+        source = SOURCES[i % len(SOURCES)]
+        name = f"{source.upper()} SENTETIK {i}"
+        url = f"https://example.com/{source}/{i}"
+        notes = rng.sample(note_pool, rng.randint(4, 9))
+        perfumes.append({
+            'id': f"{source}_{i}",
+            'name': name,
+            'brand': {'name': source.title()},
+            'price': rng.randint(200, 1200),
+            'currency': 'TRY',
+            'notes': {
+                'top': [{'name': n} for n in notes[:3]],
+                'middle': [{'name': n} for n in notes[3:6]],
+                'base': [{'name': n} for n in notes[6:]]
+            },
+            'gender': rng.choice(GENDERS),
+            'family': '',
+            'source': source,
+            'product_url': url
+        })
+        if source == 'bargello':
+            raw[source].append({'isim': name, 'link': url})
+        else:
+            raw[source].append({'name': name, 'url': url})
+
+    return perfumes, raw
+
+
+def legacy_product_url(perfume, raw):
+    """Eşleşen her alternatif için ham listeyi baştan tarayan eski yöntem"""
+    source = perfume.get('source')
+    name_key, url_key = ('isim', 'link') if source == 'bargello' else ('name', 'url')
+    for orig_perfume in raw.get(source, []):
+        if orig_perfume.get(name_key) == perfume['name']:
+            return orig_perfume.get(url_key, '')
+    return perfume.get('product_url', '')
+
+
+def legacy_find_alternatives(luxury_perfume, perfumes, raw, min_similarity, max_results):
+    luxury_notes = {note['name'].lower() for notes in luxury_perfume['notes'].values() for note in notes}
+    alternatives = []
+    for perfume in perfumes:
+        if luxury_perfume['gender'] != 'unisex' and perfume.get('gender', '').lower() != luxury_perfume['gender']:
+            continue
+        perfume_notes = {note['name'].lower() for notes in perfume['notes'].values() for note in notes}
+        if not perfume_notes:
+            continue
+        similarity = len(luxury_notes & perfume_notes) / len(luxury_notes | perfume_notes)
+        if similarity >= min_similarity:
+            perfume_copy = perfume.copy()
+            perfume_copy['similarity_score'] = similarity * 100
+            perfume_copy['product_url'] = legacy_product_url(perfume, raw)
+            alternatives.append(perfume_copy)
+    alternatives.sort(key=lambda x: x['similarity_score'], reverse=True)
+    return alternatives[:max_results], len(alternatives)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='find-alternatives benchmark')
+    parser.add_argument('--size', type=int, default=50000, help='Sentetik katalog boyutu')
+    parser.add_argument('--min-similarity', type=float, default=0.2, help='Minimum Jaccard benzerliği')
+    parser.add_argument('--repeat', type=int, default=3, help='Tekrar sayısı')
+    args = parser.parse_args()
+
+    perfumes, raw = synthetic_catalog(args.size)
+    perfumatch_app.all_perfumes[:] = perfumes
+    perfumatch_app.build_indexes()
+
+    client = perfumatch_app.app.test_client()
+    print(f"📦 Sentetik katalog: {len(perfumes)} parfüm")
+    print(f"{'lüks parfüm':<24} {'eşleşme':>8} {'eski (ms)':>10} {'yeni (ms)':>10} {'hızlanma':>9}")
+
+    for luxury_perfume in perfumatch_app.LUXURY_PERFUMES:
+        payload = {
+            'luxury_perfume_id': luxury_perfume['id'],
+            'min_similarity': args.min_similarity,
+            'max_results': 10
+        }
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            legacy, matches = legacy_find_alternatives(luxury_perfume, perfumes, raw, args.min_similarity, 10)
+        legacy_ms = (time.perf_counter() - start) / args.repeat * 1000
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            response = client.post('/api/find-alternatives', json=payload)
+        new_ms = (time.perf_counter() - start) / args.repeat * 1000
+
+        data = response.get_json()
+        if [p['id'] for p in legacy] != [p['id'] for p in data['alternatives']]:
+            print(f"⚠️  Sonuçlar farklı: {luxury_perfume['name']}")
+
+        print(f"{luxury_perfume['name']:<24} {matches:>8} {legacy_ms:>10.1f} {new_ms:>10.1f} {legacy_ms / new_ms:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Paralel İçe Aktarma Benchmark Script'i
+Kaynak JSON dosyalarını --scale kat büyüterek (benzersiz isimlerle NDJSON)
+sıralı toplu içe aktarmayı ImportPipeline'ın farklı süreç sayılarıyla
+karşılaştırır. Ayrıştırma süreçlerde, yazma tek yazıcıda yapıldığı için
+kazanç çekirdek sayısına ve yazma / ayrıştırma süre oranına bağlıdır; tek
+çekirdekli makinede hızlanma beklenmez. Bellekte SQLite kullanılır.
+
+Kullanım:
+    python benchmark_import.py --scale 20 --workers 1 2 3
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+import server
+from src.models.database import db, Perfume
+from src.utils.data_importer import DataImporter
+from src.utils.import_pipeline import ImportPipeline
+from src.utils.json_stream import iter_json_records
+
+# Kaynak -> isim alanı
+NAME_FIELDS = {'Bargello': 'isim', 'Muscent': 'isim', 'Zara': 'name'}
+
+
+def scaled_sources(importer, directory, scale):
+    """Kaynak dosyalarını scale kopya halinde NDJSON olarak yaz"""
+    sources = []
+    for source, file_path, build_record in importer.sources():
+        items = list(iter_json_records(file_path))
+        path = os.path.join(directory, f"{source.lower()}.ndjson")
+        with open(path, 'w', encoding='utf-8') as f:
+            for copy_no in range(scale):
+                for item in items:
+                    item = dict(item)
+                    item[NAME_FIELDS[source]] = f"{item.get(NAME_FIELDS[source], '')} #{copy_no}"
+                    f.write(json.dumps(item, ensure_ascii=False) + '\n')
+        sources.append((source, path, build_record))
+    return sources
+
+
+def reset():
+    db.session.remove()
+    db.drop_all()
+    db.create_all()
+
+
+def sequential(sources):
+    importer = DataImporter(bulk=True)
+    for source, file_path, _ in sources:
+        importer.import_file(source, file_path, getattr(importer, f"{source.lower()}_record"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Paralel içe aktarma benchmark')
+    parser.add_argument('--scale', type=int, default=20, help='Kaynak dosyası çoğaltma katsayısı')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 3], help='Denenecek ayrıştırma süreci sayıları')
+    args = parser.parse_args()
+
+    print(f"🖥️  {os.cpu_count()} çekirdek")
+    with tempfile.TemporaryDirectory() as directory, server.app.app_context():
+        importer = DataImporter()
+        sources = scaled_sources(importer, directory, args.scale)
+
+        reset()
+        start = time.perf_counter()
+        sequential(sources)
+        baseline = time.perf_counter() - start
+        expected = Perfume.query.count()
+
+        print(f"📦 {expected} parfüm")
+        print(f"{'yöntem':<14} {'süre (sn)':>10} {'ayrıştırma (sn)':>16} {'yazma (sn)':>11} {'hızlanma':>9}")
+        print(f"{'sıralı':<14} {baseline:>10.2f} {'-':>16} {'-':>11} {1:>8.2f}x")
+
+        for workers in args.workers:
+            reset()
+            importer = DataImporter()
+            stats = ImportPipeline(importer, workers=workers).run(
+                [(source, path, getattr(importer, f"{source.lower()}_record")) for source, path, _ in sources]
+            )
+            if Perfume.query.count() != expected:
+                print(f"⚠️  {workers} süreç sonucu sıralı içe aktarmadan farklı")
+            parse_busy = sum(stage['busy_seconds'] for name, stage in stats['stages'].items() if name.startswith('parse:'))
+            elapsed = stats['elapsed_seconds']
+            print(f"{f'{workers} süreç':<14} {elapsed:>10.2f} {parse_busy:>16.2f} "
+                  f"{stats['stages']['write']['busy_seconds']:>11.2f} {baseline / elapsed:>8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
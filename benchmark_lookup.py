@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Parfüm ID Çözümleme Benchmark Script'i
+Detay, alternatif ve alternatif detay endpoint'lerinin katalog boyutundan
+bağımsız çalıştığını gösterir. Eski doğrusal tarama ile id haritası da
+ayrıca karşılaştırılır.
+
+Kullanım:
+    python benchmark_lookup.py --scales 1 10 50
+"""
+
+import argparse
+
+import app as perfumatch_app
+from benchmark_search import scaled_catalog, time_call
+
+ENDPOINTS = [
+    '/api/perfume/{id}',
+    '/api/perfume/{id}/alternatives',
+    '/api/alternative-perfume/{id}',
+]
+
+
+def legacy_find(perfumes, perfume_id):
+    """id haritası öncesi kullanılan doğrusal tarama"""
+    for perfume in perfumes:
+        if perfume['id'] == perfume_id:
+            return perfume
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ID çözümleme benchmark')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 50], help='Katalog çoğaltma katsayıları')
+    parser.add_argument('--repeat', type=int, default=200, help='İstek başına tekrar sayısı')
+    args = parser.parse_args()
+
+    source = list(perfumatch_app.all_perfumes)
+    client = perfumatch_app.app.test_client()
+
+    print(f"{'katalog':>8} {'eski tarama (ms)':>17} {'harita (ms)':>12} " +
+          ' '.join(f"{endpoint:>32}" for endpoint in ENDPOINTS))
+
+    for scale in args.scales:
+        perfumatch_app.all_perfumes[:] = scaled_catalog(source, scale)
+        perfumatch_app.build_indexes()
+
+        # En kötü durum: katalogdaki son parfüm
+        target_id = perfumatch_app.all_perfumes[-1]['id']
+
+        legacy_ms, _ = time_call(lambda: legacy_find(perfumatch_app.all_perfumes, target_id), args.repeat)
+        map_ms, _ = time_call(lambda: perfumatch_app.search_index.get(target_id), args.repeat)
+
+        endpoint_ms = []
+        for endpoint in ENDPOINTS:
+            url = endpoint.format(id=target_id)
+            elapsed, response = time_call(lambda: client.get(url), args.repeat)
+            if response.status_code != 200:
+                print(f"⚠️  {url}: {response.status_code}")
+            endpoint_ms.append(elapsed)
+
+        print(f"{len(perfumatch_app.all_perfumes):>8} {legacy_ms:>17.4f} {map_ms:>12.4f} " +
+              ' '.join(f"{elapsed:>29.3f} ms" for elapsed in endpoint_ms))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Nota Normalizasyon Benchmark Script'i
+Depodaki tüm JSON kataloglarındaki nota isimleri üzerinde eski döngü
+tabanlı kategori / çeviri fonksiyonlarını src.utils.note_normalizer'daki
+derlenmiş regex (önbelleksiz) ve LRU önbellekli sürümlerle karşılaştırır.
+Kategori ve çeviri sonuçlarının eski fonksiyonlarla aynı olduğu da
+doğrulanır ("fark" sütunu); kategori için karşılaştırma f9bdcea'daki
+DataImporter ve add_luxury_brands.py fonksiyonlarının birebir kopyalarıyla
+yapılır.
+
+Kullanım:
+    python benchmark_notes.py
+    python benchmark_notes.py --repeat 20
+"""
+
+import argparse
+import glob
+import time
+
+from src.utils import note_normalizer
+from src.utils.data_importer import DataImporter
+from src.utils.json_stream import iter_json_records
+
+
+def legacy_importer_category(note_name):
+    """Eski DataImporter.determine_note_category (f9bdcea, birebir): her çağrıda sözlük + alt dize döngüsü"""
+    note_name_lower = note_name.lower()
+    
+    # Kategori eşleştirmeleri
+    categories = {
+        'citrus': ['bergamot', 'limon', 'portakal', 'greyfurt', 'mandalina', 'lime'],
+        'floral': ['gül', 'yasemin', 'lavanta', 'süsen', 'portakal çiçeği', 'neroli', 'gardenya', 'orkide'],
+        'fruity': ['elma', 'şeftali', 'armut', 'ananas', 'mango', 'çilek', 'ahududu'],
+        'spicy': ['biber', 'tarçın', 'karanfil', 'zencefil', 'kakule', 'safran'],
+        'woody': ['sedir', 'sandal ağacı', 'vetiver', 'paçuli', 'oud'],
+        'sweet': ['vanilya', 'karamel', 'bal', 'şeker'],
+        'gourmand': ['kahve', 'çikolata', 'badem'],
+        'amber': ['amber', 'kehribar'],
+        'musk': ['misk'],
+        'leather': ['deri'],
+        'tobacco': ['tütün']
+    }
+    
+    for category, keywords in categories.items():
+        if any(keyword in note_name_lower for keyword in keywords):
+            return category
+    
+    return 'other'
+
+
+def legacy_luxury_category(note_name):
+    """Eski add_luxury_brands.determine_note_category (f9bdcea, birebir)"""
+    note_name_lower = note_name.lower()
+    
+    categories = {
+        'citrus': ['bergamot', 'lemon', 'orange', 'grapefruit', 'mandarin', 'lime', 'limon', 'portakal'],
+        'floral': ['rose', 'jasmine', 'lavender', 'iris', 'neroli', 'gardenia', 'orchid', 'gül', 'yasemin'],
+        'fruity': ['apple', 'peach', 'pear', 'pineapple', 'mango', 'strawberry', 'raspberry', 'elma', 'şeftali'],
+        'spicy': ['pepper', 'cinnamon', 'clove', 'ginger', 'cardamom', 'saffron', 'biber', 'tarçın'],
+        'woody': ['cedar', 'sandalwood', 'vetiver', 'patchouli', 'oud', 'sedir', 'sandal'],
+        'sweet': ['vanilla', 'caramel', 'honey', 'sugar', 'vanilya', 'karamel'],
+        'gourmand': ['coffee', 'chocolate', 'almond', 'kahve', 'çikolata'],
+        'amber': ['amber', 'ambergris'],
+        'musk': ['musk', 'misk'],
+        'leather': ['leather', 'deri'],
+        'tobacco': ['tobacco', 'tütün']
+    }
+    
+    for category, keywords in categories.items():
+        if any(keyword in note_name_lower for keyword in keywords):
+            return category
+    
+    return 'other'
+
+
+def legacy_translate(note):
+    """Eski request_branded.translate_note: her çağrıda sözlük + doğrusal kısmi eşleşme"""
+    note_translations = dict(note_normalizer.NOTE_TRANSLATIONS)
+    note = note.lower()
+    if note in note_translations:
+        return note_translations[note]
+    for eng, tr in note_translations.items():
+        if eng in note or note in eng:
+            return tr
+    return note
+
+
+def legacy_normalize(name):
+    """Eski normalize_key"""
+    return str(name or '').strip().lower()
+
+
+def catalog_notes():
+    """Depodaki JSON kataloglarında geçen tüm nota isimleri (tekrarlar dahil)"""
+    importer = DataImporter()
+    notes = []
+    for path in sorted(glob.glob('*.json')):
+        if path.startswith('package'):
+            continue
+        for record in iter_json_records(path):
+            if not isinstance(record, dict):
+                continue
+            if isinstance(record.get('notalar'), dict):
+                notes.extend(name for name, _ in importer.parse_notes_from_bargello(record['notalar']))
+                notes.extend(name for name, _ in importer.parse_notes_from_muscent(record))
+            record_notes = record.get('notes')
+            groups = record_notes.values() if isinstance(record_notes, dict) else [record_notes]
+            for group in groups:
+                if isinstance(group, list):
+                    notes.extend(str(name) for name in group if name)
+    return notes
+
+
+def time_pass(function, notes, repeat, clear=None):
+    """Tüm notalar üzerinde bir geçişin ortalama süresi (ms)"""
+    elapsed = 0.0
+    for _ in range(repeat):
+        if clear:
+            clear()
+        start = time.perf_counter()
+        for note in notes:
+            function(note)
+        elapsed += time.perf_counter() - start
+    return elapsed / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Nota normalizasyon benchmark')
+    parser.add_argument('--repeat', type=int, default=10, help='Geçiş tekrar sayısı')
+    args = parser.parse_args()
+
+    notes = catalog_notes()
+    print(f"{len(notes)} nota, {len(set(notes))} farklı isim\n")
+
+    cases = [
+        ('kat. içe', legacy_importer_category, note_normalizer.importer_classifier.classify),
+        ('kat. lüks', legacy_luxury_category, note_normalizer.luxury_classifier.classify),
+        ('çeviri', legacy_translate, note_normalizer.translate_note),
+        ('normalize', legacy_normalize, note_normalizer._normalize),
+    ]
+
+    print(f"{'fonksiyon':>10} {'eski (ms)':>10} {'regex (ms)':>11} {'lru soğuk (ms)':>15} "
+          f"{'lru sıcak (ms)':>15} {'fark':>6}")
+    for label, legacy, cached in cases:
+        compiled = cached.__wrapped__
+        # normalize için fark beklenir: iç boşluklar tekilleşir, 'İ' düz 'i' olur
+        mismatches = sum(1 for note in set(notes) if legacy(note) != compiled(note))
+
+        legacy_ms = time_pass(legacy, notes, args.repeat)
+        compiled_ms = time_pass(compiled, notes, args.repeat)
+        cold_ms = time_pass(cached, notes, args.repeat, clear=cached.cache_clear)
+        warm_ms = time_pass(cached, notes, args.repeat)
+        print(f"{label:>10} {legacy_ms:>10.2f} {compiled_ms:>11.2f} {cold_ms:>15.2f} {warm_ms:>15.2f} "
+              f"{mismatches:>6}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Arama Benchmark Script'i
+app.py'deki eski doğrusal tarama ile ters indeks tabanlı aramayı
+dört searchType değeri için karşılaştırır.
+
+Kullanım:
+    python benchmark_search.py            # Mevcut JSON kataloğu
+    python benchmark_search.py --scale 50 # Kataloğu 50 kat büyüterek
+"""
+
+import argparse
+import time
+
+import app as perfumatch_app
+from src.utils.search_index import PerfumeSearchIndex
+
+QUERIES = [
+    {'searchTerm': 'bargello', 'searchType': 'name'},
+    {'searchTerm': 'gül, vanilya', 'searchType': 'notes'},
+    {'searchTerm': 'zara', 'searchType': 'brand'},
+    {'searchTerm': 'oriental', 'searchType': 'family'},
+    {'searchTerm': 'edp', 'searchType': 'name', 'gender': 'men', 'selectedNotes': ['Misk']},
+]
+
+
+def legacy_search(perfumes, search_term, search_type, gender='all', family='all', selected_notes=None, limit=10):
+    """Ters indeks öncesi app.py'deki doğrusal tarama"""
+    selected_notes = selected_notes or []
+    results = []
+
+    for perfume in perfumes:
+        match = False
+
+        if gender != 'all':
+            perfume_gender = perfume.get('gender', '').lower()
+            if gender == 'women' and perfume_gender not in ['kadın', 'women', 'female']:
+                continue
+            elif gender == 'men' and perfume_gender not in ['erkek', 'men', 'male']:
+                continue
+
+        if family != 'all':
+            perfume_family = perfume.get('family', '').lower()
+            if family.lower() not in perfume_family:
+                continue
+
+        if selected_notes:
+            perfume_notes = []
+            for note_type in ['top', 'middle', 'base']:
+                for note in perfume['notes'].get(note_type, []):
+                    note_name = note.get('name', '') if isinstance(note, dict) else str(note)
+                    perfume_notes.append(note_name.lower())
+
+            if not any(selected_note.lower() in perfume_notes for selected_note in selected_notes):
+                continue
+
+        if search_term:
+            if search_type == 'name':
+                match = search_term in perfume['name'].lower()
+            elif search_type == 'notes':
+                search_terms = [term.strip() for term in search_term.split(',')]
+                for term in search_terms:
+                    for note_type in ['top', 'middle', 'base']:
+                        for note in perfume['notes'].get(note_type, []):
+                            note_name = note.get('name', '') if isinstance(note, dict) else str(note)
+                            if term in note_name.lower():
+                                match = True
+                                break
+                        if match:
+                            break
+                    if match:
+                        break
+            elif search_type == 'brand':
+                brand = perfume['brand']
+                brand_name = brand.get('name', '') if isinstance(brand, dict) else str(brand)
+                match = search_term in brand_name.lower()
+            elif search_type == 'family':
+                match = search_term in perfume.get('family', '').lower()
+        else:
+            match = True
+
+        if match:
+            results.append(perfume)
+            if len(results) >= limit:
+                break
+
+    return results
+
+
+def scaled_catalog(perfumes, scale):
+    """Kataloğu kopyalayarak büyüt (benzersiz id'lerle)"""
+    catalog = []
+    for copy_no in range(scale):
+        for perfume in perfumes:
+            clone = dict(perfume)
+            clone['id'] = f"{perfume['id']}_{copy_no}"
+            catalog.append(clone)
+    return catalog
+
+
+def time_call(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Arama benchmark')
+    parser.add_argument('--scale', type=int, default=1, help='Katalog çoğaltma katsayısı')
+    parser.add_argument('--repeat', type=int, default=200, help='Sorgu başına tekrar sayısı')
+    parser.add_argument('--limit', type=int, default=1000, help='Sonuç limiti (yüksek limit tam taramayı zorlar)')
+    args = parser.parse_args()
+
+    catalog = scaled_catalog(perfumatch_app.all_perfumes, args.scale)
+
+    start = time.perf_counter()
+    index = PerfumeSearchIndex(catalog)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    print(f"📦 Katalog: {len(catalog)} parfüm | İndeks kurulumu: {build_ms:.1f} ms")
+    print(f"{'searchType':<10} {'terim':<16} {'eski (ms)':>10} {'indeks (ms)':>12} {'hızlanma':>9} {'sonuç':>6}")
+
+    for query in QUERIES:
+        kwargs = {
+            'search_term': query['searchTerm'].lower(),
+            'search_type': query['searchType'],
+            'gender': query.get('gender', 'all'),
+            'family': query.get('family', 'all'),
+            'selected_notes': query.get('selectedNotes', []),
+            'limit': args.limit,
+        }
+
+        legacy_ms, legacy_results = time_call(lambda: legacy_search(catalog, **kwargs), args.repeat)
+        index_ms, index_results = time_call(lambda: index.search(**kwargs), args.repeat)
+
+        if [p['id'] for p in legacy_results] != [p['id'] for p in index_results]:
+            print(f"⚠️  Sonuçlar farklı: {query}")
+
+        speedup = legacy_ms / index_ms if index_ms else float('inf')
+        print(f"{query['searchType']:<10} {query['searchTerm']:<16} {legacy_ms:>10.3f} {index_ms:>12.3f} {speedup:>8.1f}x {len(index_results):>6}")
+
+
+if __name__ == '__main__':
+    main()
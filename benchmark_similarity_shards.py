@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Çok Süreçli Benzerlik Benchmark Script'i
+Sentetik bir lüks x alternatif kataloğunu farklı süreç sayılarıyla skorlar,
+çift/sn hızını ve tek sürece göre ölçeklenmeyi gösterir. Veritabanı
+kullanılmaz; ölçülen kısım yazıcıdan önceki skorlama aşamasıdır.
+
+Kullanım:
+    python benchmark_similarity_shards.py --luxury 4000 --alternative 50000 --workers 1 2 4 8
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from src.utils.similarity_pipeline import CatalogSide, SimilarityPipeline
+
+GENDERS = ['men', 'women', 'unisex']
+
+
+def synthetic_side(size, note_pool, rng, id_offset=0):
+    side = CatalogSide()
+    for i in range(size):
+        side.ids.append(id_offset + i)
+        side.genders.append(rng.choice(GENDERS))
+        side.family_ids.append(rng.randint(-1, 11))
+        side.prices.append(rng.randint(200, 5000))
+        side.notes.append(rng.sample(note_pool, rng.randint(3, 12)))
+    return side
+
+
+def score_all(pipeline, luxury, alternative):
+    """Tüm eşleşmeleri topla; (süre, çift sayısı, eşleşme sayısı, skor toplamı)"""
+    start = time.perf_counter()
+    pairs = 0
+    matches = 0
+    checksum = 0.0
+    for block_pairs, _, _, scores in pipeline.score_matches(luxury, alternative):
+        pairs += block_pairs
+        matches += len(scores)
+        checksum += float(np.sum(scores))
+    return time.perf_counter() - start, pairs, matches, checksum
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Çok süreçli benzerlik benchmark')
+    parser.add_argument('--luxury', type=int, default=4000, help='Lüks parfüm sayısı')
+    parser.add_argument('--alternative', type=int, default=50000, help='Alternatif parfüm sayısı')
+    parser.add_argument('--notes', type=int, default=400, help='Farklı nota sayısı')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8], help='Denenecek süreç sayıları')
+    parser.add_argument('--block-size', type=int, default=64, help='Görev başına lüks parfüm')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    note_pool = [f"Nota {i}" for i in range(args.notes)]
+    luxury = synthetic_side(args.luxury, note_pool, rng)
+    alternative = synthetic_side(args.alternative, note_pool, rng, id_offset=args.luxury)
+
+    print(f"📦 {len(luxury)} lüks x {len(alternative)} alternatif = {len(luxury) * len(alternative):,} çift")
+    print(f"{'süreç':>6} {'süre (sn)':>10} {'çift/sn':>14} {'eşleşme':>12} {'hızlanma':>9}")
+
+    baseline = None
+    reference = None
+    for workers in args.workers:
+        pipeline = SimilarityPipeline(block_size=args.block_size, workers=workers)
+        elapsed, pairs, matches, checksum = score_all(pipeline, luxury, alternative)
+
+        if reference is None:
+            reference = (matches, checksum)
+        elif matches != reference[0] or not np.isclose(checksum, reference[1]):
+            print(f"⚠️  {workers} süreç sonucu tek süreçten farklı")
+
+        baseline = baseline or elapsed
+        print(f"{workers:>6} {elapsed:>10.2f} {pairs / elapsed:>14,.0f} {matches:>12,} {baseline / elapsed:>8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tam Metin Arama Benchmark Script'i
+searchType 'text' için isim + açıklama üzerindeki BM25 indeksini, her
+parfümün metnini tek tek tarayan doğrusal aramayla karşılaştırır.
+
+Kullanım:
+    python benchmark_text_search.py --scale 250   # ~300 bin parfüm
+"""
+
+import argparse
+import time
+
+import app as perfumatch_app
+from benchmark_search import scaled_catalog, time_call
+from src.utils.bm25 import tokenize
+from src.utils.search_index import PerfumeSearchIndex, text_of
+
+QUERIES = [
+    'zencefil',
+    'ferah turunçgiller',
+    'çiçeksi odunsu kalıcı',
+    'günlük kullanıma uygun parfüm',
+    'vanilya',
+]
+
+
+def linear_text_search(perfumes, query, limit):
+    """İndekssiz karşılaştırma: terim köklerinden birini içeren parfümleri katalog sırasıyla döndür"""
+    terms = tokenize(query)
+    results = []
+    for perfume in perfumes:
+        text = text_of(perfume).lower()
+        if any(term in text for term in terms):
+            results.append(perfume)
+            if len(results) >= limit:
+                break
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tam metin arama benchmark')
+    parser.add_argument('--scale', type=int, default=250, help='Katalog çoğaltma katsayısı')
+    parser.add_argument('--repeat', type=int, default=50, help='Sorgu başına tekrar sayısı')
+    parser.add_argument('--limit', type=int, default=20, help='Sonuç limiti')
+    parser.add_argument('--linear-repeat', type=int, default=1, help='Doğrusal tarama tekrar sayısı')
+    args = parser.parse_args()
+
+    catalog = scaled_catalog(perfumatch_app.all_perfumes, args.scale)
+
+    start = time.perf_counter()
+    index = PerfumeSearchIndex(catalog)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    described = sum(1 for perfume in catalog if perfume.get('description'))
+    print(f"📦 Katalog: {len(catalog)} parfüm ({described} açıklamalı) | İndeks kurulumu: {build_ms:.0f} ms")
+    print(f"{'sorgu':<32} {'doğrusal (ms)':>14} {'BM25 (ms)':>10} {'eşleşen':>9} {'sonuç':>6}")
+
+    for query in QUERIES:
+        linear_ms, _ = time_call(lambda: linear_text_search(catalog, query, len(catalog)), args.linear_repeat)
+        bm25_ms, results = time_call(
+            lambda: index.search(search_term=query, search_type='text', limit=args.limit), args.repeat
+        )
+        matched = len(index.text_index.search(query, len(catalog)))
+        print(f"{query:<32} {linear_ms:>14.1f} {bm25_ms:>10.3f} {matched:>9} {len(results):>6}")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,12 +4,20 @@
 """
 Benzerlik Hesaplama Script'i
 Lüks parfümler ile alternatif parfümler arasında benzerlik skorlarını hesaplar
+
+Varsayılan olarak artımlı çalışır: sadece son hesaplamadan beri eklenen,
+değişen veya silinen parfümlerin çiftleri yeniden hesaplanır.
+    python calculate_similarities.py          # Artımlı
+    python calculate_similarities.py --full   # Tüm tabloyu baştan oluştur
+    python calculate_similarities.py --workers 8   # Skorlamayı 8 sürece dağıt
 """
 
+import argparse
 import os
 from flask import Flask
 from src.models.database import init_db, db, Brand, Perfume, PerfumeSimilarity
 from src.utils.data_importer import DataImporter
+from src.utils.similarity_shards import default_workers
 
 def create_app():
     """Flask uygulaması oluştur"""
@@ -25,7 +33,7 @@ def create_app():
     
     return app
 
-def main():
+def main(full_rebuild=False, workers=1):
     """Ana fonksiyon"""
     print("🎯 Benzerlik Hesaplama Başlatılıyor...")
     
@@ -33,18 +41,17 @@ def main():
     
     with app.app_context():
         try:
-            # Mevcut benzerlik kayıtlarını sil
-            print("🧹 Eski benzerlik kayıtları temizleniyor...")
-            deleted = PerfumeSimilarity.query.delete()
-            print(f"✅ {deleted} eski kayıt silindi")
-            db.session.commit()
-            
             # Veri içe aktarıcıyı başlat
             importer = DataImporter()
             
             # Benzerlik hesaplama
-            print("🔄 Benzerlik skorları hesaplanıyor...")
-            importer.calculate_all_similarities()
+            mode = "tam" if full_rebuild else "artımlı"
+            print(f"🔄 Benzerlik skorları hesaplanıyor ({mode})...")
+            stats = importer.calculate_all_similarities(full_rebuild=full_rebuild, workers=workers)
+            
+            print(f"🧹 {stats['rows_deleted']} eski kayıt silindi")
+            print(f"♻️  Yeniden hesaplanan çift: {stats['pairs_recomputed']}")
+            print(f"⏭️  Atlanan çift: {stats['pairs_skipped']}")
             
             # Sonuçları göster
             similarity_count = PerfumeSimilarity.query.count()
@@ -82,5 +89,11 @@ def main():
             return False
 
 if __name__ == '__main__':
-    success = main()
+    parser = argparse.ArgumentParser(description='Benzerlik skorlarını hesapla')
+    parser.add_argument('--full', action='store_true', help='Tüm benzerlik tablosunu baştan oluştur')
+    parser.add_argument('--workers', type=int, default=1, help='Skorlama süreç sayısı (0: CPU sayısı)')
+    args = parser.parse_args()
+    
+    workers = args.workers if args.workers > 0 else default_workers()
+    success = main(full_rebuild=args.full, workers=workers)
     print(f"\n🏁 Sonuç: {'✅ Başarılı' if success else '❌ Başarısız'}") 
\ No newline at end of file
@@ -66,6 +66,8 @@ def main():
     
     # Komut satırı argümanlarını kontrol et
     clean_first = '--clean' in sys.argv or '-c' in sys.argv
+    bulk = '--bulk' in sys.argv or '-b' in sys.argv
+    parallel = '--parallel' in sys.argv or '-p' in sys.argv
     
     # Flask uygulamasını oluştur
     app = create_app()
@@ -78,7 +80,7 @@ def main():
                     return False
             
             # Veri içe aktarıcıyı başlat
-            importer = DataImporter()
+            importer = DataImporter(bulk=bulk)
             
             print("📊 JSON dosyaları kontrol ediliyor...")
             
@@ -103,7 +105,7 @@ def main():
             
             # Verileri içe aktar
             print("🚀 Veri içe aktarma başlıyor...")
-            importer.import_all_data()
+            importer.import_all_data(parallel=parallel)
             
             print("✅ Veri içe aktarma başarıyla tamamlandı!")
             return True
@@ -118,6 +120,8 @@ if __name__ == '__main__':
         print("  python import_data.py           # Normal import")
         print("  python import_data.py --clean   # Önce veritabanını temizle, sonra import et")
         print("  python import_data.py -c        # Kısa versiyon")
+        print("  python import_data.py --bulk    # Toplu mod (COPY / executemany + ON CONFLICT)")
+        print("  python import_data.py --parallel  # Kaynakları ayrı süreçlerde ayrıştır, tek yazıcıyla toplu yaz")
         sys.exit(0)
     
     success = main()
@@ -2,108 +2,46 @@ import requests
 from bs4 import BeautifulSoup
 import json
 import logging
+import os
+import sys
 import urllib.parse
 from difflib import SequenceMatcher
+from functools import lru_cache
+
+try:
+    from src.utils.json_stream import iter_json_records
+except ImportError:
+    # Script doğrudan çalıştırıldığında (python scrapping/request_branded.py) proje kökü yolda değildir
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from src.utils.json_stream import iter_json_records
+from src.utils.note_normalizer import translate_note
 
 # Debugging için logging ayarı
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+# (bağlantı, okuma) zaman aşımı, saniye
+DEFAULT_TIMEOUT = (5, 20)
+
+# Modül içinden yapılan çağrılar için paylaşılan oturum (keep-alive)
+_session = None
+
+def get_session():
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        _session.headers.update(HEADERS)
+    return _session
+
+@lru_cache(maxsize=1)
 def load_bargello_data():
-    with open('bargello_parfumler.json', 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-def translate_note(note):
-    # Parfüm notaları için Türkçe-İngilizce eşleştirme sözlüğü
-    note_translations = {
-        # Meyveler
-        'apple': 'elma',
-        'pear': 'armut',
-        'peach': 'şeftali',
-        'mandarin': 'mandalina',
-        'orange': 'portakal',
-        'orange blossom': 'portakal çiçeği',
-        'bergamot': 'bergamot',
-        'lemon': 'limon',
-        'grapefruit': 'greyfurt',
-        'blackcurrant': 'siyah frenk üzümü',
-        'raspberry': 'ahududu',
-        'strawberry': 'çilek',
-        'pineapple': 'ananas',
-        'coconut': 'hindistan cevizi',
-        'fig': 'incir',
-        'plum': 'erik',
-        'lychee': 'liçi',
-        'mango': 'mango',
-
-        # Çiçekler
-        'rose': 'gül',
-        'jasmine': 'yasemin',
-        'lavender': 'lavanta',
-        'violet': 'menekşe',
-        'lily': 'zambak',
-        'lily of the valley': 'vadi zambağı',
-        'iris': 'süsen',
-        'freesia': 'frezya',
-        'magnolia': 'manolya',
-        'gardenia': 'gardenya',
-        'orchid': 'orkide',
-        'peony': 'şakayık',
-        'neroli': 'neroli',
-        'geranium': 'sardunya',
-        'lotus': 'lotus',
-
-        # Baharatlar ve Otlar
-        'vanilla': 'vanilya',
-        'cinnamon': 'tarçın',
-        'pepper': 'biber',
-        'pink pepper': 'pembe biber',
-        'cardamom': 'kakule',
-        'saffron': 'safran',
-        'nutmeg': 'muskat',
-        'mint': 'nane',
-        'rosemary': 'biberiye',
-        'basil': 'fesleğen',
-        'thyme': 'kekik',
-        'sage': 'adaçayı',
-
-        # Odunsu ve Reçineli
-        'sandalwood': 'sandal ağacı',
-        'cedar': 'sedir',
-        'oud': 'ud',
-        'patchouli': 'paçuli',
-        'vetiver': 'vetiver',
-        'amber': 'amber',
-        'musk': 'misk',
-        'leather': 'deri',
-        'tobacco': 'tütün',
-        'incense': 'tütsü',
-        'woody notes': 'odunsu notalar',
-        
-        # Diğer
-        'caramel': 'karamel',
-        'chocolate': 'çikolata',
-        'coffee': 'kahve',
-        'almond': 'badem',
-        'honey': 'bal',
-        'sea notes': 'deniz notaları',
-        'green notes': 'yeşil notalar',
-        'powdery notes': 'pudramsı notalar',
-        'spicy notes': 'baharatlı notalar',
-        'floral notes': 'çiçeksi notalar',
-        'fruity notes': 'meyvemsi notalar',
-    }
-    
-    note = note.lower()
-    # Tam eşleşme kontrolü
-    if note in note_translations:
-        return note_translations[note]
-    
-    # Kısmi eşleşme kontrolü
-    for eng, tr in note_translations.items():
-        if eng in note or note in eng:
-            return tr
-    
-    return note
+    # Süreç başına bir kez okunur ve tüm liste önbellekte kalır (ParfumoLookupService önceden ısıtır);
+    # dönen liste değiştirilmemeli. Dosya parça parça ayrıştırılır, yani tam ham metin ayrıca
+    # belleğe alınmaz; ama kayıtlar akıtılmaz, liste bellekte tutulur
+    return list(iter_json_records('bargello_parfumler.json'))
 
 def calculate_note_similarity(parfumo_notes, bargello_notes):
     if not parfumo_notes or not any(bargello_notes.values()):
@@ -149,73 +87,82 @@ def find_similar_bargello_perfumes(parfumo_notes, top_n=5):
     # Return top N matches
     return similarities[:top_n]
 
-def scrape_parfumo_by_name_and_brand(brand, perfume_name):
-    # URL'yi oluştur
+def parfumo_url(brand, perfume_name):
     brand_url = urllib.parse.quote(brand.strip().replace(" ", "_"))
     perfume_url = urllib.parse.quote(perfume_name.strip().replace(" ", "_"))
-    url = f"https://www.parfumo.com/Perfumes/{brand_url}/{perfume_url}"
+    return f"https://www.parfumo.com/Perfumes/{brand_url}/{perfume_url}"
 
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+def parse_parfumo_page(html, url):
+    soup = BeautifulSoup(html, "html.parser")
+    
+    # Parfüm notalarını çek
+    notes = [note.text.strip() for note in soup.select(".notes_list .clickable_note_img")]
+
+    # Parfümörü çek
+    perfumer_tag = soup.select_one(".w-100.mt-0-5.mb-3 a")
+    perfumer = perfumer_tag.text.strip() if perfumer_tag else "Bilinmiyor"
+
+    # Değerlendirme puanlarını çek
+    ratings = {}
+    rating_tags = soup.select(".barfiller_element")
+
+    for tag in rating_tags:
+        category = tag.select_one(".upper").text.strip()  # Kategori (Scent, Longevity, vb.)
+        score = tag.select_one(".bold").text.strip()      # Puan (7.5, 7.8, vb.)
+        ratings[category] = score
+
+    # Cinsiyeti belirle
+    gender = "Unisex"  # Varsayılan değer
+    if soup.select_one(".p_gender_big i.fa-venus"):
+        gender = "Kadın"
+    elif soup.select_one(".p_gender_big i.fa-mars"):
+        gender = "Erkek"
+
+    # Add Bargello recommendations to the response
+    similar_perfumes = find_similar_bargello_perfumes(notes)
+    bargello_recommendations = []
+    for perfume, similarity in similar_perfumes:
+        recommendation = {
+            "isim": perfume["isim"],
+            "benzerlik": f"{similarity:.2%}",
+            "notalar": perfume["notalar"]
+        }
+        bargello_recommendations.append(recommendation)
+    
+    return {
+        "url": url,
+        "perfumer": perfumer,
+        "notes": notes,
+        "ratings": ratings,
+        "gender": gender,
+        "bargello_recommendations": bargello_recommendations
     }
+
+# Parfüm sayfasını çekip sözlük olarak döndür; hata durumunda None
+def fetch_parfumo_perfume(brand, perfume_name, session=None, timeout=DEFAULT_TIMEOUT):
+    url = parfumo_url(brand, perfume_name)
+    session = session or get_session()
     
     try:
         # Sayfayı çek
-        response = requests.get(url, headers=headers)
+        response = session.get(url, timeout=timeout)
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
-        
-        # Parfüm notalarını çek
-        notes = [note.text.strip() for note in soup.select(".notes_list .clickable_note_img")]
-
-        # Parfümörü çek
-        perfumer_tag = soup.select_one(".w-100.mt-0-5.mb-3 a")
-        perfumer = perfumer_tag.text.strip() if perfumer_tag else "Bilinmiyor"
-
-        # Değerlendirme puanlarını çek
-        ratings = {}
-        rating_tags = soup.select(".barfiller_element")
-
-        for tag in rating_tags:
-            category = tag.select_one(".upper").text.strip()  # Kategori (Scent, Longevity, vb.)
-            score = tag.select_one(".bold").text.strip()      # Puan (7.5, 7.8, vb.)
-            ratings[category] = score
-
-        # Cinsiyeti belirle
-        gender = "Unisex"  # Varsayılan değer
-        if soup.select_one(".p_gender_big i.fa-venus"):
-            gender = "Kadın"
-        elif soup.select_one(".p_gender_big i.fa-mars"):
-            gender = "Erkek"
-
-        # Add Bargello recommendations to the response
-        similar_perfumes = find_similar_bargello_perfumes(notes)
-        bargello_recommendations = []
-        for perfume, similarity in similar_perfumes:
-            recommendation = {
-                "isim": perfume["isim"],
-                "benzerlik": f"{similarity:.2%}",
-                "notalar": perfume["notalar"]
-            }
-            bargello_recommendations.append(recommendation)
-        
-        # Sonuçları JSON olarak döndür
-        perfume_data = {
-            "url": url,
-            "perfumer": perfumer,
-            "notes": notes,
-            "ratings": ratings,
-            "gender": gender,
-            "bargello_recommendations": bargello_recommendations
-        }
-
+        perfume_data = parse_parfumo_page(response.text, url)
         logging.info("Veri başarıyla çekildi.")
-        return json.dumps(perfume_data, indent=4, ensure_ascii=False)
+        return perfume_data
 
     except requests.exceptions.RequestException as e:
         logging.error(f"Bağlantı hatası: {e}")
     except Exception as e:
         logging.error(f"Bir hata oluştu: {e}")
+    return None
+
+def scrape_parfumo_by_name_and_brand(brand, perfume_name):
+    perfume_data = fetch_parfumo_perfume(brand, perfume_name)
+    if perfume_data is None:
+        return None
+    # Sonuçları JSON olarak döndür
+    return json.dumps(perfume_data, indent=4, ensure_ascii=False)
 
 # Script'in doğrudan çalıştırılması durumunda
 if __name__ == "__main__":
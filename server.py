@@ -5,22 +5,28 @@ from flask import Flask, request, jsonify, send_from_directory
 from flask_cors import CORS
 import json
 import os
-import sys
-import subprocess
 import logging
+import math
 from pathlib import Path
 from dotenv import load_dotenv
 
 # Veritabanı modelleri
 from src.models.database import (
     db, init_db, Brand, Perfume, PerfumeFamily, Note, PerfumeNote, 
-    PerfumeSimilarity, UserRating, SearchHistory,
+    PerfumeSimilarity, UserRating, SearchHistory, perfume_load_options, perfume_joined_options,
     search_perfumes_by_name, search_perfumes_by_notes, 
-    search_perfumes_by_family, get_similar_perfumes
+    search_perfumes_by_family, search_perfumes_by_text, get_similar_perfumes,
+    find_alternative_perfumes, get_brand_stats, note_name_cache
 )
 
 # Veri içe aktarma
 from src.utils.data_importer import DataImporter
+from src.utils.catalog_cache import catalog_cache
+from src.utils.db_pool import configure_database, is_memory_sqlite
+from src.utils.health import TableStatsSnapshot, pool_status
+from src.utils.parfumo_service import ParfumoBusyError, ParfumoLookupService, ParfumoPendingError
+from src.utils.popularity import PopularityRollups
+from src.utils.search_history_writer import SearchHistoryWriter
 
 # Environment variables yükle
 load_dotenv()
@@ -36,9 +42,39 @@ DATABASE_URL = os.getenv('DATABASE_URL', 'postgresql://perfumatch_user:perfumatc
 app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URL
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+# Havuz boyutu, pre-ping, statement_timeout ve GET için salt okunur transaction (DB_* ortam değişkenleri)
+configure_database(app, db)
+
 # Veritabanını başlat
 init_db(app)
 
+# Arama geçmişi arka planda toplu yazılır; popülerlik kovaları aynı batch'te artırılır.
+# Bellek içi SQLite'ta (testler) tek bağlantı paylaşıldığı için arka plan thread'i
+# çalışmaz, olaylar flush() ile yazılır.
+popularity_rollups = PopularityRollups()
+search_history_writer = SearchHistoryWriter(
+    app, rollups=popularity_rollups,
+    background=not is_memory_sqlite(app.config['SQLALCHEMY_DATABASE_URI'])
+)
+
+# Yükseltilmiş kurulum: kova tablosu boşsa mevcut arama geçmişinden bir kez doldur
+with app.app_context():
+    try:
+        popularity_rollups.backfill()
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"Popülerlik kovaları doldurulamadı: {e}")
+
+# Parfumo aramaları süreç içinde, paylaşılan HTTP oturumlu worker havuzunda
+parfumo_service = ParfumoLookupService()
+
+# Sağlık kontrolündeki tablo sayıları (her yoklamada COUNT(*) çalışmasın)
+table_stats = TableStatsSnapshot({
+    'perfumes': 'perfumes',
+    'brands': 'brands',
+    'similarities': 'perfume_similarities'
+})
+
 # Statik dosyalar için route'lar
 @app.route('/')
 def serve_index():
@@ -67,19 +103,17 @@ def search_perfume():
         search_term = data.get('searchTerm', '').strip()
         gender = data.get('gender', 'all')
         limit = data.get('limit', 10)
+        fuzzy = data.get('fuzzy', False)
         
         if not search_term:
             return jsonify({'error': 'Arama terimi gerekli'}), 400
         
         logging.info(f"Veritabanında arama: {search_type} - {search_term}")
         
-        # Arama geçmişine kaydet
-        save_search_history(search_term, search_type, request.remote_addr, request.user_agent.string)
-        
         results = []
         
         if search_type == 'name':
-            perfumes = search_perfumes_by_name(search_term, limit)
+            perfumes = search_perfumes_by_name(search_term, limit, include_similarities=True, fuzzy=fuzzy)
             results = [p.to_dict(include_similarities=True) for p in perfumes]
             
         elif search_type == 'notes':
@@ -92,17 +126,27 @@ def search_perfume():
             perfumes = search_perfumes_by_family(search_term, limit)
             results = [p.to_dict() for p in perfumes]
         
+        elif search_type == 'text':
+            # İsim + açıklama üzerinde sıralı tam metin arama
+            perfumes = search_perfumes_by_text(search_term, limit)
+            results = [p.to_dict() for p in perfumes]
+        
         # Cinsiyet filtreleme
         if gender != 'all':
             gender_map = {'men': 'men', 'women': 'women', 'unisex': 'unisex'}
             if gender in gender_map:
                 results = [r for r in results if r['gender'] == gender_map[gender]]
         
+        # Arama geçmişine kaydet (kuyruğa bırakılır, istek yazmayı beklemez)
+        save_search_history(search_term, search_type, request.remote_addr, request.user_agent.string,
+                            results_count=len(results))
+        
         return jsonify({
             'results': results,
             'count': len(results),
             'search_type': search_type,
-            'search_term': search_term
+            'search_term': search_term,
+            'fuzzy': fuzzy
         })
         
     except Exception as e:
@@ -122,8 +166,21 @@ def parfumo_search_perfume():
         
         logging.info(f"Parfumo'dan parfüm aranıyor: {brand} - {perfume_name}")
         
-        # Python script'ini çağır
-        result = call_python_scraper(brand, perfume_name)
+        # Parfumo worker havuzunda ara
+        try:
+            result = call_python_scraper(brand, perfume_name)
+        except ParfumoBusyError as e:
+            logging.warning(f"Parfumo havuzu dolu: {e}")
+            return jsonify({'error': 'Parfumo araması şu anda yoğun, lütfen tekrar deneyin'}), 503
+        except ParfumoPendingError as e:
+            # Arama arka planda sürüyor; aynı istek retry_after saniye sonra tekrarlanır
+            response = jsonify({
+                'pending': True,
+                'retry_after': e.retry_after,
+                'timeout_seconds': parfumo_service.worst_case_seconds()
+            })
+            response.headers['Retry-After'] = str(int(math.ceil(e.retry_after)))
+            return response, 202
         
         if result:
             # Veritabanından benzer parfümleri bul
@@ -142,7 +199,9 @@ def parfumo_search_perfume():
 def get_perfume_detail(perfume_id):
     """Parfüm detayını getir"""
     try:
-        perfume = Perfume.query.get_or_404(perfume_id)
+        perfume = Perfume.query.options(
+            *perfume_load_options(include_similarities=True)
+        ).get_or_404(perfume_id)
         return jsonify(perfume.to_dict(include_notes=True, include_similarities=True))
     except Exception as e:
         logging.error(f"Parfüm detay hatası: {e}")
@@ -166,24 +225,28 @@ def get_luxury_perfumes():
         gender = request.args.get('gender', 'all')
         limit = int(request.args.get('limit', 50))
         
-        # Lüks markaları al
-        luxury_brands = Brand.query.filter_by(type='luxury').all()
-        luxury_brand_ids = [b.id for b in luxury_brands]
-        
-        # Lüks parfümleri sorgula
-        query = Perfume.query.filter(Perfume.brand_id.in_(luxury_brand_ids))
-        
-        # Cinsiyet filtreleme
-        if gender != 'all':
-            query = query.filter_by(gender=gender)
+        def build():
+            # Lüks markaları al
+            luxury_brands = Brand.query.filter_by(type='luxury').all()
+            luxury_brand_ids = [b.id for b in luxury_brands]
+            
+            # Lüks parfümleri sorgula
+            query = Perfume.query.filter(Perfume.brand_id.in_(luxury_brand_ids))
+            
+            # Cinsiyet filtreleme
+            if gender != 'all':
+                query = query.filter_by(gender=gender)
+            
+            perfumes = query.options(*perfume_load_options()).limit(limit).all()
+            results = [p.to_dict(include_notes=True) for p in perfumes]
+            
+            return {
+                'perfumes': results,
+                'count': len(results)
+            }
         
-        perfumes = query.limit(limit).all()
-        results = [p.to_dict(include_notes=True) for p in perfumes]
-        
-        return jsonify({
-            'perfumes': results,
-            'count': len(results)
-        })
+        # Katalog değişene kadar aynı JSON baytları (ETag / 304 destekli)
+        return catalog_cache.respond('luxury-perfumes', build)
         
     except Exception as e:
         logging.error(f"Lüks parfüm listesi hatası: {e}")
@@ -203,39 +266,26 @@ def find_alternatives():
         if not luxury_perfume_id:
             return jsonify({'error': 'Lüks parfüm ID gerekli'}), 400
         
-        # Benzerlik kayıtlarını sorgula
-        query = PerfumeSimilarity.query.filter_by(luxury_perfume_id=luxury_perfume_id)
-        
-        # Minimum benzerlik filtresi
-        query = query.filter(PerfumeSimilarity.similarity_score >= min_similarity)
-        
-        # Cinsiyet eşleşmesi filtresi
-        if gender_match:
-            query = query.filter_by(gender_match=True)
-        
-        # Benzerlik skoruna göre sırala
-        similarities = query.order_by(PerfumeSimilarity.similarity_score.desc()).all()
+        # Eşik, cinsiyet, fiyat, sıralama ve LIMIT tek sorguda
+        matches = find_alternative_perfumes(
+            luxury_perfume_id,
+            min_similarity=min_similarity,
+            max_price=max_price,
+            gender_match=gender_match,
+            limit=limit
+        )
         
         results = []
-        for sim in similarities:
-            alternative_perfume = Perfume.query.get(sim.alternative_perfume_id)
-            
-            # Fiyat filtresi
-            if max_price and alternative_perfume.price and alternative_perfume.price > max_price:
-                continue
-            
+        for sim, alternative_perfume in matches:
             alternative_data = alternative_perfume.to_dict(include_notes=True)
             alternative_data['similarity_score'] = float(sim.similarity_score)
             alternative_data['price_difference'] = float(sim.price_difference) if sim.price_difference else None
             alternative_data['gender_match'] = sim.gender_match
             
             results.append(alternative_data)
-            
-            if len(results) >= limit:
-                break
         
         # Lüks parfüm bilgisini de ekle
-        luxury_perfume = Perfume.query.get(luxury_perfume_id)
+        luxury_perfume = Perfume.query.options(*perfume_joined_options()).get(luxury_perfume_id)
         luxury_data = luxury_perfume.to_dict(include_notes=True) if luxury_perfume else None
         
         return jsonify({
@@ -257,17 +307,23 @@ def find_alternatives():
 def get_luxury_brands():
     """Lüks markaları getir"""
     try:
-        brands = Brand.query.filter_by(type='luxury').all()
-        results = []
-        
-        for brand in brands:
-            brand_data = brand.to_dict()
-            # Marka altındaki parfüm sayısını ekle
-            perfume_count = Perfume.query.filter_by(brand_id=brand.id).count()
-            brand_data['perfume_count'] = perfume_count
-            results.append(brand_data)
-        
-        return jsonify(results)
+        include_stats = request.args.get('stats', 'false').lower() in ('1', 'true', 'yes')
+        
+        def build():
+            results = []
+            # Parfüm sayıları ve fiyat istatistikleri tek GROUP BY sorgusunda
+            for brand, perfume_count, min_price, avg_price, covered in get_brand_stats('luxury'):
+                brand_data = brand.to_dict()
+                brand_data['perfume_count'] = perfume_count
+                if include_stats:
+                    brand_data['min_price'] = float(min_price) if min_price is not None else None
+                    brand_data['avg_price'] = round(float(avg_price), 2) if avg_price is not None else None
+                    brand_data['similarity_coverage'] = round(covered / perfume_count, 4) if perfume_count else 0.0
+                results.append(brand_data)
+            return results
+        
+        # İçe aktarımdan sonra nesil sayacıyla yenilenir
+        return catalog_cache.respond('brands-luxury', build)
         
     except Exception as e:
         logging.error(f"Lüks marka listesi hatası: {e}")
@@ -277,8 +333,7 @@ def get_luxury_brands():
 def get_brands():
     """Tüm markaları getir"""
     try:
-        brands = Brand.query.all()
-        return jsonify([brand.to_dict() for brand in brands])
+        return catalog_cache.respond('brands', lambda: [brand.to_dict() for brand in Brand.query.all()])
     except Exception as e:
         logging.error(f"Marka listesi hatası: {e}")
         return jsonify({'error': 'Markalar getirilemedi'}), 500
@@ -287,8 +342,9 @@ def get_brands():
 def get_families():
     """Parfüm ailelerini getir"""
     try:
-        families = PerfumeFamily.query.all()
-        return jsonify([family.to_dict() for family in families])
+        return catalog_cache.respond(
+            'families', lambda: [family.to_dict() for family in PerfumeFamily.query.all()]
+        )
     except Exception as e:
         logging.error(f"Aile listesi hatası: {e}")
         return jsonify({'error': 'Aileler getirilemedi'}), 500
@@ -298,13 +354,14 @@ def get_notes():
     """Notaları getir"""
     try:
         note_type = request.args.get('type')  # top, middle, base
-        query = Note.query
         
-        if note_type:
-            query = query.filter_by(type=note_type)
+        def build():
+            query = Note.query
+            if note_type:
+                query = query.filter_by(type=note_type)
+            return [note.to_dict() for note in query.all()]
         
-        notes = query.all()
-        return jsonify([note.to_dict() for note in notes])
+        return catalog_cache.respond('notes', build)
     except Exception as e:
         logging.error(f"Nota listesi hatası: {e}")
         return jsonify({'error': 'Notalar getirilemedi'}), 500
@@ -343,28 +400,13 @@ def rate_perfume(perfume_id):
 def get_popular_perfumes():
     """Popüler parfümleri getir"""
     try:
-        # En çok aranan parfümler (arama geçmişinden)
-        popular_searches = db.session.query(
-            SearchHistory.search_term,
-            db.func.count(SearchHistory.id).label('search_count')
-        ).filter(
-            SearchHistory.search_type == 'name'
-        ).group_by(
-            SearchHistory.search_term
-        ).order_by(
-            db.func.count(SearchHistory.id).desc()
-        ).limit(10).all()
-        
-        # En yüksek puanlı parfümler
-        top_rated = Perfume.query.filter(
-            Perfume.rating.isnot(None)
-        ).order_by(
-            Perfume.rating.desc()
-        ).limit(10).all()
+        # En çok aranan / yükselen terimler ve en yüksek puanlılar önceden hesaplanmış görüntüden
+        snapshot = popularity_rollups.snapshot()
         
         return jsonify({
-            'popular_searches': [{'term': term, 'count': count} for term, count in popular_searches],
-            'top_rated': [p.to_dict() for p in top_rated]
+            'popular_searches': snapshot['popular_searches'],
+            'trending': snapshot['trending'],
+            'top_rated': snapshot['top_rated']
         })
         
     except Exception as e:
@@ -381,7 +423,11 @@ def import_data():
             return jsonify({'error': 'Yetkisiz erişim'}), 401
         
         importer = DataImporter()
-        importer.import_all_data()
+        try:
+            importer.import_all_data()
+        finally:
+            # Kısmi içe aktarım da kataloğu değiştirmiş olabilir
+            catalog_cache.bump()
         
         return jsonify({'message': 'Veriler başarıyla içe aktarıldı'})
         
@@ -389,26 +435,52 @@ def import_data():
         logging.error(f"Veri içe aktarma hatası: {e}")
         return jsonify({'error': 'Veri içe aktarma başarısız'}), 500
 
+@app.route('/api/health/live')
+def liveness_check():
+    """Canlılık kontrolü: süreç istek karşılıyor mu (veritabanına gitmez)"""
+    return jsonify({'status': 'alive'})
+
+@app.route('/api/health/ready')
+def readiness_check():
+    """Hazırlık kontrolü: veritabanına bağlanılabiliyor mu"""
+    try:
+        db.session.execute(db.text('SELECT 1'))
+        return jsonify({
+            'status': 'ready',
+            'database': 'connected',
+            'pool': pool_status(db.engine)
+        })
+    except Exception as e:
+        logging.error(f"Hazırlık kontrolü hatası: {e}")
+        return jsonify({
+            'status': 'not_ready',
+            'database': 'disconnected',
+            'error': str(e)
+        }), 503
+
 @app.route('/api/health')
 def health_check():
-    """Sunucu sağlık kontrolü"""
+    """Sunucu sağlık kontrolü ve istatistikler"""
     try:
         # Veritabanı bağlantısını test et
         db.session.execute(db.text('SELECT 1'))
         
-        # İstatistikleri al
-        perfume_count = Perfume.query.count()
-        brand_count = Brand.query.count()
-        similarity_count = PerfumeSimilarity.query.count()
+        # Tablo sayıları periyodik yenilenen görüntüden (PostgreSQL'de reltuples tahmini)
+        snapshot = table_stats.get()
         
         return jsonify({
             'status': 'healthy',
             'message': 'PerfuMatch API çalışıyor',
             'database': 'connected',
-            'stats': {
-                'perfumes': perfume_count,
-                'brands': brand_count,
-                'similarities': similarity_count
+            'stats': snapshot['counts'],
+            'stats_source': snapshot['source'],
+            'stats_age_seconds': snapshot['age_seconds'],
+            'pool': pool_status(db.engine),
+            'caches': {
+                'catalog': catalog_cache.stats(),
+                'note_names': note_name_cache.stats(),
+                'search_history': search_history_writer.stats(),
+                'parfumo': parfumo_service.stats()
             }
         })
     except Exception as e:
@@ -422,44 +494,11 @@ def health_check():
 # Yardımcı fonksiyonlar
 
 def call_python_scraper(brand, perfume_name):
-    """Python scraper script'ini çağır"""
-    try:
-        script_path = Path('scrapping/request_branded.py')
-        
-        if not script_path.exists():
-            logging.error(f"Script bulunamadı: {script_path}")
-            return None
-        
-        process = subprocess.Popen(
-            [sys.executable, str(script_path)],
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            encoding='utf-8'
-        )
-        
-        input_data = f"{brand}\n{perfume_name}\n"
-        stdout, stderr = process.communicate(input=input_data, timeout=30)
-        
-        if process.returncode == 0 and stdout.strip():
-            try:
-                result = json.loads(stdout.strip())
-                logging.info("Python script başarıyla çalıştı")
-                return result
-            except json.JSONDecodeError as e:
-                logging.error(f"JSON parse hatası: {e}")
-                return None
-        else:
-            logging.error(f"Script hatası: {stderr}")
-            return None
-            
-    except subprocess.TimeoutExpired:
-        logging.error("Script timeout")
-        return None
-    except Exception as e:
-        logging.error(f"Script çağırma hatası: {e}")
-        return None
+    """Parfumo aramasını süreç içi worker havuzunda yap (havuz doluysa ParfumoBusyError, sürüyorsa ParfumoPendingError)"""
+    result = parfumo_service.lookup(brand, perfume_name)
+    if result:
+        logging.info("Parfumo araması başarılı")
+    return result
 
 def find_similar_perfumes_in_db(notes_list):
     """Veritabanında benzer parfümleri bul"""
@@ -470,40 +509,20 @@ def find_similar_perfumes_in_db(notes_list):
         # Nota isimlerini normalize et
         note_names = [note.strip() for note in notes_list if note.strip()]
         
-        # Benzer parfümleri bul
-        perfumes = search_perfumes_by_notes(note_names, limit=5)
-        
-        # Sadece alternatif markaları döndür
-        alternative_brands = Brand.query.filter_by(type='alternative').all()
-        alternative_brand_ids = [b.id for b in alternative_brands]
-        
-        alternatives = [
-            p.to_dict() for p in perfumes 
-            if p.brand_id in alternative_brand_ids
-        ]
+        # Benzer alternatif parfümleri bul (marka filtresi LIMIT'ten önce)
+        perfumes = search_perfumes_by_notes(note_names, limit=5, brand_type='alternative')
         
-        return alternatives
+        return [p.to_dict() for p in perfumes]
         
     except Exception as e:
         logging.error(f"Benzer parfüm arama hatası: {e}")
         return []
 
-def save_search_history(search_term, search_type, ip_address, user_agent):
-    """Arama geçmişini kaydet"""
-    try:
-        search_history = SearchHistory(
-            search_term=search_term,
-            search_type=search_type,
-            ip_address=ip_address,
-            user_agent=user_agent
-        )
-        
-        db.session.add(search_history)
-        db.session.commit()
-        
-    except Exception as e:
-        logging.error(f"Arama geçmişi kaydetme hatası: {e}")
-        db.session.rollback()
+def save_search_history(search_term, search_type, ip_address, user_agent, results_count=None):
+    """Arama geçmişini arka plan yazıcısının kuyruğuna bırak"""
+    if not search_history_writer.record(search_term, search_type, results_count=results_count,
+                                        ip_address=ip_address, user_agent=user_agent):
+        logging.debug("Arama geçmişi kuyruğu dolu, kayıt düşürüldü")
 
 # Mock endpoint (test için)
 @app.route('/api/perfume/mock/<brand>/<perfume_name>')
@@ -575,7 +594,9 @@ if __name__ == '__main__':
     logging.info("   - GET  /api/notes                 -> Nota listesi")
     logging.info("   - GET  /api/popular-perfumes      -> Popüler parfümler")
     logging.info("   - POST /api/admin/import-data     -> Veri içe aktarma")
-    logging.info("   - GET  /api/health                -> Sağlık kontrolü")
+    logging.info("   - GET  /api/health                -> Sağlık kontrolü ve istatistikler")
+    logging.info("   - GET  /api/health/live           -> Canlılık kontrolü")
+    logging.info("   - GET  /api/health/ready          -> Hazırlık kontrolü")
     
     # Sunucuyu başlat
     app.run(host='0.0.0.0', port=4421, debug=True)
\ No newline at end of file
@@ -169,7 +169,8 @@ def install_python_dependencies(pip_path):
         "beautifulsoup4==4.12.2",
         "python-dotenv==1.0.0",
         "lxml==4.9.3",
-        "Werkzeug==2.3.7"
+        "Werkzeug==2.3.7",
+        "numpy>=1.24"
     ]
     
     with open("requirements.txt", "w", encoding="utf-8") as f:
@@ -82,6 +82,14 @@ CREATE TABLE IF NOT EXISTS perfume_similarities (
     UNIQUE(luxury_perfume_id, alternative_perfume_id)
 );
 
+-- Artımlı benzerlik hesaplaması için parfüm içerik özetleri
+CREATE TABLE IF NOT EXISTS similarity_state (
+    perfume_id INTEGER PRIMARY KEY,
+    brand_type VARCHAR(20) NOT NULL,
+    content_hash VARCHAR(40) NOT NULL,
+    computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Kullanıcı değerlendirmeleri tablosu
 CREATE TABLE IF NOT EXISTS user_ratings (
     id SERIAL PRIMARY KEY,
@@ -98,23 +106,53 @@ CREATE TABLE IF NOT EXISTS user_ratings (
 CREATE TABLE IF NOT EXISTS search_history (
     id SERIAL PRIMARY KEY,
     search_term VARCHAR(200),
-    search_type VARCHAR(20) CHECK (search_type IN ('name', 'notes', 'family')),
+    search_type VARCHAR(20) CHECK (search_type IN ('name', 'notes', 'family', 'text')),
     results_count INTEGER,
     ip_address INET,
     user_agent TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Arama terimi sayaçları (saatlik / günlük / tüm zamanlar), arama geçmişi yazılırken artırılır
+CREATE TABLE IF NOT EXISTS search_term_rollups (
+    id SERIAL PRIMARY KEY,
+    granularity VARCHAR(10) NOT NULL CHECK (granularity IN ('hour', 'day', 'total')),
+    bucket_start TIMESTAMP NOT NULL,
+    search_type VARCHAR(20) NOT NULL,
+    search_term VARCHAR(200) NOT NULL,
+    search_count INTEGER NOT NULL DEFAULT 0,
+    UNIQUE(granularity, bucket_start, search_type, search_term)
+);
+
+-- Eski kurulumlarda arama tipi kısıtını güncelle
+ALTER TABLE search_history DROP CONSTRAINT IF EXISTS search_history_search_type_check;
+ALTER TABLE search_history ADD CONSTRAINT search_history_search_type_check
+    CHECK (search_type IN ('name', 'notes', 'family', 'text'));
+
+-- Tam metin arama: isim (A) + açıklama (Türkçe B, İngilizce C) için önceden hesaplanan tsvector
+ALTER TABLE perfumes ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('turkish', coalesce(name, '')), 'A') ||
+    setweight(to_tsvector('turkish', coalesce(description, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(description, '')), 'C')
+) STORED;
+
 -- İndeksler
 CREATE INDEX IF NOT EXISTS idx_perfumes_brand ON perfumes(brand_id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_perfumes_brand_name ON perfumes(brand_id, name);
 CREATE INDEX IF NOT EXISTS idx_perfumes_family ON perfumes(family_id);
 CREATE INDEX IF NOT EXISTS idx_perfumes_gender ON perfumes(gender);
 CREATE INDEX IF NOT EXISTS idx_perfumes_name ON perfumes USING gin(name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_brands_name_trgm ON brands USING gin(name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_perfumes_search_vector ON perfumes USING gin(search_vector);
 CREATE INDEX IF NOT EXISTS idx_perfume_notes_perfume ON perfume_notes(perfume_id);
 CREATE INDEX IF NOT EXISTS idx_perfume_notes_note ON perfume_notes(note_id);
-CREATE INDEX IF NOT EXISTS idx_similarities_luxury ON perfume_similarities(luxury_perfume_id);
+-- find-alternatives: lüks parfümün skorları sıralı okunur, eşik ve LIMIT indeksten karşılanır
+DROP INDEX IF EXISTS idx_similarities_luxury;
+CREATE INDEX IF NOT EXISTS idx_similarities_luxury_score ON perfume_similarities(luxury_perfume_id, similarity_score DESC)
+    INCLUDE (alternative_perfume_id, gender_match, price_difference);
 CREATE INDEX IF NOT EXISTS idx_similarities_alternative ON perfume_similarities(alternative_perfume_id);
 CREATE INDEX IF NOT EXISTS idx_similarities_score ON perfume_similarities(similarity_score DESC);
+CREATE INDEX IF NOT EXISTS idx_rollups_bucket_count ON search_term_rollups(granularity, search_type, bucket_start, search_count);
 
 -- Trigger fonksiyonu - updated_at otomatik güncelleme
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -55,10 +55,22 @@ class PerfumeAPI {
             perfumeName
         };
 
-        return await this.makeRequest(url, {
-            method: 'POST',
-            body: JSON.stringify(data)
-        });
+        // Arama sunucuda sürüyorsa 202 (pending) döner; aynı istek sonuç gelene
+        // ya da aramanın en uzun süresi (timeout_seconds) dolana kadar tekrarlanır
+        const started = Date.now();
+        while (true) {
+            const result = await this.makeRequest(url, {
+                method: 'POST',
+                body: JSON.stringify(data)
+            });
+            if (!result.pending) {
+                return result;
+            }
+            if (Date.now() - started > result.timeout_seconds * 1000) {
+                throw new Error('Parfumo araması zaman aşımına uğradı');
+            }
+            await new Promise(resolve => setTimeout(resolve, result.retry_after * 1000));
+        }
     }
 
     // Parfüm detayı
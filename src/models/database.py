@@ -2,9 +2,26 @@
 # -*- coding: utf-8 -*-
 
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import func, text
+from sqlalchemy import case, func, inspect, select, text, union
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import joinedload, selectinload
+from collections import defaultdict
 from datetime import datetime
+import logging
+import math
 import os
+import threading
+import time
+
+from src.utils.similarity_engine import GENDER_WEIGHT, FAMILY_WEIGHT, NOTE_WEIGHT
+from src.utils.bm25 import BM25Index
+from src.utils.note_registry import note_registry
+from src.utils.trigram import word_similarity
+
+# Bulanık isim araması için minimum pg_trgm word_similarity skoru
+FUZZY_THRESHOLD = 0.5
+
+logger = logging.getLogger(__name__)
 
 db = SQLAlchemy()
 
@@ -101,6 +118,9 @@ class Perfume(db.Model):
                                              foreign_keys='PerfumeSimilarity.alternative_perfume_id',
                                              backref='alternative_perfume', lazy=True)
     
+    # Toplu içe aktarmada ON CONFLICT (brand_id, name) hedefi
+    __table_args__ = (db.Index('idx_perfumes_brand_name', 'brand_id', 'name', unique=True),)
+    
     def to_dict(self, include_notes=True, include_similarities=False):
         result = {
             'id': self.id,
@@ -128,11 +148,12 @@ class Perfume(db.Model):
         }
         
         if include_notes:
-            result['notes'] = {
-                'top': [pn.note.to_dict() for pn in self.notes if pn.note.type == 'top'],
-                'middle': [pn.note.to_dict() for pn in self.notes if pn.note.type == 'middle'],
-                'base': [pn.note.to_dict() for pn in self.notes if pn.note.type == 'base']
-            }
+            notes = {'top': [], 'middle': [], 'base': []}
+            for pn in self.notes:
+                bucket = notes.get(pn.note.type)
+                if bucket is not None:
+                    bucket.append(pn.note.to_dict())
+            result['notes'] = notes
         
         if include_similarities:
             result['alternatives'] = [sim.to_dict() for sim in self.luxury_similarities]
@@ -176,7 +197,11 @@ class PerfumeSimilarity(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    __table_args__ = (db.UniqueConstraint('luxury_perfume_id', 'alternative_perfume_id'),)
+    __table_args__ = (
+        db.UniqueConstraint('luxury_perfume_id', 'alternative_perfume_id'),
+        db.Index('idx_similarities_luxury_score', 'luxury_perfume_id', similarity_score.desc(),
+                 postgresql_include=['alternative_perfume_id', 'gender_match', 'price_difference']),
+    )
     
     def to_dict(self):
         return {
@@ -192,6 +217,23 @@ class PerfumeSimilarity(db.Model):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
+class SimilarityState(db.Model):
+    """Benzerlik hesaplamasında kullanılan parfüm içeriğinin özeti (artımlı hesaplama için)"""
+    __tablename__ = 'similarity_state'
+    
+    perfume_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    brand_type = db.Column(db.String(20), nullable=False)  # luxury, alternative
+    content_hash = db.Column(db.String(40), nullable=False)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def to_dict(self):
+        return {
+            'perfume_id': self.perfume_id,
+            'brand_type': self.brand_type,
+            'content_hash': self.content_hash,
+            'computed_at': self.computed_at.isoformat() if self.computed_at else None
+        }
+
 class UserRating(db.Model):
     __tablename__ = 'user_ratings'
     
@@ -219,17 +261,27 @@ class UserRating(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
+# search_history.search_type için izin verilen değerler (sql/init.sql CHECK kısıtı ile aynı)
+SEARCH_TYPES = ('name', 'notes', 'family', 'text')
+
 class SearchHistory(db.Model):
     __tablename__ = 'search_history'
     
     id = db.Column(db.Integer, primary_key=True)
     search_term = db.Column(db.String(200))
-    search_type = db.Column(db.String(20))  # name, notes, family
+    search_type = db.Column(db.String(20))  # name, notes, family, text
     results_count = db.Column(db.Integer)
     ip_address = db.Column(db.String(45))
     user_agent = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        db.CheckConstraint(
+            "search_type IN (%s)" % ', '.join(f"'{search_type}'" for search_type in SEARCH_TYPES),
+            name='search_history_search_type_check'
+        ),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -239,7 +291,85 @@ class SearchHistory(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
+class SearchTermRollup(db.Model):
+    """Arama terimi sayaçları: saatlik, günlük ve tüm zamanlar kovaları"""
+    __tablename__ = 'search_term_rollups'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    granularity = db.Column(db.String(10), nullable=False)  # hour, day, total
+    bucket_start = db.Column(db.DateTime, nullable=False)
+    search_type = db.Column(db.String(20), nullable=False)
+    search_term = db.Column(db.String(200), nullable=False)
+    search_count = db.Column(db.Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        db.UniqueConstraint('granularity', 'bucket_start', 'search_type', 'search_term'),
+        db.Index('idx_rollups_bucket_count', 'granularity', 'search_type', 'bucket_start', 'search_count'),
+    )
+    
+    def to_dict(self):
+        return {
+            'granularity': self.granularity,
+            'bucket_start': self.bucket_start.isoformat() if self.bucket_start else None,
+            'search_type': self.search_type,
+            'search_term': self.search_term,
+            'search_count': self.search_count
+        }
+
 # Yardımcı fonksiyonlar
+# create_all var olan tablolara indeks / sütun eklemez. sql/init.sql ile
+# kurulmamış ya da önceki sürümden yükseltilmiş veritabanları için açılışta
+# çalıştırılan idempotent DDL: (isim, lehçeler (None: hepsi), ifade)
+SCHEMA_UPGRADES = [
+    # bulk_loader.write_perfumes ON CONFLICT (brand_id, name) hedefi
+    ('idx_perfumes_brand_name', None,
+     'CREATE UNIQUE INDEX IF NOT EXISTS idx_perfumes_brand_name ON perfumes(brand_id, name)'),
+    # search_perfumes_by_text tsvector sütunu ve GIN indeksi (sql/init.sql ile aynı)
+    ('perfumes.search_vector', ('postgresql',),
+     """ALTER TABLE perfumes ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('turkish', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('turkish', coalesce(description, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'C')
+        ) STORED"""),
+    ('idx_perfumes_search_vector', ('postgresql',),
+     'CREATE INDEX IF NOT EXISTS idx_perfumes_search_vector ON perfumes USING gin(search_vector)'),
+]
+
+# Motor -> perfumes.search_vector sütunu var mı (upgrade_schema sonrası yeniden bakılır)
+_search_vector_columns = {}
+
+def upgrade_schema():
+    """SCHEMA_UPGRADES'i uygula; uygulanan (ya da zaten var olan) adımların isimlerini döndür
+    
+    Her adım kendi transaction'ındadır; başarısız adım (ör. tekrar eden
+    marka + isim satırları yüzünden benzersiz indeks kurulamıyorsa) loglanır,
+    diğer adımlar etkilenmez.
+    """
+    dialect = db.engine.dialect.name
+    applied = []
+    for name, dialects, statement in SCHEMA_UPGRADES:
+        if dialects and dialect not in dialects:
+            continue
+        try:
+            with db.engine.begin() as connection:
+                connection.execute(text(statement))
+            applied.append(name)
+        except SQLAlchemyError as e:
+            logger.error(f"Şema yükseltmesi uygulanamadı ({name}): {e}")
+    _search_vector_columns.clear()
+    return applied
+
+def has_search_vector():
+    """perfumes.search_vector sütunu var mı (motor başına bir kez bakılır)"""
+    engine = db.engine
+    available = _search_vector_columns.get(engine)
+    if available is None:
+        available = any(column['name'] == 'search_vector' for column in inspect(engine).get_columns('perfumes'))
+        _search_vector_columns[engine] = available
+        if not available and engine.dialect.name == 'postgresql':
+            logger.warning("perfumes.search_vector yok; tam metin araması bellekte BM25 ile yapılacak")
+    return available
+
 def init_db(app):
     """Veritabanını başlat"""
     db.init_app(app)
@@ -247,62 +377,354 @@ def init_db(app):
     with app.app_context():
         # Tabloları oluştur (eğer yoksa)
         db.create_all()
+        # Var olan tablolara eksik indeksleri ekle
+        upgrade_schema()
 
 def get_db_connection():
     """Veritabanı bağlantısını al"""
     return db
 
-def search_perfumes_by_name(search_term, limit=10):
-    """İsme göre parfüm ara"""
+def perfume_load_options(include_notes=True, include_similarities=False):
+    """Perfume.to_dict'in okuduğu ilişkileri toplu yükleyen sorgu seçenekleri
+    
+    Her ilişki tüm sonuç sayfası için tek bir SELECT ... IN sorgusuyla gelir;
+    istek başına sorgu sayısı sonuç sayısından bağımsız kalır.
+    """
+    options = [selectinload(Perfume.brand), selectinload(Perfume.family)]
+    if include_notes:
+        options.append(selectinload(Perfume.notes).joinedload(PerfumeNote.note))
+    if include_similarities:
+        # luxury_perfume zaten yüklü parfümün kendisi; identity map'ten gelir
+        options.append(
+            selectinload(Perfume.luxury_similarities)
+            .selectinload(PerfumeSimilarity.alternative_perfume)
+            .options(*perfume_load_options())
+        )
+    return options
+
+def perfume_joined_options():
+    """perfume_load_options'ın tek sorgulu hali: ilişkiler ana sorguya JOIN edilir"""
+    return [
+        joinedload(Perfume.brand),
+        joinedload(Perfume.family),
+        joinedload(Perfume.notes).joinedload(PerfumeNote.note)
+    ]
+
+def similarity_load_options():
+    """PerfumeSimilarity.to_dict için iki parfümü ve ilişkilerini toplu yükle"""
+    return [
+        selectinload(PerfumeSimilarity.luxury_perfume).options(*perfume_load_options()),
+        selectinload(PerfumeSimilarity.alternative_perfume).options(*perfume_load_options())
+    ]
+
+def search_perfumes_by_name(search_term, limit=10, include_similarities=False, fuzzy=False):
+    """İsme göre parfüm ara (fuzzy=True: yazım hatalarına dayanıklı, skora göre sıralı)"""
+    if fuzzy:
+        return search_perfumes_fuzzy(search_term, limit, include_similarities)
+    
     return Perfume.query.join(Brand).filter(
         db.or_(
             Perfume.name.ilike(f'%{search_term}%'),
             Brand.name.ilike(f'%{search_term}%')
         )
+    ).options(
+        *perfume_load_options(include_similarities=include_similarities)
     ).limit(limit).all()
 
-def search_perfumes_by_notes(note_names, limit=10):
-    """Notalara göre parfüm ara"""
-    return Perfume.query.join(PerfumeNote).join(Note).filter(
-        Note.name.in_(note_names)
-    ).group_by(Perfume.id).having(
-        func.count(Note.id) >= len(note_names) * 0.5  # En az %50 nota eşleşmesi
+def search_perfumes_fuzzy(search_term, limit=10, include_similarities=False, threshold=FUZZY_THRESHOLD):
+    """Parfüm ve marka isminde trigram benzerliğiyle ara, en benzerden başlayarak sırala
+    
+    PostgreSQL'de adaylar perfumes.name ve brands.name üzerindeki pg_trgm GIN
+    indeksleriyle ayrı ayrı bulunur (OR yerine UNION; böylece iki indeks de
+    kullanılır). Diğer veritabanlarında aynı skor süreç içinde hesaplanır.
+    """
+    if db.session.get_bind().dialect.name != 'postgresql':
+        return _search_perfumes_fuzzy_in_process(search_term, limit, include_similarities, threshold)
+    
+    # %> operatörünün eşiği; sadece bu transaction için
+    db.session.execute(
+        text("SELECT set_config('pg_trgm.word_similarity_threshold', :threshold, true)"),
+        {'threshold': str(threshold)}
+    )
+    
+    candidates = union(
+        select(Perfume.id).where(Perfume.name.op('%>')(search_term)),
+        select(Perfume.id).join(Brand, Perfume.brand_id == Brand.id).where(Brand.name.op('%>')(search_term))
+    ).subquery()
+    
+    score = func.greatest(
+        func.word_similarity(search_term, Perfume.name),
+        func.coalesce(func.word_similarity(search_term, Brand.name), 0)
+    )
+    
+    return Perfume.query.outerjoin(Brand).filter(
+        Perfume.id.in_(select(candidates.c.id))
+    ).options(
+        *perfume_load_options(include_similarities=include_similarities)
+    ).order_by(score.desc(), Perfume.id).limit(limit).all()
+
+def _search_perfumes_fuzzy_in_process(search_term, limit, include_similarities, threshold):
+    """pg_trgm olmayan veritabanları için aynı skorla bellekte arama"""
+    scored = []
+    rows = db.session.query(Perfume.id, Perfume.name, Brand.name).outerjoin(Brand, Perfume.brand_id == Brand.id)
+    for perfume_id, perfume_name, brand_name in rows:
+        score = max(word_similarity(search_term, perfume_name), word_similarity(search_term, brand_name or ''))
+        if score >= threshold:
+            scored.append((-score, perfume_id))
+    
+    ids = [perfume_id for _, perfume_id in sorted(scored)[:limit]]
+    if not ids:
+        return []
+    
+    perfumes = Perfume.query.filter(Perfume.id.in_(ids)).options(
+        *perfume_load_options(include_similarities=include_similarities)
+    ).all()
+    by_id = {perfume.id: perfume for perfume in perfumes}
+    return [by_id[perfume_id] for perfume_id in ids]
+
+def search_perfumes_by_text(search_term, limit=10):
+    """İsim ve açıklamada tam metin arama, sıralama ts_rank_cd (PostgreSQL) ya da BM25 ile
+    
+    perfumes.search_vector sql/init.sql'de ve açılışta upgrade_schema ile
+    üretilen (GENERATED) bir sütundur ve GIN indekslidir; modelde tanımlı
+    değildir. Sütun eklenemediyse BM25'e düşülür. Sorgu Türkçe ve İngilizce
+    yapılandırmalarla ayrı ayrı çözümlenip OR ile birleştirilir.
+    """
+    if db.session.get_bind().dialect.name != 'postgresql' or not has_search_vector():
+        return _search_perfumes_by_text_in_process(search_term, limit)
+    
+    search_vector = db.literal_column('perfumes.search_vector')
+    query = func.websearch_to_tsquery(text("'turkish'"), search_term).op('||')(
+        func.websearch_to_tsquery(text("'english'"), search_term)
+    )
+    
+    return Perfume.query.filter(
+        search_vector.op('@@')(query)
+    ).options(
+        *perfume_load_options()
+    ).order_by(
+        func.ts_rank_cd(search_vector, query).desc(), Perfume.id
+    ).limit(limit).all()
+
+def _search_perfumes_by_text_in_process(search_term, limit):
+    """tsvector sütunu olmayan veritabanları için bellekte BM25 araması"""
+    rows = db.session.query(Perfume.id, Perfume.name, Perfume.description).order_by(Perfume.id).all()
+    index = BM25Index(f"{name or ''} {description or ''}" for _, name, description in rows)
+    ids = [rows[position][0] for position, _ in index.search(search_term, limit)]
+    if not ids:
+        return []
+    
+    perfumes = Perfume.query.filter(Perfume.id.in_(ids)).options(*perfume_load_options()).all()
+    by_id = {perfume.id: perfume for perfume in perfumes}
+    return [by_id[perfume_id] for perfume_id in ids]
+
+class NoteNameCache:
+    """Kanonik nota id'si -> nota id'leri ve nota ağırlıkları (nadirlik, IDF)
+    
+    Note tablosu tek bir gruplu sorguyla okunur; aynı notanın farklı yazımları
+    ("Misk", "Musk", "Beyaz Misk") note_registry'deki kanonik id altında
+    toplanır. max_age saniye sonra ya da invalidate() çağrılınca (yeni nota
+    eklendiğinde) yeniden yüklenir.
+    """
+    
+    def __init__(self, max_age=300):
+        self.max_age = max_age
+        self._ids = {}
+        self._canonical = {}
+        self._weights = {}
+        self._loaded_at = None
+        self._lock = threading.Lock()
+    
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+    
+    def _ensure_loaded(self):
+        with self._lock:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.max_age:
+                return
+            
+            rows = db.session.query(
+                Note.id, Note.name, func.count(PerfumeNote.id)
+            ).outerjoin(
+                PerfumeNote, PerfumeNote.note_id == Note.id
+            ).group_by(Note.id, Note.name).all()
+            perfume_count = db.session.query(func.count(Perfume.id)).scalar()
+            
+            ids = defaultdict(list)
+            canonical = {}
+            counts = defaultdict(int)
+            for note_id, name, count in rows:
+                canonical_id = note_registry.add(name)
+                ids[canonical_id].append(note_id)
+                canonical[note_id] = canonical_id
+                counts[canonical_id] += count
+            
+            # Nadir notalarda eşleşme daha değerli; nadirlik tüm yazımlar üzerinden
+            weights = {
+                note_id: math.log(1 + (perfume_count + 1) / (counts[canonical_id] + 1))
+                for note_id, canonical_id in canonical.items()
+            }
+            
+            self._ids = dict(ids)
+            self._canonical = canonical
+            self._weights = weights
+            self._loaded_at = time.monotonic()
+    
+    def resolve(self, note_names):
+        """Nota isimlerini (yazım farkı gözetmeden, kanonik id üzerinden) nota id'lerine çevir"""
+        self._ensure_loaded()
+        return [note_id for name in note_names for note_id in self._ids.get(note_registry.id_of(name), [])]
+    
+    def canonical(self, note_ids):
+        """Nota id'si -> kanonik nota id'si"""
+        self._ensure_loaded()
+        return {note_id: self._canonical.get(note_id) for note_id in note_ids}
+    
+    def weights(self, note_ids):
+        self._ensure_loaded()
+        return {note_id: self._weights.get(note_id, 1.0) for note_id in note_ids}
+    
+    def stats(self):
+        with self._lock:
+            return {
+                'names': len(self._ids),
+                'age_seconds': round(time.monotonic() - self._loaded_at, 1) if self._loaded_at is not None else None
+            }
+
+note_name_cache = NoteNameCache()
+
+def search_perfumes_by_notes(note_names, limit=10, brand_type=None):
+    """Notalara göre parfüm ara, ağırlıklı nota örtüşmesine göre sırala
+    
+    İsimler kanonik nota id'leri üzerinden (Türkçe/İngilizce yazım farkı
+    gözetmeden) id'lere çevrilir; en az %50 kanonik nota eşleşmesi olan
+    parfümler nadir notalara daha çok ağırlık
+    veren örtüşme skoruyla tek sorguda sıralanır. brand_type verilirse
+    (luxury/alternative) marka filtresi LIMIT'ten önce uygulanır.
+    """
+    keys = list(dict.fromkeys(key for key in map(note_registry.canonical_key, note_names) if key))
+    note_ids = note_name_cache.resolve(keys)
+    if not note_ids:
+        return []
+    
+    # Aynı notanın iki yazımını içeren parfüm bir kez sayılır
+    matched = func.count(func.distinct(case(note_name_cache.canonical(note_ids), value=PerfumeNote.note_id)))
+    score = func.sum(case(note_name_cache.weights(note_ids), value=PerfumeNote.note_id, else_=0))
+    
+    query = Perfume.query.join(
+        PerfumeNote, PerfumeNote.perfume_id == Perfume.id
+    ).filter(
+        PerfumeNote.note_id.in_(note_ids)
+    )
+    
+    if brand_type:
+        query = query.join(Brand, Perfume.brand_id == Brand.id).filter(Brand.type == brand_type)
+    
+    return query.group_by(Perfume.id).having(
+        matched >= len(keys) * 0.5  # En az %50 nota eşleşmesi
+    ).options(
+        *perfume_load_options()
+    ).order_by(
+        score.desc(), matched.desc(), Perfume.id
     ).limit(limit).all()
 
 def search_perfumes_by_family(family_name, limit=10):
     """Aileye göre parfüm ara"""
     return Perfume.query.join(PerfumeFamily).filter(
         PerfumeFamily.name.ilike(f'%{family_name}%')
+    ).options(*perfume_load_options()).limit(limit).all()
+
+def find_alternative_perfumes(luxury_perfume_id, min_similarity=30, max_price=None,
+                              gender_match=True, limit=20):
+    """Lüks parfümün alternatiflerini filtre, sıralama ve LIMIT SQL'de olacak şekilde getir
+    
+    (PerfumeSimilarity, Perfume) çiftleri döner; alternatif parfümün marka,
+    aile ve notaları aynı sorguda JOIN ile yüklenir.
+    """
+    query = db.session.query(PerfumeSimilarity, Perfume).join(
+        Perfume, Perfume.id == PerfumeSimilarity.alternative_perfume_id
+    ).filter(
+        PerfumeSimilarity.luxury_perfume_id == luxury_perfume_id,
+        PerfumeSimilarity.similarity_score >= min_similarity
+    )
+    
+    if gender_match:
+        query = query.filter(PerfumeSimilarity.gender_match.is_(True))
+    
+    # Fiyatı bilinmeyen alternatifler filtreden geçer
+    if max_price:
+        query = query.filter(db.or_(Perfume.price.is_(None), Perfume.price <= max_price))
+    
+    return query.options(*perfume_joined_options()).order_by(
+        PerfumeSimilarity.similarity_score.desc(),
+        PerfumeSimilarity.id
     ).limit(limit).all()
 
+def get_brand_stats(brand_type=None):
+    """Markalar ve parfüm istatistikleri tek GROUP BY sorgusunda
+    
+    (Brand, parfüm sayısı, en düşük fiyat, ortalama fiyat, benzerlik kaydı
+    olan parfüm sayısı) satırları döner. Parfümü olmayan markalar da sıfır
+    sayıyla listelenir.
+    """
+    # Lüks ya da alternatif tarafında en az bir benzerlik kaydı olan parfümler
+    covered = union(
+        select(PerfumeSimilarity.luxury_perfume_id.label('perfume_id')),
+        select(PerfumeSimilarity.alternative_perfume_id.label('perfume_id'))
+    ).subquery()
+    
+    query = db.session.query(
+        Brand,
+        func.count(Perfume.id),
+        func.min(Perfume.price),
+        func.avg(Perfume.price),
+        func.count(covered.c.perfume_id)
+    ).outerjoin(
+        Perfume, Perfume.brand_id == Brand.id
+    ).outerjoin(
+        covered, covered.c.perfume_id == Perfume.id
+    )
+    
+    if brand_type:
+        query = query.filter(Brand.type == brand_type)
+    
+    return query.group_by(Brand.id).order_by(Brand.id).all()
+
 def get_similar_perfumes(perfume_id, limit=5):
     """Benzer parfümleri getir"""
     return PerfumeSimilarity.query.filter_by(
         luxury_perfume_id=perfume_id
+    ).options(
+        *similarity_load_options()
     ).order_by(
         PerfumeSimilarity.similarity_score.desc()
     ).limit(limit).all()
 
 def calculate_similarity_score(perfume1, perfume2):
-    """İki parfüm arasındaki benzerlik skorunu hesapla"""
+    """İki parfüm arasındaki benzerlik skorunu hesapla
+    
+    Tek çift içindir; toplu hesaplama src/utils/similarity_engine.py
+    üzerinden aynı ağırlıklarla vektörel yapılır.
+    """
     score = 0
     
     # Cinsiyet eşleşmesi (30 puan)
     if perfume1.gender == perfume2.gender or perfume1.gender == 'unisex' or perfume2.gender == 'unisex':
-        score += 30
+        score += GENDER_WEIGHT
     
     # Aile eşleşmesi (25 puan)
     if perfume1.family_id == perfume2.family_id:
-        score += 25
+        score += FAMILY_WEIGHT
     
-    # Nota benzerliği (45 puan)
-    notes1 = set([pn.note.name for pn in perfume1.notes])
-    notes2 = set([pn.note.name for pn in perfume2.notes])
+    # Nota benzerliği (45 puan): farklı yazımlar aynı kanonik nota id'sine düşer
+    notes1 = note_registry.id_set(pn.note.name for pn in perfume1.notes)
+    notes2 = note_registry.id_set(pn.note.name for pn in perfume2.notes)
     
     if notes1 and notes2:
         common_notes = len(notes1.intersection(notes2))
         total_notes = len(notes1.union(notes2))
-        note_similarity = (common_notes / total_notes) * 45
+        note_similarity = (common_notes / total_notes) * NOTE_WEIGHT
         score += note_similarity
     
     return min(score, 100)  # Maksimum 100 puan 
\ No newline at end of file
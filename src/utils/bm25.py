@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Parfüm açıklamaları için saf Python (NumPy) BM25 tam metin indeksi.
+
+PostgreSQL'deki tsvector aramasının JSON tabanlı katalog (app.py) ve SQLite
+için karşılığıdır. Metin Türkçe kurallarına göre küçük harfe çevrilir, hafif
+bir Türkçe/İngilizce ek atıcıdan geçirilir ve aksanlar katlanır (çiçekler ->
+cicek). Her terim için doküman numaraları ve sorgudan bağımsız BM25 ağırlıkları
+indeks kurulurken hesaplanır; sorgu, terim başına tek bir vektörel toplama ve
+np.partition ile en iyi K sonuca indirgenir.
+"""
+
+import re
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+_WORD_RE = re.compile(r'[^\W\d_]+')
+
+# Türkçe'ye özgü büyük/küçük harf ve aksan katlama
+_TURKISH_LOWER = str.maketrans({'I': 'ı', 'İ': 'i'})
+_FOLD = str.maketrans('çğıöşüâîû', 'cgiosuaiu')
+
+# Uzundan kısaya; kök en az MIN_STEM harf kalır
+_PLURAL_SUFFIXES = ('lar', 'ler')
+_CASE_SUFFIXES = (
+    'ından', 'inden', 'undan', 'ünden', 'ndan', 'nden', 'ının', 'inin', 'unun', 'ünün',
+    'ları', 'leri', 'yla', 'yle', 'dan', 'den', 'tan', 'ten', 'nın', 'nin', 'nun', 'nün',
+    'ını', 'ini', 'unu', 'ünü', 'daki', 'deki', 'da', 'de', 'ta', 'te', 'ın', 'in', 'un', 'ün',
+    'ı', 'i', 'u', 'ü',
+)
+_ENGLISH_SUFFIXES = ('s',)
+MIN_STEM = 3
+
+
+def _strip(word: str, suffixes: Tuple[str, ...]) -> str:
+    for suffix in suffixes:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM:
+            return word[:-len(suffix)]
+    return word
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """Hafif Türkçe/İngilizce ek atıcı (sözlüksüz, indeks ve sorguda aynı uygulanır)"""
+    stemmed = _strip(word, _CASE_SUFFIXES)
+    stemmed = _strip(stemmed, _PLURAL_SUFFIXES)
+    if stemmed == word:
+        stemmed = _strip(word, _ENGLISH_SUFFIXES)
+    return stemmed.translate(_FOLD)
+
+
+def tokenize(text: str) -> List[str]:
+    """Metni köklenmiş terimlere ayır"""
+    words = _WORD_RE.findall((text or '').translate(_TURKISH_LOWER).lower())
+    return [stem(word) for word in words if len(word) > 1]
+
+
+class BM25Index:
+    """Doküman konumlarıyla (katalog sırası) çalışan BM25 indeksi"""
+
+    def __init__(self, documents: Iterable[str], k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+
+        term_docs: Dict[str, List[int]] = defaultdict(list)
+        term_freqs: Dict[str, List[int]] = defaultdict(list)
+        lengths = []
+        for position, document in enumerate(documents):
+            terms = tokenize(document)
+            lengths.append(len(terms))
+            for term, count in Counter(terms).items():
+                term_docs[term].append(position)
+                term_freqs[term].append(count)
+
+        self.doc_lengths = np.array(lengths, dtype=np.float32)
+        self.size = len(lengths)
+        average = float(self.doc_lengths.mean()) if self.size and self.doc_lengths.any() else 1.0
+        norms = k1 * (1 - b + b * self.doc_lengths / average)
+
+        # Terim -> (doküman konumları, BM25 ağırlıkları)
+        self.postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for term, docs in term_docs.items():
+            ids = np.array(docs, dtype=np.int32)
+            tf = np.array(term_freqs[term], dtype=np.float32)
+            idf = np.log(1 + (self.size - len(ids) + 0.5) / (len(ids) + 0.5))
+            self.postings[term] = (ids, (idf * tf * (k1 + 1) / (tf + norms[ids])).astype(np.float32))
+
+    def __len__(self):
+        return self.size
+
+    def search(self, query: str, limit: int = 10,
+               allowed: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """Sorguya en uygun (konum, skor) çiftleri; allowed verilirse sadece o boolean maskedekiler"""
+        terms = [term for term in dict.fromkeys(tokenize(query)) if term in self.postings]
+        if not terms or limit <= 0:
+            return []
+
+        scores = np.zeros(self.size, dtype=np.float32)
+        for term in terms:
+            ids, weights = self.postings[term]
+            scores[ids] += weights
+        if allowed is not None:
+            scores[~allowed] = 0
+
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > limit:
+            # K. skora eşit olanların hepsi kalır ki eşitlikte katalog sırası korunsun
+            kth = np.partition(scores[candidates], len(candidates) - limit)[len(candidates) - limit]
+            candidates = candidates[scores[candidates] >= kth]
+        ranked = sorted(candidates.tolist(), key=lambda position: (-scores[position], position))[:limit]
+        return [(position, float(scores[position])) for position in ranked]
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+DataImporter toplu yükleme modu için küme tabanlı yazma yardımcıları.
+
+Kayıt başına SELECT + flush yerine mevcut (marka, isim) anahtarları ve nota
+isimleri tek sorguda belleğe alınır, tüm satırlar Python'da hazırlanır ve
+tablolara toplu yazılır:
+
+- PostgreSQL (psycopg2 / psycopg 3): satırlar COPY ile geçici bir staging
+  tablosuna akıtılır, ardından INSERT ... SELECT ... ON CONFLICT DO NOTHING
+  RETURNING ile asıl tabloya geçirilir.
+- Diğer veritabanları: INSERT ... ON CONFLICT DO NOTHING executemany ile
+  (SQLAlchemy insertmanyvalues) gönderilir.
+
+Çakışan satırlar (aynı markada aynı isimli parfüm, aynı isimli nota, aynı
+parfüm-nota çifti) sessizce atlanır.
+"""
+
+import csv
+import io
+from datetime import datetime
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+from sqlalchemy import select
+
+from src.models.database import db, Note, Perfume, PerfumeNote
+from src.utils.similarity_pipeline import dialect_insert
+
+# Perfume tablosuna toplu yazılan kolonlar (tüm satırlarda aynı anahtarlar)
+PERFUME_COLUMNS = (
+    'name', 'brand_id', 'gender', 'price', 'currency', 'product_url', 'image_url',
+    'description', 'stock_status', 'rating', 'created_at', 'updated_at'
+)
+PERFUME_NOTE_COLUMNS = ('perfume_id', 'note_id', 'intensity', 'created_at')
+
+# IN (...) listeleri ve executemany grupları için parça boyutu
+CHUNK_SIZE = 1000
+
+# Bir seferde belleğe alınıp tek transaction'da yazılan kayıt sayısı
+BATCH_SIZE = 5000
+
+
+def chunked(items: Sequence, size: int = CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def existing_perfume_names(brand_id: int) -> Set[str]:
+    """Markadaki mevcut parfüm isimleri (tek sorgu)"""
+    return set(db.session.execute(select(Perfume.name).where(Perfume.brand_id == brand_id)).scalars())
+
+
+def note_ids() -> Dict[str, int]:
+    """Tüm nota isimleri -> id (tek sorgu)"""
+    return {name: note_id for note_id, name in db.session.execute(select(Note.id, Note.name))}
+
+
+def perfume_row(brand_id: int, fields: Dict, now: datetime) -> Dict:
+    """Model varsayılanlarıyla doldurulmuş, PERFUME_COLUMNS anahtarlı satır"""
+    row = {column: fields.get(column) for column in PERFUME_COLUMNS}
+    row.update(brand_id=brand_id, created_at=now, updated_at=now)
+    row['currency'] = row['currency'] or 'TRY'
+    if row['stock_status'] is None:
+        row['stock_status'] = True
+    return row
+
+
+def _copy_cursor():
+    """PostgreSQL COPY destekleyen sürücü imleci (yoksa None)"""
+    connection = db.session.connection()
+    if connection.dialect.name != 'postgresql':
+        return None
+    cursor = connection.connection.dbapi_connection.cursor()
+    if hasattr(cursor, 'copy_expert') or hasattr(cursor, 'copy'):
+        return cursor
+    cursor.close()
+    return None
+
+
+def _copy_to_stage(cursor, stage: str, source: str, columns: Sequence[str], rows: Iterable[Dict]):
+    """Satırları CSV olarak COPY ile geçici staging tablosuna akıt"""
+    column_list = ', '.join(columns)
+    cursor.execute(f"DROP TABLE IF EXISTS {stage}")
+    cursor.execute(f"CREATE TEMP TABLE {stage} AS SELECT {column_list} FROM {source} WITH NO DATA")
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(['\\N' if row[column] is None else row[column] for column in columns])
+
+    sql = f"COPY {stage} ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+    if hasattr(cursor, 'copy_expert'):
+        # psycopg2
+        buffer.seek(0)
+        cursor.copy_expert(sql, buffer)
+    else:
+        # psycopg 3
+        with cursor.copy(sql) as copy:
+            copy.write(buffer.getvalue())
+
+
+def _copy_insert(cursor, stage: str, target: str, columns: Sequence[str], conflict: str,
+                 returning: str = None) -> List[Tuple]:
+    column_list = ', '.join(columns)
+    sql = (f"INSERT INTO {target} ({column_list}) SELECT {column_list} FROM {stage} "
+           f"ON CONFLICT ({conflict}) DO NOTHING")
+    if returning:
+        sql += f" RETURNING {returning}"
+    cursor.execute(sql)
+    rows = cursor.fetchall() if returning else []
+    cursor.execute(f"DROP TABLE {stage}")
+    return rows
+
+
+def write_notes(rows: List[Dict]) -> Dict[str, int]:
+    """Yeni notaları yaz, verilen isimlerin id'lerini döndür"""
+    if not rows:
+        return {}
+    table = Note.__table__
+    stmt = dialect_insert(table)
+    for chunk in chunked(rows):
+        if stmt is None:
+            db.session.execute(table.insert(), chunk)
+        else:
+            db.session.execute(stmt.on_conflict_do_nothing(index_elements=['name']), chunk)
+
+    # Çakışma (başka süreçte eklenmiş nota) durumunda da id'ler gelsin
+    names = [row['name'] for row in rows]
+    ids = {}
+    for chunk in chunked(names):
+        ids.update(db.session.execute(select(Note.name, Note.id).where(Note.name.in_(chunk))).all())
+    return ids
+
+
+def write_perfumes(rows: List[Dict]) -> Dict[str, int]:
+    """Parfümleri yaz; bu çağrıda eklenen parfümlerin isim -> id eşlemesini döndür"""
+    if not rows:
+        return {}
+
+    cursor = _copy_cursor()
+    if cursor is not None:
+        try:
+            _copy_to_stage(cursor, 'stage_perfumes', 'perfumes', PERFUME_COLUMNS, rows)
+            inserted = _copy_insert(cursor, 'stage_perfumes', 'perfumes', PERFUME_COLUMNS,
+                                    'brand_id, name', returning='name, id')
+        finally:
+            cursor.close()
+        return dict(inserted)
+
+    table = Perfume.__table__
+    stmt = dialect_insert(table)
+    ids = {}
+    for chunk in chunked(rows):
+        if stmt is None:
+            db.session.execute(table.insert(), chunk)
+            brand_id = chunk[0]['brand_id']
+            names = [row['name'] for row in chunk]
+            ids.update(db.session.execute(
+                select(Perfume.name, Perfume.id).where(Perfume.brand_id == brand_id, Perfume.name.in_(names))
+            ).all())
+        else:
+            # Sadece gerçekten eklenen satırlar döner
+            result = db.session.execute(
+                stmt.on_conflict_do_nothing(index_elements=['brand_id', 'name']).returning(table.c.name, table.c.id),
+                chunk
+            )
+            ids.update(result.all())
+    return ids
+
+
+def write_perfume_notes(pairs: List[Tuple[int, int]], now: datetime) -> int:
+    """(perfume_id, note_id) çiftlerini yaz"""
+    if not pairs:
+        return 0
+    rows = [
+        {'perfume_id': perfume_id, 'note_id': note_id, 'intensity': 5, 'created_at': now}
+        for perfume_id, note_id in pairs
+    ]
+
+    cursor = _copy_cursor()
+    if cursor is not None:
+        try:
+            _copy_to_stage(cursor, 'stage_perfume_notes', 'perfume_notes', PERFUME_NOTE_COLUMNS, rows)
+            _copy_insert(cursor, 'stage_perfume_notes', 'perfume_notes', PERFUME_NOTE_COLUMNS,
+                         'perfume_id, note_id')
+        finally:
+            cursor.close()
+        return len(rows)
+
+    table = PerfumeNote.__table__
+    stmt = dialect_insert(table)
+    for chunk in chunked(rows):
+        if stmt is None:
+            db.session.execute(table.insert(), chunk)
+        else:
+            db.session.execute(stmt.on_conflict_do_nothing(index_elements=['perfume_id', 'note_id']), chunk)
+    return len(rows)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Katalog listeleme endpoint'leri için süreç genelinde, sürümlü JSON önbelleği.
+
+Marka, aile, nota ve lüks parfüm listeleri sadece veri içe aktarımında
+değişir. Her yanıt ilk istekte JSON baytlarına çevrilip (endpoint, sorgu
+parametreleri) anahtarıyla saklanır. Katalog nesil sayacı (generation)
+DataImporter.import_all_data ve admin içe aktarma endpoint'i tarafından
+artırılır; eski nesle ait kayıtlar bir sonraki istekte yeniden üretilir.
+Başka bir süreçte yapılan içe aktarımlar için kayıtlar ayrıca max_age
+saniye sonra yenilenir. Yanıtlar içerik özetinden türetilen ETag ile
+döner; If-None-Match eşleşirse gövdesiz 304 gönderilir.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Tuple
+
+from flask import Response, jsonify, request
+
+# (nesil, oluşturulma zamanı, gövde, etag)
+CacheEntry = Tuple[int, float, bytes, str]
+
+
+class CatalogCache:
+    """Nesil sayacıyla geçersiz kılınan, önceden serileştirilmiş JSON önbelleği"""
+
+    def __init__(self, max_age: float = 300, max_entries: int = 256):
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.generation = 0
+        self._entries: 'OrderedDict[Hashable, CacheEntry]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def bump(self) -> int:
+        """Katalog değişti: nesli artır, tüm kayıtları geçersiz kıl"""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            return self.generation
+
+    def _lookup(self, key: Hashable):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        generation, created_at, _, _ = entry
+        if generation != self.generation or time.monotonic() - created_at > self.max_age:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def get_or_build(self, key: Hashable, builder: Callable[[], object]) -> Tuple[bytes, str]:
+        """Kayıt güncelse döndür, değilse builder() sonucunu serileştirip sakla"""
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                self.hits += 1
+                return entry[2], entry[3]
+            self.misses += 1
+            generation = self.generation
+
+        body = jsonify(builder()).get_data()
+        etag = hashlib.sha1(body).hexdigest()
+
+        with self._lock:
+            # Oluşturma sırasında nesil değiştiyse eski veriyi saklama
+            if generation == self.generation:
+                self._entries[key] = (generation, time.monotonic(), body, etag)
+                if len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return body, etag
+
+    def respond(self, name: str, builder: Callable[[], object]) -> Response:
+        """Endpoint yanıtı: sorgu parametreleri anahtara dahil, ETag / 304 destekli"""
+        key = (name, tuple(sorted(request.args.items(multi=True))))
+        body, etag = self.get_or_build(key, builder)
+
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        response.make_conditional(request)
+        if response.status_code == 304:
+            with self._lock:
+                self.not_modified += 1
+        return response
+
+    def stats(self) -> Dict:
+        """Önbellek istatistikleri"""
+        with self._lock:
+            requests_total = self.hits + self.misses
+            return {
+                'generation': self.generation,
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'not_modified': self.not_modified,
+                'hit_rate': round(self.hits / requests_total, 4) if requests_total else 0.0,
+                'bytes': sum(len(entry[2]) for entry in self._entries.values())
+            }
+
+
+catalog_cache = CatalogCache()
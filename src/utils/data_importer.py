@@ -1,35 +1,69 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import json
 import re
 import logging
+from datetime import datetime
 from decimal import Decimal
-from typing import Dict, List, Optional, Tuple
+from itertools import chain, islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from src.models.database import (
-    db, Brand, Perfume, PerfumeFamily, Note, PerfumeNote, PerfumeSimilarity,
-    calculate_similarity_score
+    db, Brand, Perfume, PerfumeFamily, Note, PerfumeNote, note_name_cache
 )
+from src.utils import bulk_loader
+from src.utils.catalog_cache import catalog_cache
+from src.utils.import_pipeline import ImportPipeline
+from src.utils.json_stream import iter_json_records
+from src.utils.note_normalizer import importer_classifier
+from src.utils.similarity_pipeline import SimilarityPipeline
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Toplu modda bir seferde belleğe alınıp yazılan kayıt sayısı
+BULK_BATCH_SIZE = bulk_loader.BATCH_SIZE
+
 class DataImporter:
-    def __init__(self):
+    def __init__(self, bulk: bool = False):
+        # bulk=True: kayıt başına sorgu yerine önyüklenmiş anahtarlar ve toplu yazma (COPY / executemany)
+        self.bulk = bulk
         self.note_cache = {}
         self.brand_cache = {}
         self.family_cache = {}
         self.perfume_note_cache = set()  # Parfüm-nota kombinasyonlarını takip et
         
+    def __getstate__(self):
+        """Ayrıştırma süreçlerine (ImportPipeline) sadece ayar taşınır; ORM önbellekleri ana sürece aittir"""
+        return {'bulk': self.bulk}
+    
+    def __setstate__(self, state):
+        self.__init__(**state)
+    
+    def iter_json_file(self, file_path: str) -> Iterator[Dict]:
+        """JSON dizisi / NDJSON dosyasındaki kayıtları tek geçişte akışlı olarak üret
+        
+        Okunamayan dosyada OSError, bozuk içerikte (hata anına kadarki kayıtlar
+        üretildikten sonra) ValueError fırlatılır; içe aktarma o dosyanın
+        transaction'ını geri alır.
+        """
+        return iter_json_records(file_path)
+    
     def load_json_file(self, file_path: str) -> List[Dict]:
         """JSON dosyasını yükle"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
+            return list(self.iter_json_file(file_path))
+        except (OSError, ValueError) as e:
             logger.error(f"JSON dosyası yüklenemedi {file_path}: {e}")
             return []
     
+    def rollback_file(self):
+        """Yarım kalan dosyanın transaction'ını geri al; geri alınan satırları tutan önbellekler temizlenir"""
+        db.session.rollback()
+        self.brand_cache.clear()
+        self.note_cache.clear()
+        self.perfume_note_cache.clear()
+        note_name_cache.invalidate()
+    
     def get_or_create_brand(self, brand_name: str, brand_type: str = 'alternative') -> Brand:
         """Marka al veya oluştur"""
         if brand_name in self.brand_cache:
@@ -90,6 +124,8 @@ class DataImporter:
             try:
                 db.session.add(note)
                 db.session.flush()
+                # Nota arama önbelleği yeni notayı görsün
+                note_name_cache.invalidate()
             except Exception as e:
                 # Unique constraint hatası durumunda tekrar sorgula
                 db.session.rollback()
@@ -103,28 +139,7 @@ class DataImporter:
     
     def determine_note_category(self, note_name: str) -> str:
         """Nota kategorisini belirle"""
-        note_name_lower = note_name.lower()
-        
-        # Kategori eşleştirmeleri
-        categories = {
-            'citrus': ['bergamot', 'limon', 'portakal', 'greyfurt', 'mandalina', 'lime'],
-            'floral': ['gül', 'yasemin', 'lavanta', 'süsen', 'portakal çiçeği', 'neroli', 'gardenya', 'orkide'],
-            'fruity': ['elma', 'şeftali', 'armut', 'ananas', 'mango', 'çilek', 'ahududu'],
-            'spicy': ['biber', 'tarçın', 'karanfil', 'zencefil', 'kakule', 'safran'],
-            'woody': ['sedir', 'sandal ağacı', 'vetiver', 'paçuli', 'oud'],
-            'sweet': ['vanilya', 'karamel', 'bal', 'şeker'],
-            'gourmand': ['kahve', 'çikolata', 'badem'],
-            'amber': ['amber', 'kehribar'],
-            'musk': ['misk'],
-            'leather': ['deri'],
-            'tobacco': ['tütün']
-        }
-        
-        for category, keywords in categories.items():
-            if any(keyword in note_name_lower for keyword in keywords):
-                return category
-        
-        return 'other'
+        return importer_classifier.classify(note_name)
     
     def parse_price(self, price_str: str) -> Tuple[Optional[Decimal], str]:
         """Fiyat string'ini parse et"""
@@ -296,126 +311,107 @@ class DataImporter:
             db.session.rollback()
             return False
     
-    def import_bargello_data(self, file_path: str = 'bargello_parfumler.json'):
-        """Bargello verilerini içe aktar"""
-        logger.info("Bargello verileri içe aktarılıyor...")
-        
-        data = self.load_json_file(file_path)
-        if not data:
-            return
-        
-        brand = self.get_or_create_brand('Bargello', 'alternative')
-        imported_count = 0
-        
-        for item in data:
+    def bargello_record(self, item: Dict) -> Tuple[Dict, List[Tuple[str, str]]]:
+        """Bargello kaydından parfüm alanları ve notalar"""
+        # Fiyat parse et
+        price = None
+        if 'fiyat' in item:
+            price, currency = self.parse_price(item['fiyat'])
+        
+        fields = {
+            'name': item['isim'],
+            'gender': self.determine_gender(item),
+            'price': price,
+            'product_url': item.get('link'),
+            'stock_status': item.get('stok_durumu') == 'Stokta var',
+            'description': item.get('aciklama', '')
+        }
+        notes = self.parse_notes_from_bargello(item['notalar']) if 'notalar' in item else []
+        return fields, notes
+    
+    def muscent_record(self, item: Dict) -> Tuple[Dict, List[Tuple[str, str]]]:
+        """Muscent kaydından parfüm alanları ve notalar"""
+        # Fiyat parse et
+        price = None
+        if 'fiyat' in item:
+            price, currency = self.parse_price(item['fiyat'])
+        
+        # Rating parse et
+        rating = None
+        if 'puan' in item and item['puan']:
             try:
-                # Parfümün zaten var olup olmadığını kontrol et
-                existing = Perfume.query.filter_by(
-                    name=item['isim'],
-                    brand_id=brand.id
-                ).first()
-                
-                if existing:
-                    continue
-                
-                # Fiyat parse et
-                price = None
-                if 'fiyat' in item:
-                    price, currency = self.parse_price(item['fiyat'])
-                
-                # Cinsiyet belirle
-                gender = self.determine_gender(item)
-                
-                # Parfüm oluştur
-                perfume = Perfume(
-                    name=item['isim'],
-                    brand_id=brand.id,
-                    gender=gender,
-                    price=price,
-                    product_url=item.get('link'),
-                    stock_status=item.get('stok_durumu') == 'Stokta var',
-                    description=item.get('aciklama', '')
-                )
-                
-                db.session.add(perfume)
-                db.session.flush()
-                
-                # Notaları ekle
-                if 'notalar' in item:
-                    notes = self.parse_notes_from_bargello(item['notalar'])
-                    for note_name, note_type in notes:
-                        note = self.get_or_create_note(note_name, note_type)
-                        self.add_perfume_note_safely(perfume.id, note.id)
-                
-                imported_count += 1
-                
-                if imported_count % 100 == 0:
-                    db.session.commit()
-                    logger.info(f"Bargello: {imported_count} parfüm içe aktarıldı")
-                    
-            except Exception as e:
-                logger.error(f"Bargello parfüm içe aktarma hatası: {e}")
-                db.session.rollback()
-                continue
-        
-        db.session.commit()
-        logger.info(f"Bargello içe aktarma tamamlandı: {imported_count} parfüm")
+                rating = Decimal(str(item['puan']))
+            except:
+                pass
+        
+        fields = {
+            'name': item['isim'],
+            'gender': self.determine_gender(item),
+            'price': price,
+            'product_url': item.get('link'),
+            'stock_status': item.get('stok_durumu', True),
+            'rating': rating,
+            'description': item.get('aciklama', '')
+        }
+        return fields, self.parse_notes_from_muscent(item)
     
-    def import_muscent_data(self, file_path: str = 'muscent_parfumler.json'):
-        """Muscent verilerini içe aktar"""
-        logger.info("Muscent verileri içe aktarılıyor...")
+    def zara_record(self, item: Dict) -> Tuple[Dict, List[Tuple[str, str]]]:
+        """Zara kaydından parfüm alanları ve notalar"""
+        # Fiyat parse et
+        price = None
+        if 'price' in item:
+            price, currency = self.parse_price(item['price'])
+        
+        # Cinsiyet belirle (Zara için çoğunlukla unisex)
+        gender = 'unisex'
+        name_lower = item['name'].lower()
+        if 'men' in name_lower or 'erkek' in name_lower:
+            gender = 'men'
+        elif 'women' in name_lower or 'kadın' in name_lower:
+            gender = 'women'
+        
+        fields = {
+            'name': item['name'],
+            'gender': gender,
+            'price': price,
+            'product_url': item.get('product_url'),
+            'image_url': item.get('image_url'),
+            'description': item.get('description', ''),
+            'stock_status': True
+        }
+        return fields, self.parse_notes_from_zara(item)
+    
+    def import_items(self, source: str, brand: Brand, data: Iterable[Dict],
+                     build_record: Callable[[Dict], Tuple[Dict, List[Tuple[str, str]]]]) -> int:
+        """Kayıtları markaya içe aktar (var olan parfümler atlanır), eklenen sayıyı döndür
         
-        data = self.load_json_file(file_path)
-        if not data:
-            return
+        Tüm kayıtlar tek transaction'da yazılır ve sonda commit edilir; data
+        üretilirken (ör. bozuk dosya) ya da yazarken hata olursa hiçbiri
+        kalmaz. Dönüştürülemeyen tek tek kayıtlar loglanıp atlanır.
+        """
+        if self.bulk:
+            return self.bulk_import_items(source, brand, data, build_record)
         
-        brand = self.get_or_create_brand('Muscent', 'alternative')
         imported_count = 0
         
-        for item in data:
-            try:
+        try:
+            for fields, notes in self.build_records(source, data, build_record):
                 # Parfümün zaten var olup olmadığını kontrol et
                 existing = Perfume.query.filter_by(
-                    name=item['isim'],
+                    name=fields['name'],
                     brand_id=brand.id
                 ).first()
                 
                 if existing:
                     continue
                 
-                # Fiyat parse et
-                price = None
-                if 'fiyat' in item:
-                    price, currency = self.parse_price(item['fiyat'])
-                
-                # Cinsiyet belirle
-                gender = self.determine_gender(item)
-                
-                # Rating parse et
-                rating = None
-                if 'puan' in item and item['puan']:
-                    try:
-                        rating = Decimal(str(item['puan']))
-                    except:
-                        pass
-                
                 # Parfüm oluştur
-                perfume = Perfume(
-                    name=item['isim'],
-                    brand_id=brand.id,
-                    gender=gender,
-                    price=price,
-                    product_url=item.get('link'),
-                    stock_status=item.get('stok_durumu', True),
-                    rating=rating,
-                    description=item.get('aciklama', '')
-                )
+                perfume = Perfume(brand_id=brand.id, **fields)
                 
                 db.session.add(perfume)
                 db.session.flush()
                 
                 # Notaları ekle
-                notes = self.parse_notes_from_muscent(item)
                 for note_name, note_type in notes:
                     note = self.get_or_create_note(note_name, note_type)
                     self.add_perfume_note_safely(perfume.id, note.id)
@@ -423,155 +419,202 @@ class DataImporter:
                 imported_count += 1
                 
                 if imported_count % 100 == 0:
-                    db.session.commit()
-                    logger.info(f"Muscent: {imported_count} parfüm içe aktarıldı")
-                    
-            except Exception as e:
-                logger.error(f"Muscent parfüm içe aktarma hatası: {e}")
-                db.session.rollback()
-                continue
+                    logger.info(f"{source}: {imported_count} parfüm içe aktarıldı")
+            
+            db.session.commit()
+        except Exception as e:
+            logger.error(f"{source} içe aktarma geri alındı: {e}")
+            self.rollback_file()
+            raise
         
-        db.session.commit()
-        logger.info(f"Muscent içe aktarma tamamlandı: {imported_count} parfüm")
+        logger.info(f"{source} içe aktarma tamamlandı: {imported_count} parfüm")
+        return imported_count
     
-    def import_zara_data(self, file_path: str = 'zara_perfumes_20250610_005616.json'):
-        """Zara verilerini içe aktar"""
-        logger.info("Zara verileri içe aktarılıyor...")
+    def bulk_import_items(self, source: str, brand: Brand, data: Iterable[Dict],
+                          build_record: Callable[[Dict], Tuple[Dict, List[Tuple[str, str]]]],
+                          batch_size: int = BULK_BATCH_SIZE) -> int:
+        """Toplu mod: mevcut anahtarlar tek sorguda okunur, kayıtlar batch_size'lık gruplar halinde yazılır
+        
+        data bir üreteç olabilir; bellekte en fazla bir grubun satırları tutulur.
+        Gruplar tek transaction'da yazılır ve sonda commit edilir; data
+        üretilirken ya da yazarken hata olursa hiçbiri kalmaz.
+        """
+        existing_names = bulk_loader.existing_perfume_names(brand.id)
+        note_ids = bulk_loader.note_ids()
+        imported_count = 0
         
-        data = self.load_json_file(file_path)
-        if not data:
-            return
+        records = iter(data)
+        try:
+            while True:
+                batch = list(islice(records, batch_size))
+                if not batch:
+                    break
+                imported_count += self.bulk_write_records(
+                    source, brand, self.build_records(source, batch, build_record), existing_names, note_ids
+                )
+            db.session.commit()
+        except Exception as e:
+            logger.error(f"{source} toplu içe aktarma geri alındı: {e}")
+            self.rollback_file()
+            raise
         
-        brand = self.get_or_create_brand('Zara', 'alternative')
-        imported_count = 0
+        # Satır modundaki önbellekler artık eski
+        self.note_cache.clear()
+        self.perfume_note_cache.clear()
         
-        for item in data:
+        logger.info(f"{source} toplu içe aktarma tamamlandı: {imported_count} parfüm")
+        return imported_count
+    
+    def build_records(self, source: str, items: Iterable[Dict],
+                      build_record: Callable[[Dict], Tuple[Dict, List[Tuple[str, str]]]]
+                      ) -> Iterator[Tuple[Dict, List[Tuple[str, str]]]]:
+        """Ham kayıtlardan (alanlar, notalar) üret; hatalı kayıtlar loglanıp atlanır (veritabanına dokunmaz)"""
+        for item in items:
             try:
-                # Parfümün zaten var olup olmadığını kontrol et
-                existing = Perfume.query.filter_by(
-                    name=item['name'],
-                    brand_id=brand.id
-                ).first()
-                
-                if existing:
-                    continue
-                
-                # Fiyat parse et
-                price = None
-                if 'price' in item:
-                    price, currency = self.parse_price(item['price'])
-                
-                # Cinsiyet belirle (Zara için çoğunlukla unisex)
-                gender = 'unisex'
-                name_lower = item['name'].lower()
-                if 'men' in name_lower or 'erkek' in name_lower:
-                    gender = 'men'
-                elif 'women' in name_lower or 'kadın' in name_lower:
-                    gender = 'women'
-                
-                # Parfüm oluştur
-                perfume = Perfume(
-                    name=item['name'],
-                    brand_id=brand.id,
-                    gender=gender,
-                    price=price,
-                    product_url=item.get('product_url'),
-                    image_url=item.get('image_url'),
-                    description=item.get('description', ''),
-                    stock_status=True
-                )
-                
-                db.session.add(perfume)
-                db.session.flush()
-                
-                # Notaları ekle
-                notes = self.parse_notes_from_zara(item)
-                for note_name, note_type in notes:
-                    note = self.get_or_create_note(note_name, note_type)
-                    self.add_perfume_note_safely(perfume.id, note.id)
-                
-                imported_count += 1
-                
-                if imported_count % 100 == 0:
-                    db.session.commit()
-                    logger.info(f"Zara: {imported_count} parfüm içe aktarıldı")
-                    
+                yield build_record(item)
             except Exception as e:
-                logger.error(f"Zara parfüm içe aktarma hatası: {e}")
-                db.session.rollback()
+                logger.error(f"{source} parfüm içe aktarma hatası: {e}")
+    
+    def bulk_write_records(self, source: str, brand: Brand, records: Iterable[Tuple[Dict, List[Tuple[str, str]]]],
+                           existing_names: set, note_ids: Dict[str, int]) -> int:
+        """Bir grup (alanlar, notalar) kaydını yaz (commit çağırana aittir); existing_names ve note_ids yerinde güncellenir"""
+        now = datetime.utcnow()
+        perfume_rows = []
+        perfume_notes = {}
+        new_notes = {}
+        
+        for fields, notes in records:
+            # Var olan ve dosyada tekrar eden parfümler atlanır
+            name = fields['name']
+            if name in existing_names:
                 continue
+            existing_names.add(name)
+            
+            perfume_rows.append(bulk_loader.perfume_row(brand.id, fields, now))
+            perfume_notes[name] = [note_name for note_name, _ in notes]
+            for note_name, note_type in notes:
+                # Nota tipi ilk geçtiği yerden alınır
+                if note_name not in note_ids and note_name not in new_notes:
+                    new_notes[note_name] = {
+                        'name': note_name,
+                        'type': note_type,
+                        'category': self.determine_note_category(note_name),
+                        'created_at': now
+                    }
         
-        db.session.commit()
-        logger.info(f"Zara içe aktarma tamamlandı: {imported_count} parfüm")
-    
-    def calculate_all_similarities(self):
-        """Tüm parfümler için benzerlik skorlarını hesapla"""
-        logger.info("Benzerlik skorları hesaplanıyor...")
+        try:
+            if new_notes:
+                note_ids.update(bulk_loader.write_notes(list(new_notes.values())))
+                # Nota arama önbelleği yeni notaları görsün
+                note_name_cache.invalidate()
+            
+            perfume_ids = bulk_loader.write_perfumes(perfume_rows)
+            pairs = sorted({
+                (perfume_ids[name], note_ids[note_name])
+                for name, note_names in perfume_notes.items() if name in perfume_ids
+                for note_name in note_names if note_name in note_ids
+            })
+            bulk_loader.write_perfume_notes(pairs, now)
+        except Exception as e:
+            logger.error(f"{source} toplu içe aktarma hatası: {e}")
+            raise
         
-        # Lüks markaları al
-        luxury_brands = Brand.query.filter_by(type='luxury').all()
-        luxury_brand_ids = [b.id for b in luxury_brands]
+        logger.info(f"{source}: {len(perfume_ids)} parfüm, {len(new_notes)} yeni nota, "
+                    f"{len(pairs)} parfüm-nota ilişkisi yazıldı")
+        return len(perfume_ids)
+    
+    def import_file(self, source: str, file_path: str,
+                    build_record: Callable[[Dict], Tuple[Dict, List[Tuple[str, str]]]]):
+        """Dosyayı tek geçişte akışlı olarak okuyup markasına içe aktar
+        
+        Kayıtlar ayrıştırıldıkça yazılır; kayıt yoksa marka oluşturulmaz.
+        Okunamayan ya da bozuk dosyada (hata dosyanın sonunda olsa bile) o
+        dosyanın transaction'ı geri alınır ve hiçbir şey içe aktarılmaz.
+        """
+        records = self.iter_json_file(file_path)
+        try:
+            first = next(records, None)
+            if first is None:
+                return
+            
+            brand = self.get_or_create_brand(source, 'alternative')
+            return self.import_items(source, brand, chain([first], records), build_record)
+        except (OSError, ValueError) as e:
+            logger.error(f"JSON dosyası yüklenemedi {file_path}: {e}")
+            return None
+    
+    def import_bargello_data(self, file_path: str = 'bargello_parfumler.json'):
+        """Bargello verilerini içe aktar"""
+        logger.info("Bargello verileri içe aktarılıyor...")
         
-        # Alternatif markaları al
-        alternative_brands = Brand.query.filter_by(type='alternative').all()
-        alternative_brand_ids = [b.id for b in alternative_brands]
+        return self.import_file('Bargello', file_path, self.bargello_record)
+    
+    def import_muscent_data(self, file_path: str = 'muscent_parfumler.json'):
+        """Muscent verilerini içe aktar"""
+        logger.info("Muscent verileri içe aktarılıyor...")
         
-        # Lüks parfümleri al
-        luxury_perfumes = Perfume.query.filter(Perfume.brand_id.in_(luxury_brand_ids)).all()
+        return self.import_file('Muscent', file_path, self.muscent_record)
+    
+    def import_zara_data(self, file_path: str = 'zara_perfumes_20250610_005616.json'):
+        """Zara verilerini içe aktar"""
+        logger.info("Zara verileri içe aktarılıyor...")
         
-        # Alternatif parfümleri al
-        alternative_perfumes = Perfume.query.filter(Perfume.brand_id.in_(alternative_brand_ids)).all()
+        return self.import_file('Zara', file_path, self.zara_record)
+    
+    def calculate_all_similarities(self, full_rebuild: bool = False, workers: int = 1) -> Dict:
+        """Tüm parfümler için benzerlik skorlarını hesapla
+        
+        Parfümler notalarıyla tek sorguda yüklenir, skorlar bloklar halinde
+        vektörel hesaplanır ve toplu upsert ile yazılır. Varsayılan olarak
+        sadece son hesaplamadan beri değişen parfümler yeniden hesaplanır;
+        full_rebuild=True tüm tabloyu baştan oluşturur. workers > 1 skorlamayı
+        süreç havuzuna dağıtır; yazma tek süreçte toplu yapılır.
+        """
+        logger.info("Benzerlik skorları hesaplanıyor...")
         
-        similarity_count = 0
+        pipeline = SimilarityPipeline(workers=workers)
+        stats = pipeline.run_full() if full_rebuild else pipeline.run_incremental()
         
-        for luxury_perfume in luxury_perfumes:
-            for alternative_perfume in alternative_perfumes:
-                # Zaten var olan benzerlik kaydını kontrol et
-                existing = PerfumeSimilarity.query.filter_by(
-                    luxury_perfume_id=luxury_perfume.id,
-                    alternative_perfume_id=alternative_perfume.id
-                ).first()
-                
-                if existing:
-                    continue
-                
-                # Benzerlik skorunu hesapla
-                score = calculate_similarity_score(luxury_perfume, alternative_perfume)
-                
-                # Sadece yeterince benzer olanları kaydet (>= 30 puan)
-                if score >= 30:
-                    # Fiyat farkını hesapla
-                    price_diff = None
-                    if luxury_perfume.price and alternative_perfume.price:
-                        price_diff = luxury_perfume.price - alternative_perfume.price
-                    
-                    similarity = PerfumeSimilarity(
-                        luxury_perfume_id=luxury_perfume.id,
-                        alternative_perfume_id=alternative_perfume.id,
-                        similarity_score=Decimal(str(score)),
-                        gender_match=(luxury_perfume.gender == alternative_perfume.gender),
-                        price_difference=price_diff
-                    )
-                    
-                    db.session.add(similarity)
-                    similarity_count += 1
-                    
-                    if similarity_count % 100 == 0:
-                        db.session.commit()
-                        logger.info(f"{similarity_count} benzerlik kaydı oluşturuldu")
-        
-        db.session.commit()
-        logger.info(f"Benzerlik hesaplama tamamlandı: {similarity_count} kayıt")
+        logger.info(
+            f"Benzerlik hesaplama tamamlandı: {stats['pairs_recomputed']} çift yeniden hesaplandı, "
+            f"{stats['pairs_skipped']} çift atlandı, {stats['rows_written']} kayıt yazıldı"
+        )
+        return stats
     
-    def import_all_data(self):
-        """Tüm verileri içe aktar"""
+    def sources(self) -> List[Tuple[str, str, Callable[[Dict], Tuple[Dict, List[Tuple[str, str]]]]]]:
+        """Varsayılan kaynaklar: (marka, dosya, kayıt dönüştürücü), içe aktarma sırasıyla"""
+        return [
+            ('Bargello', 'bargello_parfumler.json', self.bargello_record),
+            ('Muscent', 'muscent_parfumler.json', self.muscent_record),
+            ('Zara', 'zara_perfumes_20250610_005616.json', self.zara_record)
+        ]
+    
+    def import_parallel(self, workers: Optional[int] = None, **options) -> Dict:
+        """Kaynakları ayrı süreçlerde eşzamanlı ayrıştırıp tek yazıcıyla toplu yaz, hat istatistiklerini döndür"""
+        pipeline = ImportPipeline(self, workers=workers, **options)
+        stats = pipeline.run(self.sources())
+        
+        # Satır modundaki önbellekler artık eski
+        self.note_cache.clear()
+        self.perfume_note_cache.clear()
+        return stats
+    
+    def import_all_data(self, parallel: bool = False):
+        """Tüm verileri içe aktar
+        
+        parallel=True: kaynaklar ImportPipeline ile ayrı süreçlerde eşzamanlı
+        ayrıştırılır, yazma tek yazıcıda toplu yapılır (bulk ayarından bağımsız).
+        """
         logger.info("Tüm veriler içe aktarılıyor...")
         
         try:
             # JSON dosyalarını içe aktar
-            self.import_bargello_data()
-            self.import_muscent_data()
-            self.import_zara_data()
+            if parallel:
+                self.import_parallel()
+            else:
+                self.import_bargello_data()
+                self.import_muscent_data()
+                self.import_zara_data()
             
             # Benzerlik skorlarını hesapla
             self.calculate_all_similarities()
@@ -582,6 +625,10 @@ class DataImporter:
             logger.error(f"Veri içe aktarma hatası: {e}")
             db.session.rollback()
             raise
+        
+        finally:
+            # Katalog listeleme önbelleğini geçersiz kıl
+            catalog_cache.bump()
 
 def run_import():
     """Veri içe aktarma işlemini çalıştır"""
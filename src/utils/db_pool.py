@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+server.py için üretim veritabanı katmanı: havuz ayarları, ifade zaman aşımı,
+GET istekleri için salt okunur transaction'lar ve bağlantı bekleme ölçümleri.
+
+Ayarlar ortam değişkenlerinden okunur (varsayılanlar parantez içinde):
+
+    DB_POOL_SIZE (10)            havuzda açık tutulan bağlantı sayısı
+    DB_MAX_OVERFLOW (20)         havuz dolunca açılabilecek ek bağlantı
+    DB_POOL_TIMEOUT (10)         boş bağlantı için en fazla bekleme (sn)
+    DB_POOL_RECYCLE (1800)       bu yaştan eski bağlantılar yenilenir (sn)
+    DB_POOL_PRE_PING (true)      bağlantı verilmeden önce canlılık kontrolü
+    DB_STATEMENT_TIMEOUT_MS (15000)  PostgreSQL statement_timeout, 0 = kapalı
+    DB_READ_ONLY_GET (true)      GET/HEAD isteklerinde SET TRANSACTION READ ONLY
+
+Havuz ayarları bellek içi SQLite'ta (testler) uygulanmaz; Flask-SQLAlchemy
+orada tek bağlantılı StaticPool kullanır.
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Mapping, Optional
+
+from flask import has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+READ_ONLY_METHODS = ('GET', 'HEAD')
+
+# Bekleme histogramı üst sınırları (ms)
+WAIT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+def _env_int(env: Mapping[str, str], name: str, default: int) -> int:
+    value = env.get(name)
+    return int(value) if value not in (None, '') else default
+
+
+def _env_bool(env: Mapping[str, str], name: str, default: bool) -> bool:
+    value = env.get(name)
+    if value in (None, ''):
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+class CheckoutMetrics:
+    """Havuzdan bağlantı alırken beklenen süre (yeni bağlantı açma dahil)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.total_wait = 0.0
+            self.max_wait = 0.0
+            self.buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+    def observe(self, seconds: float):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+            self.buckets[bisect_left(WAIT_BUCKETS_MS, seconds * 1000)] += 1
+
+    def timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            labels = [f'<={limit}ms' for limit in WAIT_BUCKETS_MS] + [f'>{WAIT_BUCKETS_MS[-1]}ms']
+            return {
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'avg_wait_ms': round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                'max_wait_ms': round(self.max_wait * 1000, 3),
+                'histogram': dict(zip(labels, self.buckets))
+            }
+
+
+checkout_metrics = CheckoutMetrics()
+
+
+class TimedQueuePool(QueuePool):
+    """Bağlantı alma süresini checkout_metrics'e yazan QueuePool"""
+
+    metrics = checkout_metrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.timeout()
+            raise
+        self.metrics.observe(time.perf_counter() - start)
+        return connection
+
+
+def is_memory_sqlite(database_url: str) -> bool:
+    """Bellek içi SQLite mi (testler; tek bağlantı tüm thread'lerce paylaşılır)"""
+    url = make_url(database_url)
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+
+def engine_options(database_url: str, env: Optional[Mapping[str, str]] = None) -> Dict:
+    """SQLALCHEMY_ENGINE_OPTIONS: havuz boyutu, taşma, yenileme, pre-ping ve zaman aşımı"""
+    env = os.environ if env is None else env
+    url = make_url(database_url)
+
+    # Bellek içi SQLite tek bağlantıyla çalışır, havuz ayarları anlamsız
+    if is_memory_sqlite(database_url):
+        return {}
+
+    options: Dict = {
+        'poolclass': TimedQueuePool,
+        'pool_pre_ping': _env_bool(env, 'DB_POOL_PRE_PING', True),
+        'pool_size': _env_int(env, 'DB_POOL_SIZE', 10),
+        'max_overflow': _env_int(env, 'DB_MAX_OVERFLOW', 20),
+        'pool_timeout': _env_int(env, 'DB_POOL_TIMEOUT', 10),
+        'pool_recycle': _env_int(env, 'DB_POOL_RECYCLE', 1800)
+    }
+
+    statement_timeout = _env_int(env, 'DB_STATEMENT_TIMEOUT_MS', 15000)
+    if url.get_backend_name() == 'postgresql' and statement_timeout > 0:
+        # Her bağlantıda geçerli; uzun süren sorgular worker'ı kilitlemesin
+        options['connect_args'] = {'options': f'-c statement_timeout={statement_timeout}'}
+    return options
+
+
+def _begin_read_only(session, transaction, connection):
+    """GET isteklerinde transaction'ı salt okunur başlat (sadece PostgreSQL)"""
+    if (
+        has_request_context()
+        and request.method in READ_ONLY_METHODS
+        and connection.dialect.name == 'postgresql'
+        and transaction.parent is None
+    ):
+        connection.exec_driver_sql('SET TRANSACTION READ ONLY')
+
+
+def configure_database(app, db, env: Optional[Mapping[str, str]] = None):
+    """init_db()'den önce çağrılır: motor seçeneklerini ve oturum olaylarını ayarla"""
+    env = os.environ if env is None else env
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {})
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'].update(
+        engine_options(app.config['SQLALCHEMY_DATABASE_URI'], env)
+    )
+
+    if _env_bool(env, 'DB_READ_ONLY_GET', True) and not event.contains(db.session, 'after_begin', _begin_read_only):
+        event.listen(db.session, 'after_begin', _begin_read_only)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Sağlık kontrolü yardımcıları: önbellekli tablo istatistikleri ve bağlantı havuzu durumu.
+
+Orkestratör /api/health uçlarını birkaç saniyede bir yokladığı için tablo
+sayıları her istekte COUNT(*) ile hesaplanmaz. PostgreSQL'de planlayıcının
+pg_class.reltuples tahminleri (ANALYZE / autovacuum ile güncellenir) tek bir
+katalog sorgusuyla okunur; hiç analiz edilmemiş tablolar ve diğer
+veritabanları için COUNT(*) kullanılır. Sonuç max_age saniye saklanır.
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import text
+
+from src.models.database import db
+
+
+class TableStatsSnapshot:
+    """Tablo satır sayılarının periyodik yenilenen görüntüsü"""
+
+    def __init__(self, tables: Dict[str, str], max_age: float = 60):
+        # Yanıttaki anahtar -> tablo adı
+        self.tables = tables
+        self.max_age = max_age
+        self._counts: Optional[Dict[str, int]] = None
+        self._source = None
+        self._refreshed_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> Dict:
+        """Güncel görüntü; süresi dolmuşsa yeniden hesaplanır"""
+        with self._lock:
+            if self._counts is None or time.monotonic() - self._refreshed_at >= self.max_age:
+                self._counts, self._source = self._compute()
+                self._refreshed_at = time.monotonic()
+            return {
+                'counts': dict(self._counts),
+                'source': self._source,
+                'age_seconds': round(time.monotonic() - self._refreshed_at, 1)
+            }
+
+    def invalidate(self):
+        with self._lock:
+            self._counts = None
+
+    def _compute(self):
+        estimates = {}
+        source = 'count'
+        if db.session.get_bind().dialect.name == 'postgresql':
+            rows = db.session.execute(
+                text("SELECT relname, reltuples FROM pg_class "
+                     "WHERE relkind = 'r' AND relname = ANY(:names) "
+                     "AND pg_table_is_visible(oid)"),
+                {'names': list(self.tables.values())}
+            ).all()
+            # reltuples < 0: tablo henüz analiz edilmemiş
+            estimates = {name: int(reltuples) for name, reltuples in rows if reltuples >= 0}
+            source = 'estimate'
+
+        counts = {}
+        for key, table in self.tables.items():
+            if table in estimates:
+                counts[key] = estimates[table]
+            else:
+                counts[key] = db.session.execute(text(f'SELECT COUNT(*) FROM {table}')).scalar()
+        return counts, source
+
+
+def pool_status(engine) -> Dict:
+    """Bağlantı havuzu doluluğu (QueuePool dışındaki havuzlarda sadece sınıf adı)"""
+    pool = engine.pool
+    status = {'class': type(pool).__name__}
+    if not all(hasattr(pool, attr) for attr in ('size', 'checkedout', 'overflow', 'checkedin')):
+        return status
+
+    size = pool.size()
+    max_overflow = getattr(pool, '_max_overflow', 0)
+    checked_out = pool.checkedout()
+    capacity = size + max(max_overflow, 0)
+    status.update({
+        'size': size,
+        'max_overflow': max_overflow,
+        'checked_out': checked_out,
+        'checked_in': pool.checkedin(),
+        'overflow': pool.overflow(),
+        # max_overflow < 0 sınırsız taşma demek
+        'saturation': round(checked_out / capacity, 4) if capacity and max_overflow >= 0 else None
+    })
+    # TimedQueuePool: bağlantı alma bekleme süreleri
+    metrics = getattr(pool, 'metrics', None)
+    if metrics is not None:
+        status['checkout_wait'] = metrics.stats()
+    return status
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+DataImporter için çok kaynaklı, hatlı (pipelined) içe aktarma.
+
+Her kaynak (Bargello, Muscent, Zara) kendi ayrıştırma sürecinde işlenir: dosya
+json_stream ile akışlı okunur, fiyat, cinsiyet ve nota ayrıştırması
+(build_record) yapılır ve kayıtlar chunk_size'lık parçalar halinde kaynağa ait
+sınırlı bir multiprocessing kuyruğuna bırakılır. Kuyruk doluysa ayrıştırıcı
+bekler (backpressure); bellekte kaynak başına en fazla queue_size parça
+tutulur. Ayrıştırma CPU'ya bağlı saf Python işidir; thread'ler GIL'i
+paylaştığı için ayrı süreçler kullanılır. Aynı anda en fazla workers süreç
+çalışır: yazıcının beklediği kaynak ve ondan sonraki kaynaklar.
+
+Veritabanına tek yazıcı (run'ı çağıran süreç, app context içinde) yazar:
+kuyrukları kaynak sırasıyla boşaltır ve batch_size kayda ulaşan grupları
+DataImporter.bulk_write_records ile toplu yazar. Kaynak sırası korunduğu için
+sonuç sıralı toplu içe aktarmayla aynıdır (ortak notaların tipi ilk kaynaktan
+gelir); sonraki kaynaklar yazıcı önceki kaynakla meşgulken ayrıştırılır. Her
+kaynak tek transaction'dır ve kaynak bitince commit edilir; dosya bozuk
+çıkarsa (hata sonda olsa bile) o kaynağın yazdıkları geri alınır, diğer
+kaynaklar etkilenmez.
+
+Aşama bazında kayıt sayısı, çalışma ve bekleme süreleri run() sonucunda
+döner; ayrıştırma sayaçları kaynak bitince süreçten yazıcıya taşınır.
+benchmark_import.py sıralı toplu içe aktarmayla karşılaştırır.
+"""
+
+import logging
+import multiprocessing
+import queue
+import time
+from itertools import islice
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.models.database import db
+from src.utils import bulk_loader
+
+logger = logging.getLogger(__name__)
+
+# (marka, dosya, kayıt dönüştürücü)
+Source = Tuple[str, str, Callable]
+
+# Kuyruk put/get denemeleri arasında iptal / süreç kontrolü aralığı (sn)
+_POLL_INTERVAL = 0.1
+
+# İptalde ayrıştırma süreçlerinin kendiliğinden çıkması için beklenen süre (sn)
+_JOIN_TIMEOUT = 5.0
+
+
+class StageMetrics:
+    """Bir hat aşamasının sayaçları (her aşamayı tek süreç günceller)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.records = 0
+        self.batches = 0
+        # Kendi işini yaparken geçen süre
+        self.busy = 0.0
+        # Ayrıştırıcı: kuyruk dolu (backpressure); yazıcı: kuyruk boş (veri bekleme)
+        self.blocked = 0.0
+
+    def stats(self) -> Dict:
+        return {
+            'records': self.records,
+            'batches': self.batches,
+            'busy_seconds': round(self.busy, 3),
+            'blocked_seconds': round(self.blocked, 3),
+            'records_per_second': round(self.records / self.busy, 1) if self.busy else None
+        }
+
+
+def _put(records_queue, item, metrics: StageMetrics, cancel) -> bool:
+    """Kuyruğa bırak; kuyruk doluysa bekle, hat iptal edildiyse False döndür"""
+    start = time.perf_counter()
+    try:
+        while not cancel.is_set():
+            try:
+                records_queue.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        # Okunmayacak parçalar yüzünden süreç çıkışta beklemesin
+        records_queue.cancel_join_thread()
+        return False
+    finally:
+        metrics.blocked += time.perf_counter() - start
+
+
+def _parse_source(importer, source: str, file_path: str, build_record: Callable, chunk_size: int,
+                  records_queue, cancel):
+    """Ayrıştırma süreci: dosyayı akışlı oku, kayıtları parçalar halinde kuyruğa bırak
+
+    Son öğe (hata, sayaçlar) ikilisidir; hata None değilse yazıcıda ele alınır.
+    """
+    metrics = StageMetrics(f'parse:{source}')
+    records = importer.build_records(source, importer.iter_json_file(file_path), build_record)
+    error = None
+    try:
+        while True:
+            start = time.perf_counter()
+            chunk = list(islice(records, chunk_size))
+            metrics.busy += time.perf_counter() - start
+            if not chunk:
+                break
+            metrics.records += len(chunk)
+            metrics.batches += 1
+            if not _put(records_queue, chunk, metrics, cancel):
+                return
+    except (OSError, ValueError) as e:
+        logger.error(f"{source} ayrıştırma hatası: {e}")
+        # Alt sınıflar (JSONDecodeError vb.) her zaman pickle edilemez; tipi korunur
+        error = (OSError if isinstance(e, OSError) else ValueError)(str(e))
+    except Exception as e:
+        logger.error(f"{source} ayrıştırma hatası: {e}")
+        error = RuntimeError(f"{source} ayrıştırma hatası: {e}")
+    _put(records_queue, (error, metrics), metrics, cancel)
+
+
+class ImportPipeline:
+    """Kaynak başına ayrıştırma süreci + sınırlı kuyruklar + tek toplu yazıcı"""
+
+    def __init__(self, importer, workers: Optional[int] = None, queue_size: int = 8,
+                 chunk_size: int = 500, batch_size: int = bulk_loader.BATCH_SIZE):
+        self.importer = importer
+        # None: kaynak sayısı kadar ayrıştırma süreci
+        self.workers = workers
+        self.queue_size = queue_size
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+
+    def run(self, sources: Iterable[Source]) -> Dict:
+        """Kaynakları içe aktar; kaynak başına eklenen parfüm sayısı ve aşama istatistiklerini döndür"""
+        sources = list(sources)
+        queues = [multiprocessing.Queue(maxsize=self.queue_size) for _ in sources]
+        parse_metrics = [StageMetrics(f'parse:{source}') for source, _, _ in sources]
+        write_metrics = StageMetrics('write')
+        workers = self.workers or max(len(sources), 1)
+        cancel = multiprocessing.Event()
+        processes: List[multiprocessing.Process] = []
+        start = time.perf_counter()
+
+        def start_until(count: int):
+            # Süreçler kaynak sırasıyla başlatılır; yazıcının beklediği kaynak her zaman çalışıyor olur
+            for index in range(len(processes), min(count, len(sources))):
+                source, file_path, build_record = sources[index]
+                process = multiprocessing.Process(
+                    target=_parse_source, name=f'import-parse:{source}', daemon=True,
+                    args=(self.importer, source, file_path, build_record, self.chunk_size, queues[index], cancel)
+                )
+                process.start()
+                processes.append(process)
+
+        imported = {}
+        try:
+            note_ids = bulk_loader.note_ids()
+            for index, ((source, _, _), records_queue) in enumerate(zip(sources, queues)):
+                start_until(index + workers)
+                imported[source], parse_metrics[index] = self._write_source(
+                    source, records_queue, processes[index], note_ids, write_metrics
+                )
+        except BaseException:
+            # Kuyruk başında bekleyen ayrıştırıcılar çıksın; yarım kaynak yazılmasın
+            cancel.set()
+            self.importer.rollback_file()
+            raise
+        finally:
+            for process in processes:
+                process.join(_JOIN_TIMEOUT)
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+
+        stages = {metrics.name: metrics.stats() for metrics in parse_metrics + [write_metrics]}
+        elapsed = time.perf_counter() - start
+        for name, stage in stages.items():
+            logger.info(f"Hat aşaması {name}: {stage['records']} kayıt, {stage['busy_seconds']} sn çalışma, "
+                        f"{stage['blocked_seconds']} sn bekleme")
+        logger.info(f"Paralel içe aktarma tamamlandı: {sum(imported.values())} parfüm, {elapsed:.2f} sn")
+        return {
+            'imported': imported,
+            'stages': stages,
+            'workers': workers,
+            'elapsed_seconds': round(elapsed, 3)
+        }
+
+    @staticmethod
+    def _get(source: str, records_queue, process: multiprocessing.Process):
+        """Kuyruktan al; ayrıştırma süreci son öğeyi bırakmadan öldüyse hata fırlat"""
+        while True:
+            try:
+                return records_queue.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                # Normal çıkış ancak son öğe kuyruğa yazıldıktan sonra olur
+                if process.exitcode not in (None, 0):
+                    raise RuntimeError(f"{source} ayrıştırma süreci beklenmedik şekilde kapandı "
+                                       f"(çıkış kodu {process.exitcode})")
+
+    def _write_source(self, source: str, records_queue, process: multiprocessing.Process,
+                      note_ids: Dict[str, int], metrics: StageMetrics) -> Tuple[int, StageMetrics]:
+        """Yazma aşaması: kaynağın kuyruğunu boşalt, batch_size'lık gruplarla tek transaction'da yaz
+
+        Eklenen parfüm sayısını ve ayrıştırma sürecinin sayaçlarını döndürür.
+        """
+        brand = None
+        existing_names = None
+        pending: List = []
+        imported_count = 0
+
+        while True:
+            start = time.perf_counter()
+            item = self._get(source, records_queue, process)
+            metrics.blocked += time.perf_counter() - start
+            done = isinstance(item, tuple)
+            if done:
+                error, parse_metrics = item
+                if isinstance(error, (OSError, ValueError)):
+                    # Okunamayan / bozuk dosya: kaynağın yazdıkları geri alınır, sonraki kaynağa geçilir
+                    logger.error(f"{source} içe aktarması geri alındı: {error}")
+                    self.importer.rollback_file()
+                    note_ids.clear()
+                    note_ids.update(bulk_loader.note_ids())
+                    return 0, parse_metrics
+                if error is not None:
+                    raise error
+            else:
+                pending.extend(item)
+
+            if pending and (done or len(pending) >= self.batch_size):
+                start = time.perf_counter()
+                if brand is None:
+                    # Kayıt gelmeyen (boş / eksik) dosya için marka oluşturulmaz
+                    brand = self.importer.get_or_create_brand(source, 'alternative')
+                    existing_names = bulk_loader.existing_perfume_names(brand.id)
+                imported_count += self.importer.bulk_write_records(source, brand, pending, existing_names, note_ids)
+                metrics.records += len(pending)
+                metrics.batches += 1
+                metrics.busy += time.perf_counter() - start
+                pending = []
+
+            if done:
+                db.session.commit()
+                return imported_count, parse_metrics
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Scrape edilmiş katalog dosyaları için akışlı JSON okuyucu.
+
+Dosya json.load ile bütün olarak belleğe alınmaz; chunk_size karakterlik
+parçalar halinde okunur ve her kayıt çözüldüğü anda üretilir. Bellekte en
+fazla bir parça ile o an çözülen kayıt tutulur, tüketici (içe aktarma,
+app.py indeksleri) ayrıştırma bitmeden çalışmaya başlar.
+
+Desteklenen biçimler:
+
+- JSON dizisi: ``[{...}, {...}]`` -> dizinin elemanları
+- Satır satır JSON (NDJSON / JSON Lines): her satırda bir kayıt
+- Tek bir JSON nesnesi: ``{...}`` -> tek kayıt
+"""
+
+import json
+import re
+from typing import IO, Any, Iterator
+
+# Okuma parçası (karakter)
+CHUNK_SIZE = 1 << 16
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r'\s*')
+# Dizi elemanları arasındaki boşluk ve virgüller
+_ARRAY_SEPARATORS = re.compile(r'[\s,]*')
+
+
+def iter_json_values(fp: IO[str], chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """Açık metin dosyasından kayıtları tek tek üret
+
+    En üst seviye değer bir diziyse elemanları, değilse (NDJSON ya da tek
+    nesne) ardışık değerlerin kendileri üretilir. Bozuk içerikte
+    json.JSONDecodeError, kapanmamış dizide ValueError fırlatılır.
+    """
+    buffer = ''
+    position = 0
+    eof = False
+    in_array = None
+    read_size = chunk_size
+
+    while True:
+        separators = _ARRAY_SEPARATORS if in_array else _WHITESPACE
+        position = separators.match(buffer, position).end()
+
+        if position < len(buffer):
+            if in_array is None:
+                in_array = buffer[position] == '['
+                if in_array:
+                    position += 1
+                continue
+            if in_array and buffer[position] == ']':
+                return
+
+            try:
+                value, end = _decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                end = None
+
+            # Tampon sonunda biten değer (ör. sayı) devam ediyor olabilir
+            if end is not None and (end < len(buffer) or eof):
+                yield value
+                position = end
+                read_size = chunk_size
+                continue
+            # Kayıt yarım kaldı; parçadan büyük kayıtlarda okuma boyutu bekleyen
+            # veriyle birlikte büyür, yeniden çözme sayısı logaritmik kalır
+            read_size = max(chunk_size, len(buffer) - position)
+
+        if eof:
+            if in_array:
+                raise ValueError('JSON dizisi kapanmadan dosya bitti')
+            return
+
+        chunk = fp.read(read_size)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+
+def iter_json_records(file_path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """JSON / NDJSON dosyasındaki kayıtları akışlı olarak üret"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        yield from iter_json_values(f, chunk_size)
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Nota isimleri için ortak normalizasyon, kategori ve çeviri yardımcıları.
+
+Kelime listeleri modül yüklenirken bir kez derlenir: her liste tek bir
+regex alternasyonuna dönüşür ve bir isimdeki tüm eşleşmeler tek taramada
+bulunur. Sonuçlar farklı nota ismi başına sınırlı bir LRU önbellekte
+saklanır; katalogdaki nota çeşitliliği küçük olduğu için sıcak yolda
+regex hiç çalışmaz.
+
+Eşleşme kuralları eski döngülerle aynıdır: kategori, çağıranın kendi
+listesinde sözlük sırasındaki ilk eşleşen kategoridir; çeviride tam eşleşme yoksa sözlük sırasındaki, isimde
+geçen ya da ismi içeren ilk anahtar kullanılır.
+"""
+
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+
+# Farklı nota ismi başına önbellek boyutu
+NOTE_CACHE_SIZE = 4096
+
+# Kategori -> anahtar kelimeler; kategori sırası önceliktir. Her çağıranın
+# listesi ayrı tutulur: aynı nota iki script'te farklı kategoriye düşebilir
+# ("Rose" içe aktarımda 'other', lüks markalarda 'floral').
+
+# DataImporter (Türkçe katalog notaları)
+IMPORTER_NOTE_CATEGORIES: Dict[str, Sequence[str]] = {
+    'citrus': ['bergamot', 'limon', 'portakal', 'greyfurt', 'mandalina', 'lime'],
+    'floral': ['gül', 'yasemin', 'lavanta', 'süsen', 'portakal çiçeği', 'neroli', 'gardenya', 'orkide'],
+    'fruity': ['elma', 'şeftali', 'armut', 'ananas', 'mango', 'çilek', 'ahududu'],
+    'spicy': ['biber', 'tarçın', 'karanfil', 'zencefil', 'kakule', 'safran'],
+    'woody': ['sedir', 'sandal ağacı', 'vetiver', 'paçuli', 'oud'],
+    'sweet': ['vanilya', 'karamel', 'bal', 'şeker'],
+    'gourmand': ['kahve', 'çikolata', 'badem'],
+    'amber': ['amber', 'kehribar'],
+    'musk': ['misk'],
+    'leather': ['deri'],
+    'tobacco': ['tütün']
+}
+
+# add_luxury_brands.py (İngilizce notalar, birkaç Türkçe karşılıkla)
+LUXURY_NOTE_CATEGORIES: Dict[str, Sequence[str]] = {
+    'citrus': ['bergamot', 'lemon', 'orange', 'grapefruit', 'mandarin', 'lime', 'limon', 'portakal'],
+    'floral': ['rose', 'jasmine', 'lavender', 'iris', 'neroli', 'gardenia', 'orchid', 'gül', 'yasemin'],
+    'fruity': ['apple', 'peach', 'pear', 'pineapple', 'mango', 'strawberry', 'raspberry', 'elma', 'şeftali'],
+    'spicy': ['pepper', 'cinnamon', 'clove', 'ginger', 'cardamom', 'saffron', 'biber', 'tarçın'],
+    'woody': ['cedar', 'sandalwood', 'vetiver', 'patchouli', 'oud', 'sedir', 'sandal'],
+    'sweet': ['vanilla', 'caramel', 'honey', 'sugar', 'vanilya', 'karamel'],
+    'gourmand': ['coffee', 'chocolate', 'almond', 'kahve', 'çikolata'],
+    'amber': ['amber', 'ambergris'],
+    'musk': ['musk', 'misk'],
+    'leather': ['leather', 'deri'],
+    'tobacco': ['tobacco', 'tütün']
+}
+
+# Parfüm notaları için İngilizce -> Türkçe eşleştirme sözlüğü (sıra kısmi eşleşme önceliğidir)
+NOTE_TRANSLATIONS: Dict[str, str] = {
+    # Meyveler
+    'apple': 'elma',
+    'pear': 'armut',
+    'peach': 'şeftali',
+    'mandarin': 'mandalina',
+    'orange': 'portakal',
+    'orange blossom': 'portakal çiçeği',
+    'bergamot': 'bergamot',
+    'lemon': 'limon',
+    'grapefruit': 'greyfurt',
+    'blackcurrant': 'siyah frenk üzümü',
+    'raspberry': 'ahududu',
+    'strawberry': 'çilek',
+    'pineapple': 'ananas',
+    'coconut': 'hindistan cevizi',
+    'fig': 'incir',
+    'plum': 'erik',
+    'lychee': 'liçi',
+    'mango': 'mango',
+
+    # Çiçekler
+    'rose': 'gül',
+    'jasmine': 'yasemin',
+    'lavender': 'lavanta',
+    'violet': 'menekşe',
+    'lily': 'zambak',
+    'lily of the valley': 'vadi zambağı',
+    'iris': 'süsen',
+    'freesia': 'frezya',
+    'magnolia': 'manolya',
+    'gardenia': 'gardenya',
+    'orchid': 'orkide',
+    'peony': 'şakayık',
+    'neroli': 'neroli',
+    'geranium': 'sardunya',
+    'lotus': 'lotus',
+
+    # Baharatlar ve Otlar
+    'vanilla': 'vanilya',
+    'cinnamon': 'tarçın',
+    'pepper': 'biber',
+    'pink pepper': 'pembe biber',
+    'cardamom': 'kakule',
+    'saffron': 'safran',
+    'nutmeg': 'muskat',
+    'mint': 'nane',
+    'rosemary': 'biberiye',
+    'basil': 'fesleğen',
+    'thyme': 'kekik',
+    'sage': 'adaçayı',
+
+    # Odunsu ve Reçineli
+    'sandalwood': 'sandal ağacı',
+    'cedar': 'sedir',
+    'oud': 'ud',
+    'patchouli': 'paçuli',
+    'vetiver': 'vetiver',
+    'amber': 'amber',
+    'musk': 'misk',
+    'leather': 'deri',
+    'tobacco': 'tütün',
+    'incense': 'tütsü',
+    'woody notes': 'odunsu notalar',
+
+    # Diğer
+    'caramel': 'karamel',
+    'chocolate': 'çikolata',
+    'coffee': 'kahve',
+    'almond': 'badem',
+    'honey': 'bal',
+    'sea notes': 'deniz notaları',
+    'green notes': 'yeşil notalar',
+    'powdery notes': 'pudramsı notalar',
+    'spicy notes': 'baharatlı notalar',
+    'floral notes': 'çiçeksi notalar',
+    'fruity notes': 'meyvemsi notalar',
+}
+
+
+class KeywordMatcher:
+    """Sıralı kelime listesi üzerinde tek derlenmiş regex ile alt dize araması"""
+
+    _SEPARATOR = '\n'
+
+    def __init__(self, keywords: Sequence[str]):
+        self.keywords = list(keywords)
+        # Tekrarlanan kelimede ilk sıra geçerli
+        self._rank: Dict[str, int] = {}
+        for rank, keyword in enumerate(self.keywords):
+            self._rank.setdefault(keyword, rank)
+        # Sıfır genişlikli lookahead her başlangıç konumunu dener (örtüşen eşleşmeler
+        # kaçmaz); alternasyon sırası kelime sırası olduğundan her konumda en
+        # öncelikli kelime yakalanır
+        alternatives = '|'.join(re.escape(keyword) for keyword in self._rank)
+        self._pattern = re.compile(f'(?=({alternatives}))')
+        # "ismi içeren ilk kelime" araması için kelimeler tek metinde
+        self._joined = self._SEPARATOR.join(self.keywords)
+        self._offsets = []
+        offset = 0
+        for keyword in self.keywords:
+            self._offsets.append(offset)
+            offset += len(keyword) + 1
+
+    def first_in(self, text: str) -> Optional[int]:
+        """text içinde geçen en öncelikli kelimenin sırası"""
+        best = None
+        for match in self._pattern.finditer(text):
+            rank = self._rank[match.group(1)]
+            if best is None or rank < best:
+                best = rank
+                if best == 0:
+                    break
+        return best
+
+    def first_containing(self, text: str) -> Optional[int]:
+        """text'i içeren en öncelikli kelimenin sırası"""
+        if self._SEPARATOR in text:
+            return None
+        position = self._joined.find(text)
+        if position < 0:
+            return None
+        return bisect_right(self._offsets, position) - 1
+
+
+class NoteClassifier:
+    """Bir kategori listesi için derlenmiş, LRU önbellekli nota sınıflandırıcı"""
+
+    def __init__(self, categories: Dict[str, Sequence[str]], cache_size: int = NOTE_CACHE_SIZE):
+        keywords: List[str] = []
+        self._categories: List[str] = []
+        for category, words in categories.items():
+            keywords.extend(words)
+            self._categories.extend([category] * len(words))
+        self._matcher = KeywordMatcher(keywords)
+        self.classify = lru_cache(maxsize=cache_size)(self._classify)
+
+    def _classify(self, note_name: str) -> str:
+        rank = self._matcher.first_in(note_name.lower())
+        return 'other' if rank is None else self._categories[rank]
+
+
+importer_classifier = NoteClassifier(IMPORTER_NOTE_CATEGORIES)
+luxury_classifier = NoteClassifier(LUXURY_NOTE_CATEGORIES)
+_translation_matcher = KeywordMatcher(list(NOTE_TRANSLATIONS))
+_translation_values = list(NOTE_TRANSLATIONS.values())
+
+
+@lru_cache(maxsize=NOTE_CACHE_SIZE)
+def _normalize(name: str) -> str:
+    # Türkçe 'İ'.lower() birleşik nokta bırakır ('i̇'); önce düz 'i'ye çevrilir
+    return ' '.join(name.replace('İ', 'i').lower().split())
+
+
+def normalize_note(name) -> str:
+    """Nota ismini karşılaştırma anahtarına çevir: küçük harf, tek boşluk, kenar boşluksuz"""
+    if not isinstance(name, str):
+        name = str(name or '')
+    return _normalize(name)
+
+
+@lru_cache(maxsize=NOTE_CACHE_SIZE)
+def translate_note(note: str) -> str:
+    """İngilizce nota ismini Türkçeye çevir; sözlükte yoksa küçük harfli ismi döndür"""
+    note = note.lower()
+    # Tam eşleşme kontrolü
+    if note in NOTE_TRANSLATIONS:
+        return NOTE_TRANSLATIONS[note]
+
+    # Kısmi eşleşme: isimde geçen ya da ismi içeren, sözlükte önce gelen anahtar
+    ranks = [rank for rank in (_translation_matcher.first_in(note), _translation_matcher.first_containing(note))
+             if rank is not None]
+    return _translation_values[min(ranks)] if ranks else note
+
+
+def cache_stats() -> Dict:
+    """LRU önbellek istatistikleri"""
+    return {
+        name: function.cache_info()._asdict()
+        for name, function in (('normalize', _normalize), ('classify_importer', importer_classifier.classify),
+                               ('classify_luxury', luxury_classifier.classify), ('translate', translate_note))
+    }
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Kanonik nota sözlüğü: her ham yazımı kararlı, küçük bir tamsayı id'ye eşler.
+
+Kaynaklar aynı notayı farklı yazar ("Misk", "misk", "Musk", "Beyaz Misk",
+"Sandal Ağacı" / "sandalwood"). Karşılaştırma anahtarı normalize_note
+(küçük harf, tek boşluk) üzerine Türkçe karakter katlamasıyla (ç->c, ğ->g,
+ı->i, ö->o, ş->s, ü->u) üretilir; anahtar bir takma isimse kanonik notanın
+anahtarına çevrilir. Takma isimler NOTE_TRANSLATIONS'daki İngilizce ->
+Türkçe çiftlerinden ve NOTE_ALIASES'tan oluşur.
+
+Kanonik notalar modül yüklenirken sabit sırayla eklenir, dolayısıyla id'leri
+süreçten sürece aynıdır; katalogda görülen diğer notalar ilk görüldükleri
+sırayla sonraki id'leri alır. NoteRegistry bir NoteVocabulary'dir: benzerlik
+matrisleri, bitsetler ve nota posting listeleri string kümeleri yerine bu
+id'lerle çalışır.
+"""
+
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+from src.utils.note_normalizer import NOTE_CACHE_SIZE, NOTE_TRANSLATIONS, normalize_note
+from src.utils.similarity_engine import NoteVocabulary
+
+# Kanonik isim -> NOTE_TRANSLATIONS dışındaki ek yazımlar
+NOTE_ALIASES: Dict[str, Sequence[str]] = {
+    'misk': ['beyaz misk', 'white musk', 'musks'],
+    'sandal ağacı': ['sandal', 'sandal wood', 'sandal ağaçı'],
+    'sedir': ['sedir ağacı', 'cedarwood', 'cedar wood'],
+    'ud': ['ud ağacı', 'agarwood', 'oud wood'],
+    'süsen': ['orris', 'orris root', 'iris kökü'],
+    'tonka fasulyesi': ['tonka', 'tonka bean', 'tonka bezelyesi'],
+    'karabiber': ['kara biber', 'black pepper'],
+    'paçuli': ['patchouly'],
+    'yasemin': ['jasmin'],
+    'ylang ylang': ['ylang-ylang', 'ilang ilang'],
+    'amber': ['kehribar'],
+    'deniz notaları': ['marine notes', 'deniz notası'],
+}
+
+_FOLD = str.maketrans('çğıöşüâîû', 'cgiosuaiu')
+
+
+@lru_cache(maxsize=NOTE_CACHE_SIZE)
+def _note_key(name: str) -> str:
+    return normalize_note(name).translate(_FOLD)
+
+
+def note_key(name) -> str:
+    """Yazım anahtarı: normalize_note + Türkçe karakter katlama ("Sandal Ağacı" -> "sandal agaci")"""
+    if not isinstance(name, str):
+        name = str(name or '')
+    return _note_key(name)
+
+
+def default_aliases() -> Dict[str, str]:
+    """Takma isim -> kanonik isim"""
+    aliases = {english: turkish for english, turkish in NOTE_TRANSLATIONS.items()}
+    for canonical, spellings in NOTE_ALIASES.items():
+        for spelling in spellings:
+            aliases[spelling] = canonical
+    return aliases
+
+
+class NoteRegistry(NoteVocabulary):
+    """Ham nota yazımı -> kanonik nota id'si"""
+
+    def __init__(self, aliases: Optional[Dict[str, str]] = None):
+        super().__init__(self.canonical_key)
+        aliases = default_aliases() if aliases is None else aliases
+        self._aliases = {note_key(alias): note_key(canonical) for alias, canonical in aliases.items()}
+        # Her id için bilinen yazım anahtarları (alt dize aramaları için)
+        self.spellings: List[Set[str]] = []
+        self._lock = threading.Lock()
+
+        # Kanonik notalar sabit sırayla: id'leri kararlı
+        for canonical in dict.fromkeys(aliases.values()):
+            self.add(canonical)
+        for alias in aliases:
+            self.add(alias)
+
+    def canonical_key(self, name) -> str:
+        """Yazımın kanonik anahtarı"""
+        key = note_key(name)
+        return self._aliases.get(key, key)
+
+    def add(self, name) -> int:
+        """Yazımın id'si; yeni notaysa sözlüğe eklenir"""
+        spelling = note_key(name)
+        key = self._aliases.get(spelling, spelling)
+        note_id = self.ids.get(key)
+        if note_id is not None and spelling in self.spellings[note_id]:
+            return note_id
+
+        with self._lock:
+            note_id = self.ids.get(key)
+            if note_id is None:
+                note_id = len(self.names)
+                # Görünen isim: kanonik notada kanonik isim, diğerlerinde ilk yazım
+                self.names.append(normalize_note(name))
+                self.spellings.append({key})
+                self.ids[key] = note_id
+            self.spellings[note_id].add(spelling)
+        return note_id
+
+    def id_of(self, name) -> Optional[int]:
+        """Yazımın id'si; sözlükte yoksa None (sözlüğü değiştirmez)"""
+        return self.ids.get(self.canonical_key(name))
+
+    def id_set(self, names: Iterable[str]) -> Set[int]:
+        """Nota isimlerinin kanonik id kümesi"""
+        return {self.add(name) for name in names}
+
+    def matching_ids(self, term: str, candidates: Iterable[int]) -> Set[int]:
+        """candidates içinden, yazımlarından birinde term geçen ya da term'in takma ismi olduğu id'ler"""
+        term_key = note_key(term)
+        matched = {note_id for note_id in candidates if any(term_key in spelling for spelling in self.spellings[note_id])}
+        note_id = self.id_of(term)
+        if note_id is not None:
+            matched.add(note_id)
+        return matched
+
+
+# Süreç genelinde paylaşılan sözlük (modül yüklenirken bir kez kurulur)
+note_registry = NoteRegistry()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Parfüm nota kümeleri için kompakt bitset deposu ve alternatif önbelleği.
+
+Bir notanın bit numarası note_registry'deki kanonik id'sidir (farklı
+yazımlar aynı bite düşer); her parfümün nota kümesi tek bir Python int'i
+olarak saklanır. Ortak nota sayısı AND + popcount
+ile bulunur. Bir parfümün en iyi K alternatifi ilk istekte hesaplanır ve
+LRU önbellekte tutulur.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+from src.utils.note_registry import note_key, note_registry
+from src.utils.search_index import iter_note_names
+
+# (katalog konumu, benzerlik, ortak nota bitseti)
+Alternative = Tuple[int, float, int]
+
+
+def _popcount(value: int) -> int:
+    return bin(value).count('1')
+
+
+class NoteVectorStore:
+    """Katalog için nota bitsetleri ve tembel top-K alternatif önbelleği"""
+
+    def __init__(self, perfumes: List[Dict], top_k: int = 5,
+                 min_similarity: float = 0.3, max_cache_entries: int = 4096):
+        self.perfumes = perfumes
+        self.top_k = top_k
+        self.min_similarity = min_similarity
+        self.max_cache_entries = max_cache_entries
+
+        # Bit numarası = kanonik nota id'si (note_registry)
+        self.registry = note_registry
+        self.note_postings: Dict[int, List[int]] = {}
+        self.bitsets: List[int] = []
+        self.note_counts: List[int] = []
+
+        for position, perfume in enumerate(perfumes):
+            self._add(position, perfume)
+
+        # Bitsetler ve posting listeleri kurulduktan sonra değişmez; boyutları bir kez hesaplanır
+        self._matrix_bytes = self._compute_matrix_bytes()
+
+        self._cache: 'OrderedDict[int, Tuple[List[Alternative], int]]' = OrderedDict()
+        self._cache_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _add(self, position: int, perfume: Dict):
+        bitset = 0
+        count = 0
+        for note_name in iter_note_names(perfume):
+            if not note_key(note_name):
+                continue
+            count += 1
+            bit = self.registry.add(note_name)
+            if not bitset >> bit & 1:
+                self.note_postings.setdefault(bit, []).append(position)
+            bitset |= 1 << bit
+
+        self.bitsets.append(bitset)
+        self.note_counts.append(count)
+
+    def decode(self, bitset: int) -> List[str]:
+        """Bitseti nota isimlerine çevir"""
+        names = []
+        bit = 0
+        while bitset:
+            if bitset & 1:
+                names.append(self.registry.names[bit])
+            bitset >>= 1
+            bit += 1
+        return names
+
+    def _compute(self, position: int) -> Tuple[List[Alternative], int]:
+        target = self.bitsets[position]
+        target_count = self.note_counts[position]
+
+        # Sadece en az bir ortak notası olan parfümler aday olabilir
+        candidates = set()
+        bits = target
+        bit = 0
+        while bits:
+            if bits & 1:
+                candidates.update(self.note_postings[bit])
+            bits >>= 1
+            bit += 1
+        candidates.discard(position)
+
+        alternatives = []
+        for other in sorted(candidates):
+            common = target & self.bitsets[other]
+            similarity = _popcount(common) / max(target_count, self.note_counts[other])
+            if similarity > self.min_similarity:
+                alternatives.append((other, similarity, common))
+
+        alternatives.sort(key=lambda item: item[1], reverse=True)
+        return alternatives[:self.top_k], len(alternatives)
+
+    def alternatives(self, position: int) -> Tuple[List[Alternative], int]:
+        """Katalog konumundaki parfümün en iyi K alternatifini ve toplam eşleşme sayısını döndür"""
+        with self._lock:
+            cached = self._cache.get(position)
+            if cached is not None:
+                self._cache.move_to_end(position)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        result = self._compute(position)
+
+        with self._lock:
+            previous = self._cache.pop(position, None)
+            if previous is not None:
+                # Başka bir thread aynı konumu araya girip hesaplamış
+                self._cache_bytes -= self._entry_bytes(previous)
+            self._cache[position] = result
+            self._cache_bytes += self._entry_bytes(result)
+            if len(self._cache) > self.max_cache_entries:
+                _, evicted = self._cache.popitem(last=False)
+                self._cache_bytes -= self._entry_bytes(evicted)
+        return result
+
+    def _compute_matrix_bytes(self) -> int:
+        total = sys.getsizeof(self.bitsets) + sum(sys.getsizeof(b) for b in self.bitsets)
+        total += sys.getsizeof(self.note_counts)
+        total += sum(sys.getsizeof(p) for p in self.note_postings.values())
+        return total
+
+    @staticmethod
+    def _entry_bytes(entry: Tuple[List[Alternative], int]) -> int:
+        alternatives, _ = entry
+        return sys.getsizeof(alternatives) + len(alternatives) * sys.getsizeof((0, 0.0, 0))
+
+    def memory_bytes(self) -> int:
+        """Bitsetler ve önbellek için yaklaşık bellek kullanımı (O(1): boyutlar önceden tutulur)"""
+        return self._matrix_bytes + sys.getsizeof(self._cache) + self._cache_bytes
+
+    def stats(self) -> Dict:
+        """Önbellek istatistikleri"""
+        requests_total = self.hits + self.misses
+        return {
+            'perfumes': len(self.bitsets),
+            'vocabulary_size': len(self.note_postings),
+            'cache_entries': len(self._cache),
+            'cache_hits': self.hits,
+            'cache_misses': self.misses,
+            'hit_rate': round(self.hits / requests_total, 4) if requests_total else 0.0,
+            'memory_bytes': self.memory_bytes()
+        }
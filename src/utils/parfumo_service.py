@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Parfumo.com aramaları için süreç içi, kalıcı iş parçacığı havuzu.
+
+Her istekte yeni bir Python yorumlayıcısı başlatmak yerine
+scrapping/request_branded.py fonksiyonları bu süreçte, sınırlı sayıda worker
+thread'inde çalışır. Tüm worker'lar keep-alive bağlantıları ve yeniden
+deneme politikası olan tek bir requests.Session paylaşır. Aynı anda gelen
+aynı (marka, parfüm) istekleri tek bir HTTP isteğinde birleştirilir ve
+sonuçlar kısa süre saklanır. Bekleyen iş sayısı max_pending'i aşarsa yeni
+arama beklemeden reddedilir; Flask worker'ları kuyrukta birikmez.
+
+Bir arama yeniden denemelerle birlikte worst_case_seconds() kadar sürebilir;
+istek thread'i bunu beklemez. lookup en fazla wait saniye bekler, arama
+sürüyorsa ParfumoPendingError fırlatır (sunucu 202 döner). İstemci aynı
+aramayı retry_after saniye sonra tekrarlar: arama sürüyorsa aynı işe
+bağlanır, bittiyse sonucu (bulunamadıysa None'ı, miss_ttl boyunca)
+önbellekten alır.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from scrapping.request_branded import HEADERS, fetch_parfumo_perfume, load_bargello_data
+
+logger = logging.getLogger(__name__)
+
+
+# Sayfa isteği için yeniden deneme politikası (bağlantı / 502-504 hataları)
+RETRY_TOTAL = 2
+RETRY_BACKOFF = 0.3
+
+
+class ParfumoBusyError(Exception):
+    """Havuz dolu: bekleyen arama sayısı sınırı aşıldı"""
+
+
+class ParfumoPendingError(Exception):
+    """Arama wait süresi içinde bitmedi; arka planda sürüyor, retry_after saniye sonra tekrar sorulmalı"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ParfumoLookupService:
+    """Paylaşılan HTTP oturumuyla Parfumo aramalarını yürüten worker havuzu"""
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 32,
+                 timeout: Tuple[float, float] = (5, 15), result_ttl: float = 600,
+                 max_results: int = 256, wait: float = 3, retry_after: float = 2,
+                 miss_ttl: float = 60):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.result_ttl = result_ttl
+        self.max_results = max_results
+        # İstek thread'inin bir aramayı en fazla bekleyeceği süre
+        self.wait = wait
+        self.retry_after = retry_after
+        # Bulunamayan / hata veren aramaların saklanma süresi
+        self.miss_ttl = miss_ttl
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._session: Optional[requests.Session] = None
+        self._lock = threading.Lock()
+        self._inflight: Dict[Tuple[str, str], Future] = {}
+        self._results: 'OrderedDict[Tuple[str, str], Tuple[float, Dict]]' = OrderedDict()
+        self.lookups = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+    def _build_session(self) -> requests.Session:
+        session = requests.Session()
+        session.headers.update(HEADERS)
+        retry = Retry(total=RETRY_TOTAL, backoff_factor=RETRY_BACKOFF, status_forcelist=(502, 503, 504),
+                      allowed_methods=frozenset(['GET']))
+        # Her worker'a en az bir açık bağlantı
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=self.max_workers, max_retries=retry)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def _ensure_started(self):
+        if self._executor is None:
+            self._session = self._build_session()
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='parfumo')
+            # Bargello verisini ilk aramadan önce yükle
+            self._executor.submit(load_bargello_data)
+
+    @staticmethod
+    def _key(brand: str, perfume_name: str) -> Tuple[str, str]:
+        return brand.strip().lower(), perfume_name.strip().lower()
+
+    def worst_case_seconds(self) -> float:
+        """Bir aramanın yeniden denemeler ve bekleme aralıklarıyla birlikte en uzun süresi"""
+        attempts = RETRY_TOTAL + 1
+        backoff = sum(RETRY_BACKOFF * 2 ** retry for retry in range(1, RETRY_TOTAL))
+        return attempts * sum(self.timeout) + backoff
+
+    def _fetch(self, key: Tuple[str, str], brand: str, perfume_name: str) -> Optional[Dict]:
+        result = None
+        try:
+            result = fetch_parfumo_perfume(brand, perfume_name, session=self._session, timeout=self.timeout)
+            return result
+        finally:
+            with self._lock:
+                # Bulunamayan sonuç da (miss_ttl boyunca) saklanır: bekleyen istemcinin
+                # tekrar sorusu yeni bir arama başlatmaz
+                self._results[key] = (time.monotonic(), result)
+                self._results.move_to_end(key)
+                if len(self._results) > self.max_results:
+                    self._results.popitem(last=False)
+                self._inflight.pop(key, None)
+
+    def submit(self, brand: str, perfume_name: str) -> Future:
+        """Aramayı kuyruğa al; aynı arama sürüyorsa onun Future'ını döndür"""
+        key = self._key(brand, perfume_name)
+        with self._lock:
+            self._ensure_started()
+            self.lookups += 1
+
+            cached = self._results.get(key)
+            if cached is not None and time.monotonic() - cached[0] < (
+                    self.result_ttl if cached[1] is not None else self.miss_ttl):
+                self.cache_hits += 1
+                future: Future = Future()
+                future.set_result(cached[1])
+                return future
+
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future
+
+            if len(self._inflight) >= self.max_pending:
+                self.rejected += 1
+                raise ParfumoBusyError(f"{len(self._inflight)} Parfumo araması bekliyor")
+
+            future = self._executor.submit(self._fetch, key, brand, perfume_name)
+            self._inflight[key] = future
+            return future
+
+    def lookup(self, brand: str, perfume_name: str, wait: Optional[float] = None) -> Optional[Dict]:
+        """Aramayı yap ve en fazla wait saniye bekle; bitmediyse ParfumoPendingError"""
+        future = self.submit(brand, perfume_name)
+        try:
+            result = future.result(timeout=wait if wait is not None else self.wait)
+        except FutureTimeoutError:
+            # İş arka planda tamamlanıp önbelleğe yazılır; istek thread'i serbest kalır
+            with self._lock:
+                self.timeouts += 1
+            logger.info(f"Parfumo araması sürüyor: {brand} - {perfume_name}")
+            raise ParfumoPendingError(f"{brand} - {perfume_name} araması sürüyor", self.retry_after)
+        # Çağıranlar sonucu değiştirebilir (ör. database_alternatives eklemek)
+        return dict(result) if result is not None else None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'workers': self.max_workers,
+                'inflight': len(self._inflight),
+                'cached': len(self._results),
+                'lookups': self.lookups,
+                'cache_hits': self.cache_hits,
+                'coalesced': self.coalesced,
+                'rejected': self.rejected,
+                'timeouts': self.timeouts
+            }
+
+    def shutdown(self):
+        with self._lock:
+            executor, session = self._executor, self._session
+            self._executor = self._session = None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        if session is not None:
+            session.close()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+/api/popular-perfumes için artımlı popülerlik sayaçları ve anlık görüntü.
+
+Arama geçmişi yazıcısı her batch'i yazarken aynı transaction içinde
+search_term_rollups tablosundaki saatlik, günlük ve tüm zamanlar kovalarını
+INSERT ... ON CONFLICT DO UPDATE ile artırır. Endpoint arama geçmişini
+taramak yerine önceden hesaplanmış bir anlık görüntüyü okur:
+
+- popular_searches: 'total' kovasından en çok aranan terimler
+- trending: son trending_window_hours saatlik kovalardan, yarı ömrü
+  half_life_hours olan üstel sönümle ağırlıklandırılmış skorlar
+- top_rated: en yüksek puanlı parfümler (katalog nesli değişince yenilenir)
+
+Görüntü snapshot_ttl saniyede bir yeniden üretilir; maliyeti geçmiş tablosunun
+boyutuna değil, pencere içindeki farklı terim sayısına bağlıdır.
+
+Yükseltilmiş kurulumlarda kova tablosu boş başlar; sunucu açılışta backfill()
+çağırır ve kovalar bir kez mevcut search_history'den üretilir.
+"""
+
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import text
+
+from src.models.database import db, Perfume, SearchHistory, SearchTermRollup, perfume_load_options
+from src.utils.catalog_cache import catalog_cache
+from src.utils.similarity_pipeline import dialect_insert
+
+logger = logging.getLogger(__name__)
+
+GRANULARITIES = ('hour', 'day', 'total')
+# 'total' kovasının sabit başlangıcı
+TOTAL_BUCKET = datetime(1970, 1, 1)
+
+
+def bucket_start(timestamp: datetime, granularity: str) -> datetime:
+    """Zaman damgasının ait olduğu kovanın başlangıcı"""
+    if granularity == 'hour':
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    if granularity == 'day':
+        return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+    return TOTAL_BUCKET
+
+
+class PopularityRollups:
+    """Arama terimi kovalarını artıran ve popülerlik görüntüsünü üreten sınıf"""
+
+    def __init__(self, half_life_hours: float = 6.0, trending_window_hours: int = 48,
+                 hour_retention_days: int = 7, snapshot_ttl: float = 60, limit: int = 10):
+        self.half_life_hours = half_life_hours
+        self.trending_window_hours = trending_window_hours
+        self.hour_retention = timedelta(days=hour_retention_days)
+        self.snapshot_ttl = snapshot_ttl
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._snapshot: Optional[Dict] = None
+        self._snapshot_at = 0.0
+        self._snapshot_generation = -1
+        self._pruned_at: Optional[datetime] = None
+
+    def apply(self, events: Iterable[Dict]):
+        """Arama olaylarını kovalara ekle (commit çağırana aittir)"""
+        counts: Counter = Counter()
+        for event in events:
+            term, search_type = event.get('search_term'), event.get('search_type')
+            if not term or not search_type:
+                continue
+            created_at = event.get('created_at') or datetime.utcnow()
+            for granularity in GRANULARITIES:
+                counts[(granularity, bucket_start(created_at, granularity), search_type, term)] += 1
+        if not counts:
+            return
+
+        rows = [
+            {'granularity': granularity, 'bucket_start': start, 'search_type': search_type,
+             'search_term': term, 'search_count': count}
+            for (granularity, start, search_type, term), count in counts.items()
+        ]
+        table = SearchTermRollup.__table__
+        stmt = dialect_insert(table)
+        if stmt is None:
+            for row in rows:
+                updated = db.session.query(SearchTermRollup).filter_by(
+                    granularity=row['granularity'], bucket_start=row['bucket_start'],
+                    search_type=row['search_type'], search_term=row['search_term']
+                ).update({SearchTermRollup.search_count: SearchTermRollup.search_count + row['search_count']},
+                         synchronize_session=False)
+                if not updated:
+                    db.session.execute(table.insert(), [row])
+        else:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['granularity', 'bucket_start', 'search_type', 'search_term'],
+                set_={'search_count': table.c.search_count + stmt.excluded.search_count}
+            )
+            db.session.execute(stmt, rows)
+
+        self._prune()
+
+    def _prune(self):
+        """Saklama süresini aşan saatlik kovaları saatte en fazla bir kez sil"""
+        now = datetime.utcnow()
+        if self._pruned_at is not None and now - self._pruned_at < timedelta(hours=1):
+            return
+        self._pruned_at = now
+        db.session.query(SearchTermRollup).filter(
+            SearchTermRollup.granularity == 'hour',
+            SearchTermRollup.bucket_start < bucket_start(now - self.hour_retention, 'hour')
+        ).delete(synchronize_session=False)
+
+    def rebuild(self, batch_size: int = 5000) -> int:
+        """Kovaları search_history tablosundan baştan hesapla (mevcut kurulumlar için)"""
+        db.session.query(SearchTermRollup).delete(synchronize_session=False)
+        processed = 0
+        batch: List[Dict] = []
+        rows = db.session.query(
+            SearchHistory.search_term, SearchHistory.search_type, SearchHistory.created_at
+        ).yield_per(batch_size)
+        for search_term, search_type, created_at in rows:
+            batch.append({'search_term': search_term, 'search_type': search_type, 'created_at': created_at})
+            if len(batch) >= batch_size:
+                self.apply(batch)
+                processed += len(batch)
+                batch = []
+        self.apply(batch)
+        processed += len(batch)
+        db.session.commit()
+        self.invalidate()
+        return processed
+
+    def backfill(self) -> int:
+        """Kova tablosu boşken arama geçmişi varsa kovaları geçmişten üret, işlenen olay sayısını döndür
+        
+        PostgreSQL'de tablo kilitlenir: aynı anda açılan worker'lardan yalnızca
+        biri üretir, diğerleri dolu tabloyu görüp çıkar.
+        """
+        if db.session.get_bind().dialect.name == 'postgresql':
+            db.session.execute(text('LOCK TABLE search_term_rollups IN SHARE ROW EXCLUSIVE MODE'))
+        empty = db.session.query(SearchTermRollup.id).first() is None
+        if not empty or db.session.query(SearchHistory.id).first() is None:
+            db.session.commit()
+            return 0
+        
+        processed = self.rebuild()
+        logger.info(f"Popülerlik kovaları arama geçmişinden üretildi: {processed} olay")
+        return processed
+
+    def invalidate(self):
+        """Bir sonraki okumada görüntüyü yeniden üret"""
+        with self._lock:
+            self._snapshot = None
+
+    def snapshot(self, search_type: str = 'name') -> Dict:
+        """Önceden hesaplanmış popülerlik görüntüsü (gerekirse yeniden üretilir)"""
+        with self._lock:
+            fresh = (
+                self._snapshot is not None
+                and time.monotonic() - self._snapshot_at < self.snapshot_ttl
+                and self._snapshot_generation == catalog_cache.generation
+            )
+            if fresh:
+                return self._snapshot
+
+        generation = catalog_cache.generation
+        snapshot = {
+            'popular_searches': self.popular_searches(search_type),
+            'trending': self.trending(search_type),
+            'top_rated': self.top_rated()
+        }
+        with self._lock:
+            self._snapshot = snapshot
+            self._snapshot_at = time.monotonic()
+            self._snapshot_generation = generation
+        return snapshot
+
+    def popular_searches(self, search_type: str = 'name') -> List[Dict]:
+        """Tüm zamanların en çok aranan terimleri"""
+        rows = db.session.query(
+            SearchTermRollup.search_term, SearchTermRollup.search_count
+        ).filter(
+            SearchTermRollup.granularity == 'total',
+            SearchTermRollup.search_type == search_type
+        ).order_by(
+            SearchTermRollup.search_count.desc(), SearchTermRollup.search_term
+        ).limit(self.limit).all()
+        return [{'term': term, 'count': count} for term, count in rows]
+
+    def trending(self, search_type: str = 'name', now: Optional[datetime] = None) -> List[Dict]:
+        """Son saatlerde yükselen terimler: kova yaşına göre üstel sönümlü toplam"""
+        now = now or datetime.utcnow()
+        since = bucket_start(now - timedelta(hours=self.trending_window_hours), 'hour')
+        rows = db.session.query(
+            SearchTermRollup.search_term, SearchTermRollup.bucket_start, SearchTermRollup.search_count
+        ).filter(
+            SearchTermRollup.granularity == 'hour',
+            SearchTermRollup.search_type == search_type,
+            SearchTermRollup.bucket_start >= since
+        ).all()
+
+        scores: Dict[str, float] = defaultdict(float)
+        counts: Counter = Counter()
+        for term, start, count in rows:
+            # Kovanın ortası referans alınır; gelecekteki kovalar sönümlenmez
+            age_hours = max((now - start).total_seconds() / 3600 - 0.5, 0.0)
+            scores[term] += count * 0.5 ** (age_hours / self.half_life_hours)
+            counts[term] += count
+
+        ranked = sorted(scores, key=lambda term: (-scores[term], term))[:self.limit]
+        return [{'term': term, 'count': counts[term], 'score': round(scores[term], 3)} for term in ranked]
+
+    def top_rated(self) -> List[Dict]:
+        """En yüksek puanlı parfümler"""
+        perfumes = Perfume.query.filter(
+            Perfume.rating.isnot(None)
+        ).options(
+            *perfume_load_options()
+        ).order_by(
+            Perfume.rating.desc(), Perfume.id
+        ).limit(self.limit).all()
+        return [p.to_dict() for p in perfumes]
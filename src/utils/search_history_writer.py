@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Arama geçmişi için istek yolundan ayrılmış, toplu yazan arka plan yazıcısı.
+
+/api/perfume/search her istekte add + commit yapmak yerine olayı sınırlı bir
+bellek kuyruğuna bırakır. Arka plan thread'i kuyruğu batch_size kayda
+ulaşınca ya da flush_interval saniyede bir boşaltır ve kayıtları tek bir
+çok satırlı INSERT (executemany) ile yazar. Kuyruk doluysa olay beklemeden
+düşürülür ve sayılır; istek hiçbir zaman yazma için bloklanmaz. rollups
+verilirse popülerlik kovaları aynı transaction içinde artırılır.
+İstemciden gelen arama tipi SEARCH_TYPES dışındaysa olay kuyruğa alınmaz
+(reddedilir). Bir batch yine de yazılamazsa kayıtlar tek tek yeniden
+denenir; yalnızca yazılamayan kayıtlar kaybedilir.
+background=False ise thread başlatılmaz; olaylar flush() çağrılana kadar
+kuyrukta bekler (bellek içi SQLite / testler).
+"""
+
+import atexit
+import logging
+import queue
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import insert
+
+from src.models.database import db, SearchHistory, SEARCH_TYPES
+
+logger = logging.getLogger(__name__)
+
+
+class SearchHistoryWriter:
+    """SearchHistory olaylarını tamponlayıp toplu INSERT ile yazan yazıcı"""
+
+    def __init__(self, app, max_queue: int = 10000, batch_size: int = 500,
+                 flush_interval: float = 2.0, rollups=None, background: bool = True):
+        self.app = app
+        self.background = background
+        self.rollups = rollups
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: 'queue.Queue[Dict]' = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.rejected = 0
+        self.batches = 0
+
+    def record(self, search_term: str, search_type: str, results_count: Optional[int] = None,
+               ip_address: Optional[str] = None, user_agent: Optional[str] = None) -> bool:
+        """Olayı kuyruğa bırak; arama tipi geçersizse ya da kuyruk doluysa düşür ve False döndür"""
+        if search_type not in SEARCH_TYPES:
+            # CHECK kısıtına takılacak olay tüm batch'i düşürmesin
+            self.rejected += 1
+            return False
+        self._ensure_started()
+        event = {
+            'search_term': search_term[:200] if search_term else search_term,
+            'search_type': search_type,
+            'results_count': results_count,
+            'ip_address': ip_address,
+            'user_agent': user_agent,
+            # Yazma anı değil, aramanın yapıldığı an
+            'created_at': datetime.utcnow()
+        }
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        if self._queue.qsize() >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def _ensure_started(self):
+        if self._thread is not None or not self.background:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='search-history-writer', daemon=True)
+                self._thread.start()
+                atexit.register(self.stop)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def _drain(self) -> List[Dict]:
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def flush(self) -> int:
+        """Kuyruktaki tüm olayları batch_size'lık INSERT'lerle yaz, yazılan sayıyı döndür"""
+        total = 0
+        with self._flush_lock:
+            while True:
+                batch = self._drain()
+                if not batch:
+                    break
+                try:
+                    self._write(batch)
+                    self.batches += 1
+                    written = len(batch)
+                except Exception as e:
+                    logger.error(f"Arama geçmişi toplu yazma hatası, kayıtlar tek tek deneniyor: {e}")
+                    with self.app.app_context():
+                        db.session.rollback()
+                    written = self._write_each(batch)
+                self.written += written
+                total += written
+        return total
+
+    def _write(self, events: List[Dict]):
+        with self.app.app_context():
+            db.session.execute(insert(SearchHistory), events)
+            if self.rollups is not None:
+                self.rollups.apply(events)
+            db.session.commit()
+
+    def _write_each(self, batch: List[Dict]) -> int:
+        """Batch'i kayıt kayıt yaz; yazılamayan kayıtları say, yazılan sayısını döndür"""
+        written = 0
+        for event in batch:
+            try:
+                self._write([event])
+                written += 1
+            except Exception as e:
+                # Analitik veri: kaybedilen kayıt sayılır, istekler etkilenmez
+                self.failed += 1
+                logger.error(f"Arama geçmişi kaydı yazılamadı: {e}")
+                with self.app.app_context():
+                    db.session.rollback()
+        return written
+
+    def stop(self):
+        """Thread'i durdur ve kalan olayları yaz"""
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.flush_interval + 5)
+        self.flush()
+
+    def stats(self) -> Dict:
+        """Yazıcı istatistikleri"""
+        return {
+            'queued': self._queue.qsize(),
+            'written': self.written,
+            'dropped': self.dropped,
+            'failed': self.failed,
+            'rejected': self.rejected,
+            'batches': self.batches
+        }
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+JSON tabanlı katalog (app.py) için başlangıçta kurulan ters indeks.
+
+Her parfüm, all_perfumes listesindeki konumuyla (int) temsil edilir. Nota,
+marka, aile ve cinsiyet grubu için posting listeleri tutulur; arama bu
+kümelerin kesişimi olarak yapılır ve sonuçlar katalog sırasını korur.
+searchType 'text' isim + açıklama üzerinde BM25 ile skora göre sıralanır.
+"""
+
+import heapq
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.utils.bm25 import BM25Index
+from src.utils.note_registry import note_key, note_registry
+
+NOTE_TYPES = ('top', 'middle', 'base')
+
+# Cinsiyet filtresinin kabul ettiği değerler
+GENDER_BUCKETS = {
+    'women': ('kadın', 'women', 'female'),
+    'men': ('erkek', 'men', 'male'),
+}
+
+
+def normalize_key(value) -> str:
+    """İndeks anahtarını normalize et"""
+    return str(value or '').strip().lower()
+
+
+def iter_note_names(perfume: Dict) -> Iterable[str]:
+    """Parfümün tüm nota isimlerini (top, middle, base) sırayla döndür"""
+    notes = perfume.get('notes') or {}
+    for note_type in NOTE_TYPES:
+        for note in notes.get(note_type, []):
+            yield note.get('name', '') if isinstance(note, dict) else str(note)
+
+
+def brand_name_of(perfume: Dict) -> str:
+    """Marka adını dict ya da string alanından al"""
+    brand = perfume.get('brand')
+    return brand.get('name', '') if isinstance(brand, dict) else str(brand or '')
+
+
+def text_of(perfume: Dict) -> str:
+    """Tam metin aramasında indekslenen metin: isim + açıklama"""
+    return f"{perfume.get('name') or ''} {perfume.get('description') or ''}"
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class PerfumeSearchIndex:
+    """Nota, marka, aile, cinsiyet ve isim trigram'ları için ters indeks"""
+
+    def __init__(self, perfumes: List[Dict]):
+        self.perfumes = perfumes
+        self.positions: Dict[str, int] = {}
+        self.source_name_positions: Dict[Tuple[str, str], int] = {}
+        self.names: List[str] = []
+        # Kanonik nota id'si (note_registry) -> konumlar
+        self.note_index: Dict[int, Set[int]] = defaultdict(set)
+        self.brand_index: Dict[str, Set[int]] = defaultdict(set)
+        self.family_index: Dict[str, Set[int]] = defaultdict(set)
+        self.gender_index: Dict[str, Set[int]] = defaultdict(set)
+        self.name_trigram_index: Dict[str, Set[int]] = defaultdict(set)
+
+        for position, perfume in enumerate(perfumes):
+            self._add(position, perfume)
+
+        self.text_index = BM25Index(text_of(perfume) for perfume in perfumes)
+
+    def _add(self, position: int, perfume: Dict):
+        # Aynı anahtar birden fazla kez geçerse ilk kayıt kazanır
+        self.positions.setdefault(perfume.get('id'), position)
+        self.source_name_positions.setdefault((perfume.get('source'), perfume.get('name')), position)
+
+        name = normalize_key(perfume.get('name'))
+        self.names.append(name)
+        for trigram in _trigrams(name):
+            self.name_trigram_index[trigram].add(position)
+
+        for note_name in iter_note_names(perfume):
+            if note_key(note_name):
+                self.note_index[note_registry.add(note_name)].add(position)
+
+        self.brand_index[normalize_key(brand_name_of(perfume))].add(position)
+        self.family_index[normalize_key(perfume.get('family'))].add(position)
+
+        gender = normalize_key(perfume.get('gender'))
+        for bucket, values in GENDER_BUCKETS.items():
+            if gender in values:
+                self.gender_index[bucket].add(position)
+
+    def __len__(self):
+        return len(self.perfumes)
+
+    def position_of(self, perfume_id: str) -> Optional[int]:
+        """Parfüm id'sinin katalog konumunu döndür"""
+        return self.positions.get(perfume_id)
+
+    def get(self, perfume_id: str) -> Optional[Dict]:
+        """Parfümü id ile O(1) bul"""
+        position = self.positions.get(perfume_id)
+        return self.perfumes[position] if position is not None else None
+
+    def get_by_source_name(self, source: str, name: str) -> Optional[Dict]:
+        """Parfümü (kaynak, isim) ikilisiyle O(1) bul"""
+        position = self.source_name_positions.get((source, name))
+        return self.perfumes[position] if position is not None else None
+
+    @staticmethod
+    def _union_matching(index: Dict[str, Set[int]], terms: Iterable[str]) -> Set[int]:
+        """Anahtarında terimlerden biri geçen tüm posting listelerini birleştir"""
+        terms = list(terms)
+        result = set()
+        for key, postings in index.items():
+            if any(term in key for term in terms):
+                result |= postings
+        return result
+
+    def _note_matching(self, terms: Iterable[str]) -> Set[int]:
+        """Yazımlarından birinde terimlerden biri geçen ya da terimin takma ismi olan notaların parfümleri"""
+        result = set()
+        for term in terms:
+            for note_id in note_registry.matching_ids(term, self.note_index):
+                result |= self.note_index[note_id]
+        return result
+
+    def _name_candidates(self, term: str) -> Set[int]:
+        """İsmi terimi içerebilecek parfümler (trigram ön eleme, doğrulanmamış)"""
+        if len(term) < 3:
+            return {pos for pos, name in enumerate(self.names) if term in name}
+
+        postings = sorted((self.name_trigram_index.get(t, set()) for t in _trigrams(term)), key=len)
+        if not postings or not postings[0]:
+            return set()
+        candidates = set(postings[0])
+        for other in postings[1:]:
+            candidates &= other
+            if not candidates:
+                break
+        return candidates
+
+    def _term_postings(self, search_term: str, search_type: str) -> Set[int]:
+        if search_type == 'name':
+            return self._name_candidates(search_term)
+        if search_type == 'notes':
+            terms = [term.strip() for term in search_term.split(',')]
+            return self._note_matching(terms)
+        if search_type == 'brand':
+            return self._union_matching(self.brand_index, [search_term])
+        if search_type == 'family':
+            return self._union_matching(self.family_index, [search_term])
+        return set()
+
+    def search_positions(self, search_term: str = '', search_type: str = 'name',
+                         gender: str = 'all', family: str = 'all',
+                         selected_notes: Optional[List[str]] = None,
+                         limit: int = 10) -> List[int]:
+        """Filtrelere uyan parfümlerin katalog konumlarını sıralı döndür"""
+        postings: List[Set[int]] = []
+
+        if gender in GENDER_BUCKETS:
+            postings.append(self.gender_index.get(gender, set()))
+
+        if family != 'all':
+            postings.append(self._union_matching(self.family_index, [normalize_key(family)]))
+
+        if selected_notes:
+            selected = set()
+            for note in selected_notes:
+                selected |= self.note_index.get(note_registry.id_of(note), set())
+            postings.append(selected)
+
+        # BM25 büyük/küçük harfi kendi tokenize'ında (Türkçe 'I'/'İ' dahil) çözer
+        if search_term and search_type == 'text':
+            return self._text_positions(search_term, postings, limit)
+
+        search_term = search_term.lower()
+
+        if search_term:
+            postings.append(self._term_postings(search_term, search_type))
+
+        if not postings:
+            return list(range(min(limit, len(self.perfumes))))
+
+        # En küçük posting listesinden başlayarak kesişim al
+        postings.sort(key=len)
+        result = set(postings[0])
+        for other in postings[1:]:
+            if not result:
+                break
+            result &= other
+
+        if search_term and search_type == 'name':
+            # Trigram adaylarını katalog sırasıyla doğrula, limite ulaşınca dur
+            positions = []
+            for pos in sorted(result):
+                if search_term in self.names[pos]:
+                    positions.append(pos)
+                    if len(positions) >= limit:
+                        break
+            return positions
+
+        return heapq.nsmallest(limit, result)
+
+    def _text_positions(self, search_term: str, postings: List[Set[int]], limit: int) -> List[int]:
+        """BM25 skoruna göre sıralı konumlar; diğer filtreler maske olarak uygulanır"""
+        allowed = None
+        if postings:
+            postings.sort(key=len)
+            result = set(postings[0])
+            for other in postings[1:]:
+                result &= other
+            if not result:
+                return []
+            allowed = np.zeros(len(self.perfumes), dtype=bool)
+            allowed[list(result)] = True
+
+        return [position for position, _ in self.text_index.search(search_term, limit, allowed)]
+
+    def search(self, search_term: str = '', search_type: str = 'name',
+               gender: str = 'all', family: str = 'all',
+               selected_notes: Optional[List[str]] = None,
+               limit: int = 10) -> List[Dict]:
+        """Arama yap ve parfüm kayıtlarını döndür"""
+        positions = self.search_positions(search_term, search_type, gender, family, selected_notes, limit)
+        return [self.perfumes[pos] for pos in positions]
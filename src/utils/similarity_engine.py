@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NumPy tabanlı vektörel benzerlik motoru.
+
+Notalar global bir sözlükle sütun numaralarına eşlenir; her katalog,
+satırları parfüm olan paketlenmiş bit matrisine (uint8) dönüşür. Bir lüks
+parfümün tüm alternatiflere karşı Jaccard skoru tek bir AND + popcount
+işlemiyle, çok sayıda parfüm çifti ise bloklar halinde matris çarpımıyla
+hesaplanır. Cinsiyet ve aile eşleşmeleri boolean vektörler olarak uygulanır.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# calculate_similarity_score ile aynı ağırlıklar
+GENDER_WEIGHT = 30
+FAMILY_WEIGHT = 25
+NOTE_WEIGHT = 45
+
+# 0-255 arası her bayt için bit sayısı
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+class NoteVocabulary:
+    """Nota ismi -> sütun numarası eşlemesi"""
+
+    def __init__(self, normalize=None):
+        self.normalize = normalize or (lambda name: name)
+        self.ids: Dict[str, int] = {}
+        self.names: List[str] = []
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, name: str) -> int:
+        key = self.normalize(name)
+        note_id = self.ids.get(key)
+        if note_id is None:
+            note_id = len(self.names)
+            self.ids[key] = note_id
+            self.names.append(key)
+        return note_id
+
+    def encode(self, names: Iterable[str], create: bool = True) -> np.ndarray:
+        """Nota isimlerini sıralı, tekil sütun numaralarına çevir"""
+        if create:
+            ids = {self.add(name) for name in names}
+        else:
+            ids = {self.ids[key] for key in map(self.normalize, names) if key in self.ids}
+        return np.array(sorted(ids), dtype=np.int32)
+
+    def distinct_count(self, names: Iterable[str]) -> int:
+        """Sözlükte olmayanlar dahil farklı nota sayısı"""
+        return len({self.normalize(name) for name in names})
+
+
+class NoteMatrix:
+    """Bir kataloğun nota kümelerini paketlenmiş bit matrisi olarak tutar"""
+
+    def __init__(self, vocabulary: NoteVocabulary, rows: Sequence[np.ndarray]):
+        self.vocabulary = vocabulary
+        self.width = max(1, len(vocabulary))
+        self.sizes = np.array([len(row) for row in rows], dtype=np.int32)
+
+        dense = np.zeros((len(rows), self.width), dtype=bool)
+        for index, row in enumerate(rows):
+            dense[index, row] = True
+        self.bits = np.packbits(dense, axis=1)
+
+    @classmethod
+    def from_note_sets(cls, vocabulary: NoteVocabulary, note_sets: Iterable[Iterable[str]]) -> 'NoteMatrix':
+        rows = [vocabulary.encode(notes) for notes in note_sets]
+        return cls(vocabulary, rows)
+
+    def __len__(self):
+        return len(self.sizes)
+
+    @property
+    def nbytes(self) -> int:
+        return self.bits.nbytes + self.sizes.nbytes
+
+    def pack_query(self, note_ids: np.ndarray) -> np.ndarray:
+        """Sorgu nota numaralarını matrisle aynı genişlikte paketle"""
+        dense = np.zeros(self.bits.shape[1] * 8, dtype=bool)
+        dense[note_ids[note_ids < self.width]] = True
+        return np.packbits(dense)
+
+    def dense(self, rows=slice(None), dtype=np.float32) -> np.ndarray:
+        """Satırları (bir blok) yoğun 0/1 matrise aç"""
+        return np.unpackbits(self.bits[rows], axis=1, count=self.width).astype(dtype)
+
+    def intersection_counts(self, note_ids: np.ndarray) -> np.ndarray:
+        """Sorgu kümesinin her satırla ortak nota sayısı"""
+        query = self.pack_query(note_ids)
+        return _POPCOUNT[self.bits & query].sum(axis=1, dtype=np.int32)
+
+    def jaccard(self, note_ids: np.ndarray, query_size: Optional[int] = None) -> np.ndarray:
+        """Sorgu kümesinin her satırla Jaccard benzerliği (tek vektörel işlem)"""
+        if query_size is None:
+            query_size = len(note_ids)
+        intersection = self.intersection_counts(note_ids)
+        union = self.sizes + query_size - intersection
+        return np.divide(intersection, union, out=np.zeros(len(self), dtype=np.float64), where=union > 0)
+
+
+def pairwise_jaccard(left: NoteMatrix, right: NoteMatrix, left_rows=slice(None),
+                     right_dense: Optional[np.ndarray] = None) -> np.ndarray:
+    """left[left_rows] x right için Jaccard matrisi (blok halinde matris çarpımı)"""
+    left_dense = left.dense(left_rows)
+    if right_dense is None:
+        right_dense = right.dense()
+
+    # Sözlük büyümüş olabilir; sütun sayılarını eşitle
+    width = max(left_dense.shape[1], right_dense.shape[1])
+    if left_dense.shape[1] < width:
+        left_dense = np.pad(left_dense, ((0, 0), (0, width - left_dense.shape[1])))
+    if right_dense.shape[1] < width:
+        right_dense = np.pad(right_dense, ((0, 0), (0, width - right_dense.shape[1])))
+
+    return dense_jaccard(left_dense, left.sizes[left_rows], right_dense, right.sizes)
+
+
+def dense_jaccard(left_dense: np.ndarray, left_sizes: np.ndarray,
+                  right_dense: np.ndarray, right_sizes: np.ndarray) -> np.ndarray:
+    """Aynı genişlikteki iki yoğun 0/1 matris için Jaccard matrisi"""
+    # float32 çarpım tam sayıları kesin verir; bölme float64 yapılır
+    intersection = (left_dense @ right_dense.T).astype(np.float64)
+    union = left_sizes[:, None] + right_sizes[None, :] - intersection
+    return np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+
+
+def gender_match_mask(target: str, genders: np.ndarray) -> np.ndarray:
+    """calculate_similarity_score ile aynı kural: eşit ya da taraflardan biri unisex"""
+    if target == 'unisex':
+        return np.ones(len(genders), dtype=bool)
+    return (genders == target) | (genders == 'unisex')
+
+
+def gender_match_matrix(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """gender_match_mask'in blok hali: left x right boolean matrisi"""
+    return ((left[:, None] == right[None, :])
+            | (left == 'unisex')[:, None]
+            | (right == 'unisex')[None, :])
+
+
+def composite_scores(jaccard: np.ndarray, gender_mask: np.ndarray, family_mask: np.ndarray) -> np.ndarray:
+    """0-100 arası bileşik skor: cinsiyet (30) + aile (25) + nota Jaccard (45)"""
+    scores = GENDER_WEIGHT * gender_mask + FAMILY_WEIGHT * family_mask + NOTE_WEIGHT * jaccard
+    return np.minimum(scores, 100)
+
+
+def block_matches(jaccard: np.ndarray, left_genders: np.ndarray, left_families: np.ndarray,
+                  right_genders: np.ndarray, right_families: np.ndarray,
+                  min_score: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Bir Jaccard bloğundan eşiği geçen (satır, sütun, skor) üçlülerini çıkar"""
+    scores = composite_scores(
+        jaccard,
+        gender_match_matrix(left_genders, right_genders),
+        left_families[:, None] == right_families[None, :]
+    )
+    rows, columns = np.nonzero(scores >= min_score)
+    return rows, columns, scores[rows, columns]
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Toplu benzerlik hesaplama hattı.
+
+1. Lüks ve alternatif parfümler notalarıyla birlikte tek bir JOIN sorgusuyla
+   yüklenir (parfüm başına ek sorgu yoktur).
+2. Skorlar similarity_engine ile bellekte, bloklar halinde vektörel hesaplanır
+   (workers > 1 ise bloklar similarity_shards ile süreç havuzuna dağıtılır).
+3. Sonuçlar toplu INSERT ... ON CONFLICT DO UPDATE ile yazılır.
+
+Artımlı modda her parfümün skoru etkileyen alanlarının özeti similarity_state
+tablosunda tutulur; sadece eklenen, değişen ya da silinen parfümlerin
+satır/sütunları yeniden hesaplanır. Özete SCORING_VERSION ve notaların
+kanonik anahtarları girer: skorlama kuralı ya da takma isim tablosu
+değişince etkilenen parfümler de yeniden hesaplanır.
+"""
+
+import hashlib
+import logging
+import time
+from datetime import datetime
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from src.models.database import (
+    db, Brand, Note, Perfume, PerfumeNote, PerfumeSimilarity, SimilarityState
+)
+from src.utils.note_registry import NoteRegistry, note_registry
+from src.utils.similarity_engine import NoteMatrix, block_matches, pairwise_jaccard
+from src.utils.similarity_shards import Matches, score_sharded, shard_metadata
+
+logger = logging.getLogger(__name__)
+
+MIN_SCORE = 30
+
+# Skorlama kuralı değişince artırılır; eski özetler geçersiz kalır
+# (2: notalar ham isim yerine kanonik nota id'leriyle karşılaştırılır)
+SCORING_VERSION = 2
+
+
+@dataclass
+class CatalogSide:
+    """Bir marka tipine ait parfümlerin skorlama için gereken alanları"""
+    ids: List[int] = field(default_factory=list)
+    genders: List[str] = field(default_factory=list)
+    family_ids: List[int] = field(default_factory=list)
+    prices: List[Optional[Decimal]] = field(default_factory=list)
+    notes: List[List[str]] = field(default_factory=list)
+    content_hashes: List[str] = field(default_factory=list)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def subset(self, positions) -> 'CatalogSide':
+        """Verilen konumlardaki parfümlerden yeni bir taraf oluştur"""
+        return CatalogSide(
+            ids=[self.ids[i] for i in positions],
+            genders=[self.genders[i] for i in positions],
+            family_ids=[self.family_ids[i] for i in positions],
+            prices=[self.prices[i] for i in positions],
+            notes=[self.notes[i] for i in positions],
+            content_hashes=[self.content_hashes[i] for i in positions]
+        )
+
+
+def content_hash(brand_type: str, gender: str, family_id: int, price, notes: List[str]) -> str:
+    """Benzerlik skorunu etkileyen alanların özeti"""
+    # Skor kanonik notalarla hesaplanır: aynı notanın farklı yazımı özeti değiştirmez
+    canonical_notes = sorted({note_registry.canonical_key(note) for note in notes})
+    payload = '\x1f'.join([str(SCORING_VERSION), brand_type, gender or '', str(family_id), str(price),
+                             *canonical_notes])
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def dialect_insert(table):
+    """Veritabanı diyalektine uygun, ON CONFLICT destekli INSERT (yoksa None)"""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert(table)
+
+
+def load_catalog_sides() -> Dict[str, CatalogSide]:
+    """Lüks ve alternatif parfümleri notalarıyla tek sorguda yükle"""
+    query = select(
+        Perfume.id, Brand.type, Perfume.gender, Perfume.family_id, Perfume.price, Note.name
+    ).join(
+        Brand, Perfume.brand_id == Brand.id
+    ).outerjoin(
+        PerfumeNote, PerfumeNote.perfume_id == Perfume.id
+    ).outerjoin(
+        Note, Note.id == PerfumeNote.note_id
+    ).where(
+        Brand.type.in_(['luxury', 'alternative'])
+    ).order_by(Perfume.id)
+
+    sides = {'luxury': CatalogSide(), 'alternative': CatalogSide()}
+    last_id = None
+    for perfume_id, brand_type, gender, family_id, price, note_name in db.session.execute(query):
+        side = sides[brand_type]
+        if perfume_id != last_id:
+            side.ids.append(perfume_id)
+            side.genders.append(gender)
+            # None == None eşleşmesi calculate_similarity_score ile aynı kalsın diye -1
+            side.family_ids.append(family_id if family_id is not None else -1)
+            side.prices.append(price)
+            side.notes.append([])
+            last_id = perfume_id
+        if note_name is not None:
+            side.notes[-1].append(note_name)
+
+    for brand_type, side in sides.items():
+        side.content_hashes = [
+            content_hash(brand_type, side.genders[i], side.family_ids[i], side.prices[i], side.notes[i])
+            for i in range(len(side))
+        ]
+
+    return sides
+
+
+class SimilarityPipeline:
+    """Lüks x alternatif benzerlik matrisini hesaplayıp toplu yazan hat"""
+
+    def __init__(self, block_size: int = 256, batch_size: int = 5000, min_score: float = MIN_SCORE,
+                 workers: int = 1):
+        self.block_size = block_size
+        self.batch_size = batch_size
+        self.min_score = min_score
+        # 1'den büyükse lüks bloklar süreç havuzunda skorlanır (yazıcı tek kalır)
+        self.workers = workers
+
+    def score_matches(self, luxury: CatalogSide, alternative: CatalogSide) -> Iterator[Matches]:
+        """Her lüks blok için (skorlanan çift sayısı, lüks konumları, alternatif konumları, skorlar) üret"""
+        # Kanonik nota id'leri; çalışma başına ayrı sözlük, matris genişliği sabit kalsın
+        vocabulary = NoteRegistry()
+        # Önce tüm notaları sözlüğe ekle ki iki matris aynı genişlikte olsun
+        luxury_rows = [vocabulary.encode(notes) for notes in luxury.notes]
+        alternative_rows = [vocabulary.encode(notes) for notes in alternative.notes]
+        luxury_matrix = NoteMatrix(vocabulary, luxury_rows)
+        alternative_matrix = NoteMatrix(vocabulary, alternative_rows)
+        metadata = shard_metadata(luxury.genders, luxury.family_ids, alternative.genders, alternative.family_ids)
+
+        if self.workers > 1 and len(luxury) > self.block_size:
+            yield from score_sharded(
+                luxury_matrix.dense(), luxury_matrix.sizes,
+                alternative_matrix.dense(), alternative_matrix.sizes,
+                metadata, self.workers, self.block_size, self.min_score
+            )
+            return
+
+        alternative_dense = alternative_matrix.dense()
+        for block_start in range(0, len(luxury), self.block_size):
+            block_end = min(block_start + self.block_size, len(luxury))
+            jaccard_block = pairwise_jaccard(
+                luxury_matrix, alternative_matrix, slice(block_start, block_end), alternative_dense
+            )
+            rows, columns, scores = block_matches(
+                jaccard_block,
+                metadata['luxury_genders'][block_start:block_end],
+                metadata['luxury_families'][block_start:block_end],
+                metadata['alternative_genders'], metadata['alternative_families'],
+                self.min_score
+            )
+            yield (block_end - block_start) * len(alternative), rows + block_start, columns, scores
+
+    def score_blocks(self, luxury: CatalogSide, alternative: CatalogSide) -> Iterator[Tuple[int, List[Dict]]]:
+        """Her lüks blok için (skorlanan çift sayısı, yazılacak satırlar) üret"""
+        for pairs, luxury_positions, alternative_positions, scores in self.score_matches(luxury, alternative):
+            rows = [
+                self._row(luxury, index, alternative, alt_index, score)
+                for index, alt_index, score in zip(
+                    luxury_positions.tolist(), alternative_positions.tolist(), scores.tolist()
+                )
+            ]
+            yield pairs, rows
+
+    @staticmethod
+    def _row(luxury: CatalogSide, index: int, alternative: CatalogSide, alt_index: int, score: float) -> Dict:
+        luxury_price = luxury.prices[index]
+        alternative_price = alternative.prices[alt_index]
+        price_diff = None
+        if luxury_price and alternative_price:
+            price_diff = luxury_price - alternative_price
+
+        return {
+            'luxury_perfume_id': luxury.ids[index],
+            'alternative_perfume_id': alternative.ids[alt_index],
+            'similarity_score': round(score, 2),
+            'gender_match': luxury.genders[index] == alternative.genders[alt_index],
+            'price_difference': price_diff
+        }
+
+    def write(self, rows: List[Dict]):
+        """Satırları INSERT ... ON CONFLICT DO UPDATE ile toplu yaz"""
+        if not rows:
+            return
+
+        table = PerfumeSimilarity.__table__
+        stmt = dialect_insert(table)
+        if stmt is None:
+            db.session.execute(table.insert(), rows)
+        else:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['luxury_perfume_id', 'alternative_perfume_id'],
+                set_={
+                    'similarity_score': stmt.excluded.similarity_score,
+                    'gender_match': stmt.excluded.gender_match,
+                    'price_difference': stmt.excluded.price_difference,
+                    'updated_at': db.func.now()
+                }
+            )
+            db.session.execute(stmt, rows)
+        db.session.commit()
+
+    def run(self, luxury: Optional[CatalogSide] = None, alternative: Optional[CatalogSide] = None) -> Dict:
+        """Hattı çalıştır ve istatistikleri döndür"""
+        start = time.perf_counter()
+        if luxury is None or alternative is None:
+            sides = load_catalog_sides()
+            luxury = sides['luxury'] if luxury is None else luxury
+            alternative = sides['alternative'] if alternative is None else alternative
+        load_seconds = time.perf_counter() - start
+
+        total_pairs = len(luxury) * len(alternative)
+        logger.info(
+            f"Benzerlik hattı: {len(luxury)} lüks x {len(alternative)} alternatif = {total_pairs} çift "
+            f"({self.workers} süreç)"
+        )
+
+        pairs_scored = 0
+        rows_written = 0
+        pending: List[Dict] = []
+        for pairs, rows in self.score_blocks(luxury, alternative):
+            pairs_scored += pairs
+            pending.extend(rows)
+            if len(pending) >= self.batch_size:
+                self.write(pending)
+                rows_written += len(pending)
+                pending = []
+
+            elapsed = time.perf_counter() - start
+            logger.info(
+                f"{pairs_scored}/{total_pairs} çift skorlandı, {rows_written} kayıt yazıldı "
+                f"({pairs_scored / elapsed:,.0f} çift/sn)"
+            )
+
+        self.write(pending)
+        rows_written += len(pending)
+
+        elapsed = time.perf_counter() - start
+        stats = {
+            'luxury_perfumes': len(luxury),
+            'alternative_perfumes': len(alternative),
+            'pairs_scored': pairs_scored,
+            'rows_written': rows_written,
+            'load_seconds': round(load_seconds, 3),
+            'elapsed_seconds': round(elapsed, 3),
+            'pairs_per_second': round(pairs_scored / elapsed) if elapsed else 0,
+            'workers': self.workers
+        }
+        logger.info(f"Benzerlik hattı tamamlandı: {stats}")
+        return stats
+
+    def save_states(self, sides: Dict[str, CatalogSide], perfume_ids=None):
+        """similarity_state tablosunu güncel özetlerle güncelle"""
+        now = datetime.utcnow()
+        rows = [
+            {'perfume_id': side.ids[i], 'brand_type': brand_type,
+             'content_hash': side.content_hashes[i], 'computed_at': now}
+            for brand_type, side in sides.items()
+            for i in range(len(side))
+            if perfume_ids is None or side.ids[i] in perfume_ids
+        ]
+        if not rows:
+            return
+
+        table = SimilarityState.__table__
+        stmt = dialect_insert(table)
+        if stmt is None:
+            db.session.query(SimilarityState).filter(
+                SimilarityState.perfume_id.in_([row['perfume_id'] for row in rows])
+            ).delete(synchronize_session=False)
+            db.session.execute(table.insert(), rows)
+        else:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['perfume_id'],
+                set_={
+                    'brand_type': stmt.excluded.brand_type,
+                    'content_hash': stmt.excluded.content_hash,
+                    'computed_at': stmt.excluded.computed_at
+                }
+            )
+            db.session.execute(stmt, rows)
+        db.session.commit()
+
+    def run_full(self) -> Dict:
+        """Tüm benzerlik tablosunu silip baştan hesapla"""
+        logger.info("Tam benzerlik yeniden hesaplaması başlatılıyor...")
+        deleted = PerfumeSimilarity.query.delete(synchronize_session=False)
+        SimilarityState.query.delete(synchronize_session=False)
+        db.session.commit()
+
+        sides = load_catalog_sides()
+        stats = self.run(sides['luxury'], sides['alternative'])
+        self.save_states(sides)
+
+        stats.update({
+            'mode': 'full',
+            'rows_deleted': deleted,
+            'pairs_recomputed': stats['pairs_scored'],
+            'pairs_skipped': 0
+        })
+        return stats
+
+    def run_incremental(self) -> Dict:
+        """Sadece eklenen, değişen veya silinen parfümlerin çiftlerini yeniden hesapla"""
+        start = time.perf_counter()
+        sides = load_catalog_sides()
+        luxury, alternative = sides['luxury'], sides['alternative']
+
+        previous = {
+            perfume_id: (brand_type, digest)
+            for perfume_id, brand_type, digest in db.session.query(
+                SimilarityState.perfume_id, SimilarityState.brand_type, SimilarityState.content_hash
+            )
+        }
+
+        def changed_positions(brand_type: str, side: CatalogSide) -> List[int]:
+            return [
+                i for i in range(len(side))
+                if previous.get(side.ids[i]) != (brand_type, side.content_hashes[i])
+            ]
+
+        changed_luxury = changed_positions('luxury', luxury)
+        changed_alternative = changed_positions('alternative', alternative)
+        current_ids = set(luxury.ids) | set(alternative.ids)
+        removed_ids = [perfume_id for perfume_id in previous if perfume_id not in current_ids]
+
+        changed_luxury_ids = [luxury.ids[i] for i in changed_luxury]
+        changed_alternative_ids = [alternative.ids[i] for i in changed_alternative]
+        logger.info(
+            f"Artımlı benzerlik: {len(changed_luxury)} lüks, {len(changed_alternative)} alternatif "
+            f"değişmiş; {len(removed_ids)} parfüm kaldırılmış"
+        )
+
+        # Değişen/silinen parfümlerin eski satırlarını temizle (skor eşiğin altına düşmüş
+        # ya da marka tipi değişmiş olabilir)
+        deleted = 0
+        stale_ids = changed_luxury_ids + changed_alternative_ids + removed_ids
+        for chunk_start in range(0, len(stale_ids), 1000):
+            chunk = stale_ids[chunk_start:chunk_start + 1000]
+            deleted += PerfumeSimilarity.query.filter(db.or_(
+                PerfumeSimilarity.luxury_perfume_id.in_(chunk),
+                PerfumeSimilarity.alternative_perfume_id.in_(chunk)
+            )).delete(synchronize_session=False)
+        if removed_ids:
+            SimilarityState.query.filter(
+                SimilarityState.perfume_id.in_(removed_ids)
+            ).delete(synchronize_session=False)
+        db.session.commit()
+
+        # Değişen lüks satırları x tüm alternatifler + değişmeyen lüks x değişen alternatif sütunları
+        changed_luxury_set = set(changed_luxury)
+        unchanged_luxury = [i for i in range(len(luxury)) if i not in changed_luxury_set]
+        rows_written = 0
+        pairs_recomputed = 0
+        if changed_luxury and len(alternative):
+            stats = self.run(luxury.subset(changed_luxury), alternative)
+            rows_written += stats['rows_written']
+            pairs_recomputed += stats['pairs_scored']
+        if unchanged_luxury and changed_alternative:
+            stats = self.run(luxury.subset(unchanged_luxury), alternative.subset(changed_alternative))
+            rows_written += stats['rows_written']
+            pairs_recomputed += stats['pairs_scored']
+
+        self.save_states(sides, set(changed_luxury_ids) | set(changed_alternative_ids))
+
+        elapsed = time.perf_counter() - start
+        total_pairs = len(luxury) * len(alternative)
+        result = {
+            'mode': 'incremental',
+            'luxury_perfumes': len(luxury),
+            'alternative_perfumes': len(alternative),
+            'changed_luxury': len(changed_luxury),
+            'changed_alternative': len(changed_alternative),
+            'removed_perfumes': len(removed_ids),
+            'rows_deleted': deleted,
+            'rows_written': rows_written,
+            'pairs_recomputed': pairs_recomputed,
+            'pairs_skipped': total_pairs - pairs_recomputed,
+            'elapsed_seconds': round(elapsed, 3),
+            'pairs_per_second': round(pairs_recomputed / elapsed) if elapsed else 0
+        }
+        logger.info(f"Artımlı benzerlik tamamlandı: {result}")
+        return result
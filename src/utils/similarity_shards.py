@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Çok süreçli (sharded) benzerlik skorlama.
+
+Lüks parfümler bloklara bölünüp bir süreç havuzuna dağıtılır. Lüks ve
+alternatif nota matrisleri bir kez multiprocessing.shared_memory'ye kopyalanır;
+görevler sadece blok sınırlarını taşır, matrisler görev başına pickle edilmez.
+Süreçler eşleşmeleri de kompakt NumPy dizileri halinde blok başına bir
+paylaşılan bellek segmentine yazar (milyonlarca eşleşmeyi pipe üzerinden
+pickle etmek skorlamanın kendisi kadar sürer); veritabanına yazma işi tek
+yazıcıda (ana süreçte) kalır.
+"""
+
+import multiprocessing
+from multiprocessing import shared_memory
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from src.utils.similarity_engine import block_matches, dense_jaccard
+
+# (skorlanan çift sayısı, lüks konumları, alternatif konumları, skorlar)
+Matches = Tuple[int, np.ndarray, np.ndarray, np.ndarray]
+
+# Her süreçte initializer ile bir kez doldurulur
+_worker: Dict = {}
+
+
+class SharedArray:
+    """Paylaşılan bellekte duran bir NumPy dizisi"""
+
+    def __init__(self, shm: shared_memory.SharedMemory, shape: Tuple[int, ...], dtype: str):
+        self.shm = shm
+        self.array = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+    @classmethod
+    def empty(cls, shape: Tuple[int, ...], dtype) -> 'SharedArray':
+        dtype = np.dtype(dtype)
+        nbytes = int(np.prod(shape)) * dtype.itemsize
+        shm = shared_memory.SharedMemory(create=True, size=max(1, nbytes))
+        return cls(shm, shape, dtype.str)
+
+    @classmethod
+    def create(cls, array: np.ndarray) -> 'SharedArray':
+        shared = cls.empty(array.shape, array.dtype)
+        shared.array[...] = array
+        return shared
+
+    @classmethod
+    def attach(cls, spec: Tuple[str, Tuple[int, ...], str]) -> 'SharedArray':
+        name, shape, dtype = spec
+        return cls(shared_memory.SharedMemory(name=name), shape, dtype)
+
+    @property
+    def spec(self) -> Tuple[str, Tuple[int, ...], str]:
+        """Başka süreçte attach için gereken (isim, boyut, tip)"""
+        return self.shm.name, self.array.shape, self.array.dtype.str
+
+    def close(self):
+        self.array = None
+        self.shm.close()
+
+    def unlink(self):
+        self.close()
+        self.shm.unlink()
+
+
+def _init_worker(specs: Dict[str, Tuple], metadata: Dict[str, np.ndarray], min_score: float):
+    """Paylaşılan matrislere bağlan; küçük metadata süreç başına bir kez gelir"""
+    _worker['shared'] = {key: SharedArray.attach(spec) for key, spec in specs.items()}
+    _worker['metadata'] = metadata
+    _worker['min_score'] = min_score
+
+
+def _score_shard(bounds: Tuple[int, int]) -> Tuple[int, Tuple, int]:
+    start, end = bounds
+    shared = _worker['shared']
+    metadata = _worker['metadata']
+
+    jaccard = dense_jaccard(
+        shared['luxury_dense'].array[start:end], shared['luxury_sizes'].array[start:end],
+        shared['alternative_dense'].array, shared['alternative_sizes'].array
+    )
+    rows, columns, scores = block_matches(
+        jaccard,
+        metadata['luxury_genders'][start:end], metadata['luxury_families'][start:end],
+        metadata['alternative_genders'], metadata['alternative_families'],
+        _worker['min_score']
+    )
+
+    # [lüks konumları | alternatif konumları | skorlar] tek segmentte
+    count = len(scores)
+    output = SharedArray.empty((count * 16,), np.uint8)
+    output.array[:count * 4].view(np.int32)[:] = rows + start
+    output.array[count * 4:count * 8].view(np.int32)[:] = columns
+    output.array[count * 8:].view(np.float64)[:] = scores
+    spec = output.spec
+    output.close()
+    return (end - start) * jaccard.shape[1], spec, count
+
+
+def _collect(spec: Tuple, count: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Süreç çıktısını kopyalayıp segmenti serbest bırak"""
+    output = SharedArray.attach(spec)
+    try:
+        data = output.array
+        return (data[:count * 4].view(np.int32).copy(),
+                data[count * 4:count * 8].view(np.int32).copy(),
+                data[count * 8:].view(np.float64).copy())
+    finally:
+        output.unlink()
+
+
+def score_sharded(luxury_dense: np.ndarray, luxury_sizes: np.ndarray,
+                  alternative_dense: np.ndarray, alternative_sizes: np.ndarray,
+                  metadata: Dict[str, np.ndarray], workers: int, block_size: int,
+                  min_score: float) -> Iterator[Matches]:
+    """Lüks satırlarını süreç havuzunda bloklar halinde skorla
+
+    Sonuçlar tamamlanma sırasıyla üretilir; lüks konumları global indekstir.
+    """
+    shared: Dict[str, SharedArray] = {}
+    try:
+        for key, array in (('luxury_dense', luxury_dense), ('luxury_sizes', luxury_sizes),
+                           ('alternative_dense', alternative_dense),
+                           ('alternative_sizes', alternative_sizes)):
+            shared[key] = SharedArray.create(np.ascontiguousarray(array))
+
+        shards: List[Tuple[int, int]] = [
+            (start, min(start + block_size, len(luxury_sizes)))
+            for start in range(0, len(luxury_sizes), block_size)
+        ]
+        specs = {key: array.spec for key, array in shared.items()}
+
+        with multiprocessing.Pool(workers, initializer=_init_worker,
+                                  initargs=(specs, metadata, min_score)) as pool:
+            for pairs, spec, count in pool.imap_unordered(_score_shard, shards):
+                yield (pairs, *_collect(spec, count))
+    finally:
+        for array in shared.values():
+            array.unlink()
+
+
+def default_workers() -> int:
+    return multiprocessing.cpu_count() or 1
+
+
+def shard_metadata(luxury_genders: Sequence[str], luxury_families: Sequence[int],
+                   alternative_genders: Sequence[str], alternative_families: Sequence[int]) -> Dict[str, np.ndarray]:
+    """Skorlama için gereken küçük, satır başına alanlar"""
+    return {
+        'luxury_genders': np.array(luxury_genders),
+        'luxury_families': np.array(luxury_families),
+        'alternative_genders': np.array(alternative_genders),
+        'alternative_families': np.array(alternative_families)
+    }
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+pg_trgm uyumlu trigram benzerliği (saf Python).
+
+PostgreSQL dışındaki veritabanlarında (SQLite test kurulumları) bulanık isim
+aramasının aynı sıralamayı vermesi için pg_trgm'in similarity() ve
+word_similarity() fonksiyonlarını taklit eder: metin küçük harfe çevrilir,
+alfanümerik olmayan karakterlerden kelimelere bölünür ve her kelime başta iki,
+sonda bir boşlukla doldurularak trigram'lara ayrılır.
+"""
+
+import re
+from functools import lru_cache
+from typing import List, Set
+
+_WORD_RE = re.compile(r'[^\W_]+')
+
+
+@lru_cache(maxsize=4096)
+def trigram_sequence(text: str) -> tuple:
+    """Metnin trigram'ları, metindeki sırasıyla"""
+    sequence: List[str] = []
+    for word in _WORD_RE.findall((text or '').lower()):
+        padded = f"  {word} "
+        sequence.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+    return tuple(sequence)
+
+
+def trigrams(text: str) -> Set[str]:
+    return set(trigram_sequence(text))
+
+
+def similarity(left: str, right: str) -> float:
+    """pg_trgm similarity(): trigram kümelerinin Jaccard oranı"""
+    left_set, right_set = trigrams(left), trigrams(right)
+    if not left_set or not right_set:
+        return 0.0
+    common = len(left_set & right_set)
+    return common / (len(left_set) + len(right_set) - common)
+
+
+def word_similarity(query: str, text: str) -> float:
+    """pg_trgm word_similarity(): sorgunun, metindeki en benzer ardışık trigram aralığına benzerliği"""
+    query_set = trigrams(query)
+    sequence = trigram_sequence(text)
+    if not query_set or not sequence:
+        return 0.0
+
+    best = 0.0
+    for start in range(len(sequence)):
+        # Aralık sorguyla ortak bir trigram'la başlamalı
+        if sequence[start] not in query_set:
+            continue
+        extent: Set[str] = set()
+        common = 0
+        for trigram in sequence[start:]:
+            if trigram not in extent:
+                extent.add(trigram)
+                if trigram in query_set:
+                    common += 1
+                    best = max(best, common / (len(query_set) + len(extent) - common))
+        if best == 1.0:
+            break
+    return best
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Alternatif Bulma Testi
+app.py /api/find-alternatives endpoint'inin (paketlenmiş bit matrisi,
+catalog_matrix) her lüks parfüm için eski kaba kuvvet taramayla aynı
+alternatifleri aynı sırada ve aynı skorlarla döndürdüğünü ve boş / sadece
+boşluktan oluşan nota isimlerinin nota sözlüğüne ve matrise girmediğini
+doğrular.
+
+Kullanım:
+    python -m pytest test_app_alternatives.py
+    python test_app_alternatives.py
+"""
+
+import copy
+
+import app as perfumatch_app
+from benchmark_alternatives import legacy_find_alternatives, synthetic_catalog
+
+
+def load_catalog(size=900):
+    perfumes, raw = synthetic_catalog(size, seed=3)
+    # Notasız ve büyük harfli cinsiyetli kayıtlar
+    perfumes[5]['notes'] = {'top': [], 'middle': [], 'base': []}
+    perfumes[7]['gender'] = 'Men'
+    perfumatch_app.all_perfumes[:] = perfumes
+    perfumatch_app.build_indexes()
+    return perfumes, raw
+
+
+def test_find_alternatives_matches_brute_force():
+    perfumes, raw = load_catalog()
+    client = perfumatch_app.app.test_client()
+
+    for luxury_perfume in perfumatch_app.LUXURY_PERFUMES:
+        for min_similarity in (0.0, 0.05, 0.2):
+            for max_results in (10, 1000):
+                expected, _ = legacy_find_alternatives(luxury_perfume, perfumes, raw, min_similarity, max_results)
+                response = client.post('/api/find-alternatives', json={
+                    'luxury_perfume_id': luxury_perfume['id'],
+                    'min_similarity': min_similarity,
+                    'max_results': max_results
+                })
+                alternatives = response.get_json()['alternatives']
+                case = (luxury_perfume['name'], min_similarity, max_results)
+                assert [p['id'] for p in alternatives] == [p['id'] for p in expected], case
+                assert all(abs(a['similarity_score'] - e['similarity_score']) < 1e-9
+                           and a['product_url'] == e['product_url'] for a, e in zip(alternatives, expected)), case
+
+
+def test_blank_note_names_are_skipped():
+    clean, _ = synthetic_catalog(60, seed=5)
+    perfumatch_app.all_perfumes[:] = clean
+    perfumatch_app.build_indexes()
+    vocabulary_size = len(perfumatch_app.note_vocabulary.names)
+    expected = perfumatch_app.catalog_matrix.sizes.tolist()
+
+    # Aynı katalog, araya boş ve sadece boşluk olan nota isimleri eklenmiş
+    blank = copy.deepcopy(clean)
+    for perfume in blank[::3]:
+        perfume['notes']['top'] += [{'name': ''}, {'name': '   '}]
+    blank.append({'id': 'zara_bos', 'name': 'BOŞ', 'notes': {'top': [{'name': ' '}]}, 'gender': 'unisex',
+                  'source': 'zara', 'product_url': ''})
+    perfumatch_app.all_perfumes[:] = blank
+    perfumatch_app.build_indexes()
+
+    assert len(perfumatch_app.note_vocabulary.names) == vocabulary_size
+    assert perfumatch_app.catalog_matrix.sizes.tolist() == expected + [0]
+    assert perfumatch_app.catalog_matrix.sizes.tolist() == [
+        len(set(perfumatch_app.note_vectors.decode(bitset))) for bitset in perfumatch_app.note_vectors.bitsets]
+
+    response = perfumatch_app.app.test_client().post('/api/find-alternatives', json={
+        'luxury_perfume_id': 5, 'min_similarity': 0.0, 'max_results': 1000})
+    assert 'zara_bos' not in [p['id'] for p in response.get_json()['alternatives']]
+
+
+if __name__ == '__main__':
+    for test in (test_find_alternatives_matches_brute_force, test_blank_note_names_are_skipped):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
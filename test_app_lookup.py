@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+JSON Katalog ID Çözümleme Testi
+app.py'deki id haritasının eski doğrusal taramayla aynı kaydı bulduğunu
+(tekrarlanan id'lerde ilk kayıt kazanır), detay / alternatif
+endpoint'lerinin bilinmeyen id için 404 döndürdüğünü ve resolve_product_url'in
+ham JSON listelerini tarayan eski yöntemle aynı URL'i verdiğini doğrular.
+
+Kullanım:
+    python -m pytest test_app_lookup.py
+    python test_app_lookup.py
+"""
+
+import app as perfumatch_app
+from benchmark_alternatives import legacy_product_url
+from benchmark_lookup import legacy_find
+
+SOURCES = ['bargello', 'muscent', 'zara']
+
+
+def synthetic_catalog(size=90):
+    perfumes = []
+    for i in range(size):
+        source = SOURCES[i % 3]
+        perfumes.append({
+            # Her onuncu kayıt bir önceki id'yi tekrarlar
+            'id': f"{source}_{i - 1 if i % 10 == 9 else i}",
+            'name': f"{source.upper()} {i % 30}",
+            'brand': {'name': source.title()},
+            'notes': {'top': [{'name': f'Nota {i % 7}'}], 'base': [{'name': f'Nota {i % 5}'}]},
+            'gender': 'unisex',
+            'source': source,
+            'product_url': f"https://example.com/{source}/{i}"
+        })
+    return perfumes
+
+
+def test_id_map_matches_linear_scan():
+    perfumatch_app.all_perfumes[:] = synthetic_catalog()
+    perfumatch_app.build_indexes()
+    client = perfumatch_app.app.test_client()
+
+    for perfume in perfumatch_app.all_perfumes:
+        expected = legacy_find(perfumatch_app.all_perfumes, perfume['id'])
+        assert perfumatch_app.search_index.get(perfume['id']) is expected
+        response = client.get(f"/api/perfume/{perfume['id']}")
+        assert response.status_code == 200
+        assert response.get_json()['product_url'] == expected['product_url']
+
+    assert perfumatch_app.search_index.get('bargello_9999') is None
+    for url in ('/api/perfume/bargello_9999', '/api/perfume/bargello_9999/alternatives',
+                '/api/alternative-perfume/bargello_9999'):
+        assert client.get(url).status_code == 404, url
+
+
+def raw_lists(perfumes):
+    """Kayıtların kaynak JSON'larındaki ham halleri"""
+    raw = {source: [] for source in SOURCES}
+    for perfume in perfumes:
+        if perfume['source'] == 'bargello':
+            raw['bargello'].append({'isim': perfume['name'], 'link': perfume['product_url']})
+        else:
+            raw[perfume['source']].append({'name': perfume['name'], 'url': perfume['product_url']})
+    return raw
+
+
+def test_product_url_matches_raw_scan():
+    perfumatch_app.all_perfumes[:] = synthetic_catalog()
+    perfumatch_app.build_indexes()
+    client = perfumatch_app.app.test_client()
+    raw = raw_lists(perfumatch_app.all_perfumes)
+
+    for perfume in perfumatch_app.all_perfumes:
+        # Aynı (kaynak, isim) birden fazla kez geçer: ilk kaydın URL'i
+        expected = legacy_product_url(perfume, raw)
+        assert perfumatch_app.resolve_product_url(perfume) == expected
+        if perfumatch_app.search_index.get(perfume['id']) is perfume:
+            response = client.get(f"/api/alternative-perfume/{perfume['id']}")
+            assert response.get_json()['perfume']['product_url'] == expected
+
+    # Paylaşılan katalog kaydı değiştirilmez
+    assert perfumatch_app.all_perfumes[30]['product_url'] == 'https://example.com/bargello/30'
+
+    # Katalogda olmayan kayıt kendi URL'ine düşer
+    stranger = {'source': 'zara', 'name': 'KATALOGDA YOK', 'product_url': 'https://example.com/yok'}
+    assert perfumatch_app.resolve_product_url(stranger) == legacy_product_url(stranger, raw) == stranger['product_url']
+
+
+if __name__ == '__main__':
+    for test in (test_id_map_matches_linear_scan, test_product_url_matches_raw_scan):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+JSON Katalog Arama Testi
+app.py'nin /api/perfume/search endpoint'inin (ters indeks) her searchType
+için ve cinsiyet / aile / seçili nota filtreleriyle eski doğrusal taramayla
+aynı sonuçları aynı sırada döndürdüğünü doğrular. Sentetik katalog kullanılır.
+
+Kullanım:
+    python -m pytest test_app_search.py
+    python test_app_search.py
+"""
+
+import random
+
+import app as perfumatch_app
+from benchmark_search import legacy_search
+
+NOTES = [f'Nota {i}' for i in range(25)]
+BRANDS = ['Bargello', 'Zara', 'Muscent']
+FAMILIES = ['Oriental', 'Odunsu Oriental', 'Çiçeksi', '']
+GENDERS = ['men', 'women', 'unisex', 'Erkek', 'Kadın', 'female']
+
+QUERIES = [
+    {'searchTerm': '', 'searchType': 'name'},
+    {'searchTerm': 'edp', 'searchType': 'name'},
+    {'searchTerm': 'ZARA 1', 'searchType': 'name'},
+    {'searchTerm': 'ed', 'searchType': 'name', 'gender': 'women'},
+    {'searchTerm': 'yok böyle', 'searchType': 'name'},
+    {'searchTerm': 'nota 1', 'searchType': 'notes'},
+    {'searchTerm': 'nota 3, nota 24', 'searchType': 'notes', 'gender': 'men'},
+    {'searchTerm': 'muscent', 'searchType': 'brand'},
+    {'searchTerm': 'ar', 'searchType': 'brand', 'family': 'oriental'},
+    {'searchTerm': 'oriental', 'searchType': 'family'},
+    {'searchTerm': 'çiçek', 'searchType': 'family', 'selectedNotes': ['Nota 2', 'nota 7']},
+    {'searchTerm': '', 'searchType': 'notes', 'gender': 'women', 'family': 'Odunsu'},
+]
+
+
+def synthetic_catalog(size=400, seed=11):
+    rng = random.Random(seed)
+    perfumes = []
+    for i in range(size):
+        brand = rng.choice(BRANDS)
+        notes = rng.sample(NOTES, rng.randint(0, 7))
+        perfumes.append({
+            'id': f"{brand.lower()}_{i}",
+            'name': f"{brand.upper()} {i} {rng.choice(['EDP', 'EDT', 'Parfum'])}",
+            'brand': {'name': brand},
+            'notes': {
+                'top': [{'name': n} for n in notes[:2]],
+                'middle': [{'name': n} for n in notes[2:4]],
+                'base': [{'name': n} for n in notes[4:]]
+            },
+            'gender': rng.choice(GENDERS),
+            'family': rng.choice(FAMILIES),
+            'source': brand.lower(),
+        })
+    return perfumes
+
+
+def test_search_matches_legacy_scan():
+    perfumatch_app.all_perfumes[:] = synthetic_catalog()
+    perfumatch_app.build_indexes()
+    client = perfumatch_app.app.test_client()
+
+    for query in QUERIES:
+        for limit in (5, 1000):
+            payload = dict(query, limit=limit)
+            response = client.post('/api/perfume/search', json=payload)
+            assert response.status_code == 200
+
+            # Eski endpoint searchTerm'ü taramadan önce küçük harfe çeviriyordu
+            expected = legacy_search(
+                perfumatch_app.all_perfumes, query['searchTerm'].lower(), query['searchType'],
+                query.get('gender', 'all'), query.get('family', 'all'), query.get('selectedNotes'), limit
+            )
+            ids = [perfume['id'] for perfume in response.get_json()['results']]
+            assert ids == [perfume['id'] for perfume in expected], payload
+
+
+if __name__ == '__main__':
+    for test in (test_search_matches_legacy_scan,):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
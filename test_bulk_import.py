@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Toplu İçe Aktarma Testi
+DataImporter(bulk=True) modunun satır satır içe aktarmayla aynı parfüm,
+nota ve parfüm-nota kayıtlarını ürettiğini, var olan parfümleri atladığını
+ve kayıt sayısından bağımsız az sayıda SQL ifadesi çalıştırdığını doğrular.
+Bellekte SQLite kullanır.
+
+Kullanım:
+    python -m pytest test_bulk_import.py
+    python test_bulk_import.py
+"""
+
+import json
+import os
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+import server
+from src.models.database import db, Perfume
+from src.utils.data_importer import DataImporter
+from test_query_count import count_queries
+
+
+def load(file_path, count):
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)[:count]
+
+
+BARGELLO = load('bargello_parfumler.json', 80)
+MUSCENT = load('muscent_parfumler.json', 120)
+
+
+def import_snapshot(bulk, batch_size=None):
+    """Veritabanını sıfırla, örnek veriyi içe aktar ve karşılaştırılabilir bir görüntü döndür"""
+    with server.app.app_context():
+        db.drop_all()
+        db.create_all()
+        importer = DataImporter(bulk=bulk)
+        for source, data, build_record in (('Bargello', BARGELLO, importer.bargello_record),
+                                           ('Muscent', MUSCENT, importer.muscent_record)):
+            brand = importer.get_or_create_brand(source, 'alternative')
+            if batch_size:
+                # Üreteçten küçük gruplar halinde
+                importer.bulk_import_items(source, brand, iter(data), build_record, batch_size=batch_size)
+            else:
+                importer.import_items(source, brand, data, build_record)
+
+        return sorted(
+            (p.brand.name, p.name, p.gender, str(p.price), p.stock_status, str(p.rating), p.description,
+             tuple(sorted((pn.note.name, pn.note.type, pn.note.category) for pn in p.notes)))
+            for p in Perfume.query.all()
+        )
+
+
+def test_bulk_matches_row_by_row():
+    rows = import_snapshot(bulk=False)
+    bulk = import_snapshot(bulk=True)
+    assert len(bulk) > 150
+    assert any(notes for *_, notes in bulk)
+    assert bulk == rows
+    assert import_snapshot(bulk=True, batch_size=7) == rows
+
+
+def test_bulk_skips_existing_and_uses_few_statements():
+    import_snapshot(bulk=True)
+    with server.app.app_context():
+        before = Perfume.query.count()
+        importer = DataImporter(bulk=True)
+        brand = importer.get_or_create_brand('Muscent', 'alternative')
+        with count_queries() as statements:
+            imported = importer.import_items('Muscent', brand, MUSCENT, importer.muscent_record)
+        assert imported == 0
+        assert Perfume.query.count() == before
+        # Mevcut isimler + nota isimleri; yazılacak satır yok
+        assert len(statements) <= 3, f"{len(statements)} ifade"
+
+
+if __name__ == '__main__':
+    for test in (test_bulk_matches_row_by_row, test_bulk_skips_existing_and_uses_few_statements):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
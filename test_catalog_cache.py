@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Katalog Önbelleği Testi
+/api/brands, /api/families, /api/notes ve /api/luxury-perfumes yanıtlarının
+ETag ile önbellekten döndüğünü, If-None-Match eşleşince 304 verildiğini ve
+nesil sayacı artınca yeniden üretildiğini doğrular. Bellekte SQLite kullanır.
+
+Kullanım:
+    python -m pytest test_catalog_cache.py
+    python test_catalog_cache.py
+"""
+
+import os
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+import server
+from src.models.database import db, Brand
+from src.utils.catalog_cache import catalog_cache
+from test_query_count import client, count_queries, populate
+
+ENDPOINTS = ('/api/brands', '/api/families', '/api/notes', '/api/notes?type=top',
+             '/api/luxury-perfumes', '/api/luxury-perfumes?limit=3')
+
+
+def test_repeated_requests_are_served_from_cache():
+    populate()
+    for url in ENDPOINTS:
+        first = client.get(url)
+        assert first.status_code == 200, url
+        assert first.headers['ETag']
+        with count_queries() as statements:
+            second = client.get(url)
+        assert statements == [], f"{url}: {len(statements)} sorgu"
+        assert second.get_data() == first.get_data()
+        assert second.headers['ETag'] == first.headers['ETag']
+
+
+def test_query_arguments_are_part_of_the_key():
+    populate()
+    assert len(client.get('/api/luxury-perfumes?limit=3').get_json()['perfumes']) == 3
+    assert len(client.get('/api/luxury-perfumes?limit=5').get_json()['perfumes']) == 5
+    top = client.get('/api/notes?type=top').get_json()
+    assert top and all(note['type'] == 'top' for note in top)
+    assert len(client.get('/api/notes').get_json()) > len(top)
+
+
+def test_if_none_match_returns_304():
+    populate()
+    etag = client.get('/api/brands').headers['ETag']
+    response = client.get('/api/brands', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.get_data() == b''
+    assert client.get('/api/brands', headers={'If-None-Match': '"baska"'}).status_code == 200
+
+
+def test_generation_bump_invalidates():
+    populate()
+    before = client.get('/api/brands')
+    with server.app.app_context():
+        db.session.add(Brand(name='Yeni Marka', type='alternative'))
+        db.session.commit()
+
+    # Sayaç artmadan eski liste döner
+    assert client.get('/api/brands').get_data() == before.get_data()
+
+    generation = catalog_cache.generation
+    catalog_cache.bump()
+    assert catalog_cache.generation == generation + 1
+
+    after = client.get('/api/brands')
+    assert 'Yeni Marka' in [brand['name'] for brand in after.get_json()]
+    assert after.headers['ETag'] != before.headers['ETag']
+    stale = client.get('/api/brands', headers={'If-None-Match': before.headers['ETag']})
+    assert stale.status_code == 200
+
+
+if __name__ == '__main__':
+    for test in (test_repeated_requests_are_served_from_cache, test_query_arguments_are_part_of_the_key,
+                 test_if_none_match_returns_304, test_generation_bump_invalidates):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Veritabanı Havuzu Testi
+DB_* ortam değişkenlerinden motor seçeneklerinin üretildiğini ve
+TimedQueuePool'un bağlantı bekleme sürelerini ve zaman aşımlarını
+ölçtüğünü doğrular. PostgreSQL gerekmez.
+
+Kullanım:
+    python -m pytest test_db_pool.py
+    python test_db_pool.py
+"""
+
+import os
+import tempfile
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+import server
+from src.models.database import db
+from src.utils.db_pool import TimedQueuePool, _begin_read_only, engine_options
+from src.utils.health import pool_status
+
+
+def test_engine_options_from_env():
+    options = engine_options('postgresql://u:p@localhost/perfumatch_db', {
+        'DB_POOL_SIZE': '4', 'DB_MAX_OVERFLOW': '2', 'DB_POOL_PRE_PING': 'false',
+        'DB_STATEMENT_TIMEOUT_MS': '2500'
+    })
+    assert options['poolclass'] is TimedQueuePool
+    assert (options['pool_size'], options['max_overflow'], options['pool_pre_ping']) == (4, 2, False)
+    assert options['pool_recycle'] == 1800
+    assert options['connect_args'] == {'options': '-c statement_timeout=2500'}
+
+    assert 'connect_args' not in engine_options('postgresql://u:p@localhost/db', {'DB_STATEMENT_TIMEOUT_MS': '0'})
+    assert 'connect_args' not in engine_options('sqlite:////tmp/perfumatch.db', {})
+    # Bellek içi SQLite'a havuz ayarı verilmez
+    assert engine_options('sqlite://', {}) == {}
+
+
+def test_checkout_wait_and_timeouts_are_measured():
+    path = os.path.join(tempfile.mkdtemp(), 'pool.db')
+    options = engine_options(f'sqlite:///{path}', {'DB_POOL_SIZE': '1', 'DB_MAX_OVERFLOW': '0'})
+    options['pool_timeout'] = 0.05
+    engine = create_engine(f'sqlite:///{path}', **options)
+    metrics = engine.pool.metrics
+    metrics.reset()
+
+    held = engine.connect()
+    try:
+        engine.connect()
+        assert False, 'havuz dolu olmasına rağmen bağlantı verildi'
+    except PoolTimeoutError:
+        pass
+    status = pool_status(engine)
+    held.close()
+    engine.connect().close()
+
+    stats = metrics.stats()
+    assert stats['checkouts'] == 2 and stats['timeouts'] == 1
+    assert sum(stats['histogram'].values()) == 2
+    assert status['checked_out'] == 1 and status['saturation'] == 1.0
+    assert status['checkout_wait']['timeouts'] == 1
+    engine.dispose()
+
+
+def test_read_only_hook_is_registered_once():
+    server.configure_database(server.app, db)
+    assert event.contains(db.session, 'after_begin', _begin_read_only)
+    # SQLite'ta SET TRANSACTION çalıştırılmaz
+    response = server.app.test_client().get('/api/brands')
+    assert response.status_code == 200
+
+
+if __name__ == '__main__':
+    for test in (test_engine_options_from_env, test_checkout_wait_and_timeouts_are_measured,
+                 test_read_only_hook_is_registered_once):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
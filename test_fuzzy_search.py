@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Bulanık İsim Arama Testi
+search_perfumes_by_name(fuzzy=True) için SQLite (süreç içi trigram) yolunu
+dener: yazım hatalı sorgular bulunmalı ve sonuçlar benzerliğe göre sıralı
+gelmeli. Bellekte SQLite kullanır.
+
+Kullanım:
+    python -m pytest test_fuzzy_search.py
+    python test_fuzzy_search.py
+"""
+
+import os
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+import server
+from src.models.database import db, Brand, Perfume, search_perfumes_by_name
+
+client = server.app.test_client()
+
+
+def populate():
+    with server.app.app_context():
+        db.drop_all()
+        db.create_all()
+
+        dior = Brand(name='Dior', type='luxury')
+        chanel = Brand(name='Chanel', type='luxury')
+        bargello = Brand(name='Bargello', type='alternative')
+        db.session.add_all([dior, chanel, bargello])
+        db.session.flush()
+
+        db.session.add_all([
+            Perfume(name='Sauvage', brand_id=dior.id, gender='men'),
+            Perfume(name='Sauvage Elixir', brand_id=dior.id, gender='men'),
+            Perfume(name='Bleu de Chanel', brand_id=chanel.id, gender='men'),
+            Perfume(name='Savon Blanc', brand_id=bargello.id, gender='unisex'),
+            Perfume(name='Coco Mademoiselle', brand_id=chanel.id, gender='women'),
+        ])
+        db.session.commit()
+
+
+def test_typo_finds_ranked_matches():
+    populate()
+    with server.app.app_context():
+        names = [p.name for p in search_perfumes_by_name('sauvge', fuzzy=True)]
+        assert names == ['Sauvage', 'Sauvage Elixir']
+
+        # Marka ismindeki yazım hatası markanın parfümlerini getirir
+        names = [p.name for p in search_perfumes_by_name('chanle', fuzzy=True)]
+        assert set(names) == {'Bleu de Chanel', 'Coco Mademoiselle'}
+
+        # Fuzzy olmadan ILIKE davranışı değişmez
+        assert search_perfumes_by_name('sauvge') == []
+
+
+def test_fuzzy_search_endpoint():
+    populate()
+    response = client.post('/api/perfume/search', json={
+        'searchType': 'name', 'searchTerm': 'mademoisele', 'fuzzy': True
+    })
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['fuzzy'] is True
+    assert [r['name'] for r in data['results']] == ['Coco Mademoiselle']
+
+
+if __name__ == '__main__':
+    for test in (test_typo_finds_ranked_matches, test_fuzzy_search_endpoint):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
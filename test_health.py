@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Sağlık Kontrolü Testi
+Canlılık yoklamasının veritabanına gitmediğini, hazırlık yoklamasının tek
+bir SELECT 1 çalıştırdığını ve /api/health istatistiklerinin her yoklamada
+yeniden sayılmadığını doğrular. Bellekte SQLite kullanır.
+
+Kullanım:
+    python -m pytest test_health.py
+    python test_health.py
+"""
+
+import os
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+import server
+from test_query_count import client, count_queries, populate
+
+
+def test_liveness_does_not_query():
+    with count_queries() as statements:
+        response = client.get('/api/health/live')
+    assert response.status_code == 200
+    assert response.get_json() == {'status': 'alive'}
+    assert statements == []
+
+
+def test_readiness_runs_single_probe():
+    with count_queries() as statements:
+        response = client.get('/api/health/ready')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['status'] == 'ready'
+    assert 'class' in data['pool']
+    assert len(statements) == 1
+
+
+def test_health_stats_are_cached():
+    populate()
+    server.table_stats.invalidate()
+    first = client.get('/api/health').get_json()
+    assert first['stats'] == {'perfumes': 30, 'brands': 2, 'similarities': 75}
+    assert first['stats_source'] == 'count'
+    assert set(first['caches']) == {'catalog', 'note_names', 'search_history', 'parfumo'}
+
+    with count_queries() as statements:
+        second = client.get('/api/health').get_json()
+    # Sadece bağlantı testi; COUNT(*) görüntüden gelir
+    assert len(statements) == 1
+    assert second['stats'] == first['stats']
+
+
+if __name__ == '__main__':
+    for test in (test_liveness_does_not_query, test_readiness_runs_single_probe,
+                 test_health_stats_are_cached):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Paralel İçe Aktarma Hattı Testi
+ImportPipeline'ın (kaynak başına ayrıştırma süreci, sınırlı kuyruklar, tek
+toplu yazıcı) sıralı içe aktarmayla aynı kayıtları ürettiğini, küçük
+kuyruklarda backpressure ile çalıştığını, aşama istatistiklerini döndürdüğünü,
+yazıcı hatasında ayrıştırıcıları takılı bırakmadan durduğunu ve içe
+aktarıcının süreçlere önbellekleri olmadan pickle edildiğini doğrular.
+Bellekte SQLite kullanır.
+
+Kullanım:
+    python -m pytest test_import_pipeline.py
+    python test_import_pipeline.py
+"""
+
+import multiprocessing
+import os
+import pickle
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+import server
+from src.models.database import db, Brand, Perfume
+from src.utils.data_importer import DataImporter
+from src.utils.import_pipeline import ImportPipeline
+
+
+def snapshot():
+    return sorted(
+        (p.brand.name, p.name, p.gender, str(p.price), p.stock_status, str(p.rating), p.description,
+         tuple(sorted((pn.note.name, pn.note.type, pn.note.category) for pn in p.notes)))
+        for p in Perfume.query.all()
+    )
+
+
+def reset():
+    db.drop_all()
+    db.create_all()
+
+
+def sequential_snapshot():
+    with server.app.app_context():
+        reset()
+        importer = DataImporter(bulk=True)
+        for source, file_path, build_record in importer.sources():
+            importer.import_file(source, file_path, build_record)
+        return snapshot()
+
+
+SEQUENTIAL = sequential_snapshot()
+
+
+def test_pipeline_matches_sequential_import():
+    with server.app.app_context():
+        reset()
+        stats = DataImporter().import_parallel()
+        assert snapshot() == SEQUENTIAL
+        assert sum(stats['imported'].values()) == len(SEQUENTIAL)
+        assert set(stats['stages']) == {'parse:Bargello', 'parse:Muscent', 'parse:Zara', 'write'}
+        assert stats['stages']['write']['records'] == sum(
+            stats['stages'][f'parse:{source}']['records'] for source in stats['imported']
+        )
+
+
+def test_small_queues_and_single_worker():
+    with server.app.app_context():
+        reset()
+        importer = DataImporter()
+        pipeline = ImportPipeline(importer, workers=1, queue_size=1, chunk_size=10, batch_size=25)
+        stats = pipeline.run(importer.sources())
+        assert snapshot() == SEQUENTIAL
+        assert stats['stages']['write']['batches'] > 10
+
+        # İkinci çalıştırma: var olan parfümler atlanır
+        assert sum(pipeline.run(importer.sources())['imported'].values()) == 0
+        assert Perfume.query.count() == len(SEQUENTIAL)
+
+
+def test_missing_source_creates_no_brand():
+    with server.app.app_context():
+        reset()
+        importer = DataImporter()
+        stats = ImportPipeline(importer).run([('Yok', 'yok.json', importer.zara_record)])
+        assert stats['imported'] == {'Yok': 0}
+        assert Brand.query.filter_by(name='Yok').first() is None
+
+
+def test_writer_failure_stops_parsers():
+    with server.app.app_context():
+        reset()
+        importer = DataImporter()
+
+        def fail(*args, **kwargs):
+            raise RuntimeError('yazma hatası')
+
+        importer.bulk_write_records = fail
+        pipeline = ImportPipeline(importer, queue_size=1, chunk_size=5, batch_size=5)
+        try:
+            pipeline.run(importer.sources())
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError('RuntimeError bekleniyordu')
+        assert not any(process.name.startswith('import-parse') for process in multiprocessing.active_children())
+
+
+def test_importer_pickles_without_caches():
+    with server.app.app_context():
+        reset()
+        importer = DataImporter(bulk=True)
+        importer.get_or_create_brand('Zara', 'alternative')
+        assert importer.brand_cache
+
+        # spawn başlatma yönteminde süreçlere giden kopya
+        clone = pickle.loads(pickle.dumps(importer.zara_record)).__self__
+        assert clone.bulk and not clone.brand_cache
+        item = {'name': 'RED VANILLA MEN', 'price': '1.290,00 TL'}
+        assert clone.zara_record(item) == importer.zara_record(item)
+
+
+if __name__ == '__main__':
+    for test in (test_pipeline_matches_sequential_import, test_small_queues_and_single_worker,
+                 test_missing_source_creates_no_brand, test_writer_failure_stops_parsers,
+                 test_importer_pickles_without_caches):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
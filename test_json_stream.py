@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Akışlı JSON Okuma Testi
+src.utils.json_stream okuyucusunun JSON dizisi, NDJSON ve tek nesne
+dosyalarında json.load ile aynı kayıtları ürettiğini, dosyayı parça parça
+okuyup ilk kaydı dosya bitmeden verdiğini ve DataImporter'ın NDJSON
+dosyalarını da içe aktardığını doğrular.
+
+Kullanım:
+    python -m pytest test_json_stream.py
+    python test_json_stream.py
+"""
+
+import io
+import json
+import os
+import tempfile
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+import server
+from src.models.database import db, Brand, Perfume
+from src.utils.data_importer import DataImporter
+from src.utils.import_pipeline import ImportPipeline
+from src.utils.json_stream import iter_json_records, iter_json_values
+
+CATALOG_FILES = ('bargello_parfumler.json', 'muscent_parfumler.json', 'zara_perfumes.json')
+
+
+class CountingReader(io.StringIO):
+    """Okunan karakter sayısını tutan dosya"""
+
+    def __init__(self, text):
+        super().__init__(text)
+        self.consumed = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.consumed += len(chunk)
+        return chunk
+
+
+def load(file_path):
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_array_matches_json_load():
+    for file_path in CATALOG_FILES:
+        expected = load(file_path)
+        expected = expected if isinstance(expected, list) else [expected]
+        for chunk_size in (7, 1024, 1 << 16):
+            with open(file_path, 'r', encoding='utf-8') as f:
+                assert list(iter_json_values(f, chunk_size)) == expected, f"{file_path} / {chunk_size}"
+
+
+def test_ndjson_and_single_object():
+    records = [{'isim': 'A', 'fiyat': '1,00₺'}, {'isim': 'B', 'notalar': {'üst_notlar': 'Gül, Misk'}}, 42]
+    ndjson = '\n'.join(json.dumps(record, ensure_ascii=False) for record in records) + '\n\n'
+    assert list(iter_json_values(io.StringIO(ndjson), 3)) == records
+    assert list(iter_json_values(io.StringIO('{"name": "Zara"}'), 4)) == [{'name': 'Zara'}]
+    assert list(iter_json_values(io.StringIO(' [ ] '))) == []
+    assert list(iter_json_values(io.StringIO(''))) == []
+
+
+def test_streams_before_end_of_file():
+    text = json.dumps([{'name': f'p{i}', 'notes': ['x'] * 20} for i in range(2000)])
+    reader = CountingReader(text)
+    records = iter_json_values(reader, 4096)
+    assert next(records) == {'name': 'p0', 'notes': ['x'] * 20}
+    assert reader.consumed <= 4096 < len(text)
+    assert sum(1 for _ in records) == 1999
+
+
+def test_malformed_input_raises():
+    for text in ('[{"a": 1}, {"a": 2}', '[{"a": 1},, {"a": }]', '{"a": 1} {"b"'):
+        try:
+            list(iter_json_values(io.StringIO(text), 4))
+        except ValueError:
+            continue
+        raise AssertionError(f"hata bekleniyordu: {text!r}")
+
+
+def test_importer_reads_ndjson():
+    data = load('bargello_parfumler.json')[:40]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bargello.ndjson')
+        with open(path, 'w', encoding='utf-8') as f:
+            for record in data:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        assert list(iter_json_records(path)) == data
+
+        with server.app.app_context():
+            db.drop_all()
+            db.create_all()
+            imported = DataImporter(bulk=True).import_bargello_data(path)
+            assert imported == Perfume.query.count() == len({record['isim'] for record in data})
+
+            # Eksik dosya: marka oluşturulmaz, hata yükseltilmez
+            assert DataImporter().import_muscent_data(os.path.join(directory, 'yok.json')) is None
+
+
+def test_malformed_file_imports_nothing():
+    data = load('bargello_parfumler.json')[:40]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bozuk.json')
+        # Geçerli kayıtlardan sonra kesilmiş dosya
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(data, ensure_ascii=False)[:-40])
+
+        with server.app.app_context():
+            db.drop_all()
+            db.create_all()
+            for bulk in (False, True):
+                assert DataImporter(bulk=bulk).import_bargello_data(path) is None
+                assert Perfume.query.count() == 0
+                assert Brand.query.filter_by(name='Bargello').first() is None
+            assert DataImporter().load_json_file(path) == []
+
+            # Hatlı içe aktarma: bozuk kaynak geri alınır, sonraki kaynak yazılır
+            importer = DataImporter()
+            stats = ImportPipeline(importer, chunk_size=5, batch_size=10).run([
+                ('Bargello', path, importer.bargello_record),
+                ('Muscent', 'muscent_parfumler.json', importer.muscent_record)
+            ])
+            assert stats['imported']['Bargello'] == 0 and stats['imported']['Muscent'] > 0
+            assert Brand.query.filter_by(name='Bargello').first() is None
+            assert Perfume.query.count() == stats['imported']['Muscent']
+
+        # Tek geçiş: dosya önceden doğrulanmaz, hatadan önceki kayıtlar hemen üretilir
+        records = DataImporter().iter_json_file(path)
+        assert next(records) == data[0]
+        records.close()
+
+
+if __name__ == '__main__':
+    for test in (test_array_matches_json_load, test_ndjson_and_single_object, test_streams_before_end_of_file,
+                 test_malformed_input_raises, test_importer_reads_ndjson, test_malformed_file_imports_nothing):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
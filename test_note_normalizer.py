@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Nota Normalizasyon Testi
+src.utils.note_normalizer'daki derlenmiş kategori ve çeviri eşleştiricilerinin
+eski döngü tabanlı fonksiyonlarla (her çağıranın kendi kelime listesi ve
+öncelik sırası dahil) aynı sonucu
+verdiğini ve normalize_note'un boşluk / büyük harf / 'İ' farklarını
+tekilleştirdiğini doğrular.
+
+Kullanım:
+    python -m pytest test_note_normalizer.py
+    python test_note_normalizer.py
+"""
+
+from add_luxury_brands import determine_note_category as luxury_category
+from benchmark_notes import catalog_notes, legacy_importer_category, legacy_luxury_category, legacy_translate
+from src.utils.data_importer import DataImporter
+from src.utils.note_normalizer import (
+    KeywordMatcher, importer_classifier, luxury_classifier, normalize_note, translate_note
+)
+
+EDGE_CASES = [
+    '', 'Portakal Çiçeği', 'Orange Blossom', 'Rosemary', 'Pink Pepper', 'Ambergris', 'Sandal Ağacı',
+    'Beyaz Misk', 'MUSK', 'lily of the valley', 'lily', 'pe', 'notes', 'Oud Wood', 'Bal Mumu', 'x\ny',
+    'Balsam', 'Tolu Balsam', 'Rose', 'Iris', 'Sugar Cane'
+]
+
+
+def test_classify_matches_legacy():
+    importer = DataImporter()
+    for note in set(catalog_notes()) | set(EDGE_CASES):
+        assert importer.determine_note_category(note) == legacy_importer_category(note), note
+        assert luxury_category(note) == legacy_luxury_category(note), note
+    assert importer_classifier.classify('Portakal Çiçeği') == 'citrus'
+
+
+def test_each_caller_keeps_its_keywords():
+    # İçe aktarım listesi Türkçe: İngilizce isimler eskisi gibi 'other'
+    assert [importer_classifier.classify(note) for note in ('Rose', 'Iris', 'Sandalwood')] == ['other'] * 3
+    assert importer_classifier.classify('Balsam') == 'sweet'
+    # Lüks markalar listesinde 'bal' yok: "Tolu Balsam" tatlı sayılmaz
+    assert [luxury_classifier.classify(note) for note in ('Rose', 'Iris', 'Sandalwood', 'Tolu Balsam')] == [
+        'floral', 'floral', 'woody', 'other']
+
+
+def test_translate_matches_legacy():
+    for note in set(catalog_notes()) | set(EDGE_CASES):
+        assert translate_note(note) == legacy_translate(note), note
+    assert translate_note('Pink Pepper') == 'pembe biber'
+    assert translate_note('Bulgarian Rose Oil') == 'gül'
+    assert translate_note('ylang') == 'ylang'
+
+
+def test_keyword_matcher_priority():
+    matcher = KeywordMatcher(['cedar', 'ced', 'dar', 'cedar'])
+    # Örtüşen eşleşmeler: en öncelikli kelime kazanır
+    assert matcher.first_in('atlas cedarwood') == 0
+    assert matcher.first_in('radar') == 2
+    assert matcher.first_in('musk') is None
+    assert matcher.first_containing('eda') == 0
+    assert matcher.first_containing('ar') == 0
+    assert matcher.first_containing('x') is None
+
+
+def test_normalize_note():
+    assert normalize_note('  Beyaz   Misk ') == 'beyaz misk'
+    assert normalize_note('MİSK') == normalize_note('misk') == 'misk'
+    assert normalize_note(None) == ''
+    assert normalize_note('Sandal\tAğacı') == 'sandal ağacı'
+
+
+if __name__ == '__main__':
+    for test in (test_classify_matches_legacy, test_each_caller_keeps_its_keywords, test_translate_matches_legacy,
+                 test_keyword_matcher_priority,
+                 test_normalize_note):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
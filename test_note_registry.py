@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Kanonik Nota Sözlüğü Testi
+NoteRegistry'nin farklı yazımları (büyük/küçük harf, Türkçe karakter,
+Türkçe/İngilizce takma isim) aynı kararlı id'ye eşlediğini, benzerlik /
+arama yollarının bu id'lerle eşleşme bulduğunu ve artımlı benzerlik
+özetinin kanonik notalara ve skorlama sürümüne bağlı olduğunu doğrular.
+
+Kullanım:
+    python -m pytest test_note_registry.py
+    python test_note_registry.py
+"""
+
+from types import SimpleNamespace
+
+from src.models.database import calculate_similarity_score
+from src.utils.note_registry import NoteRegistry, note_registry
+from src.utils import similarity_pipeline
+from src.utils.note_vectors import NoteVectorStore
+from src.utils.search_index import PerfumeSearchIndex
+
+
+def perfume(perfume_id, notes, gender='unisex'):
+    return {
+        'id': perfume_id, 'name': perfume_id, 'brand': {'name': 'Test'}, 'gender': gender, 'family': '',
+        'description': '', 'source': 'test', 'notes': {'top': [{'name': note} for note in notes]}
+    }
+
+
+def test_spellings_share_canonical_id():
+    registry = NoteRegistry()
+    musk = registry.add('Misk')
+    assert {registry.add(name) for name in ('misk', 'Musk', ' MUSK ', 'Beyaz Misk', 'white musk')} == {musk}
+    sandalwood = registry.add('Sandal Ağacı')
+    assert {registry.add(name) for name in ('sandalwood', 'SANDAL AGACI', 'sandal  ağacı')} == {sandalwood}
+    assert registry.add('Pembe Biber') != registry.add('Biber')
+    assert registry.names[musk] == 'misk'
+
+
+def test_ids_are_stable_and_lookups_do_not_grow():
+    first, second = NoteRegistry(), NoteRegistry()
+    assert first.add('Vanilla') == second.add('vanilya')
+    assert len(first) == len(second)
+    size = len(first)
+    assert first.id_of('bilinmeyen nota') is None
+    assert len(first) == size
+    assert first.add('Bilinmeyen Nota') == size
+    assert first.encode(['Rose', 'gül', 'Gul'], create=False).tolist() == [first.id_of('gül')]
+
+
+def test_similarity_score_uses_canonical_ids():
+    def db_perfume(notes):
+        return SimpleNamespace(gender='unisex', family_id=None,
+                               notes=[SimpleNamespace(note=SimpleNamespace(name=name)) for name in notes])
+
+    # Aynı cinsiyet + aile (None == None) + birebir aynı notalar
+    assert calculate_similarity_score(db_perfume(['Musk', 'Sandalwood']), db_perfume(['Misk', 'Sandal Ağacı'])) == 100
+
+
+def test_search_and_alternatives_match_aliases():
+    catalog = [perfume('a', ['Misk', 'Gül']), perfume('b', ['white musk', 'Rose']), perfume('c', ['Deri'])]
+    index = PerfumeSearchIndex(catalog)
+    assert [p['id'] for p in index.search('musk', 'notes')] == ['a', 'b']
+    assert [p['id'] for p in index.search('sandal agaci, deri', 'notes')] == ['c']
+    assert [p['id'] for p in index.search(selected_notes=['Rose'])] == ['a', 'b']
+
+    store = NoteVectorStore(catalog)
+    alternatives, total = store.alternatives(0)
+    assert total == 1 and alternatives[0][0] == 1 and alternatives[0][1] == 1.0
+    assert sorted(store.decode(alternatives[0][2])) == ['gül', 'misk']
+    assert note_registry.id_of('Gul') == note_registry.id_of('Rose')
+
+
+def test_content_hash_follows_canonical_notes_and_version():
+    def digest(notes):
+        return similarity_pipeline.content_hash('alternative', 'unisex', 1, None, notes)
+
+    assert digest(['Musk', 'Sandalwood']) == digest(['Sandal Ağacı', 'misk', 'Misk'])
+    assert digest(['Musk']) != digest(['Amber'])
+
+    # Skorlama sürümü değişince tüm özetler değişir (artımlı hat yeniden hesaplar)
+    before = digest(['Misk'])
+    version = similarity_pipeline.SCORING_VERSION
+    similarity_pipeline.SCORING_VERSION = version + 1
+    try:
+        assert digest(['Misk']) != before
+    finally:
+        similarity_pipeline.SCORING_VERSION = version
+
+
+if __name__ == '__main__':
+    for test in (test_spellings_share_canonical_id, test_ids_are_stable_and_lookups_do_not_grow,
+                 test_similarity_score_uses_canonical_ids, test_search_and_alternatives_match_aliases,
+                 test_content_hash_follows_canonical_notes_and_version):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
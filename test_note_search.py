@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Nota Arama Testi
+search_perfumes_by_notes için: isimler büyük/küçük harf farkı gözetmeden
+eşleşmeli, sonuçlar ağırlıklı örtüşmeye göre sıralı gelmeli ve marka tipi
+filtresi LIMIT'ten önce uygulanmalı. Bellekte SQLite kullanır.
+
+Kullanım:
+    python -m pytest test_note_search.py
+    python test_note_search.py
+"""
+
+import os
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+import server
+from src.models.database import (
+    db, Brand, Note, Perfume, PerfumeNote, note_name_cache, search_perfumes_by_notes
+)
+
+PERFUMES = [
+    # (isim, marka tipi, notalar)
+    ('Lüks Gül', 'luxury', ['Gül', 'Misk', 'Vanilya']),
+    ('Lüks Misk', 'luxury', ['Misk', 'Vanilya']),
+    ('Alternatif Gül', 'alternative', ['Gül', 'Misk']),
+    ('Alternatif Vanilya', 'alternative', ['Vanilya', 'Amber']),
+    ('Alternatif Odunsu', 'alternative', ['Sedir', 'Amber']),
+]
+
+
+def populate():
+    with server.app.app_context():
+        db.drop_all()
+        db.create_all()
+
+        brands = {
+            'luxury': Brand(name='Lüks Marka', type='luxury'),
+            'alternative': Brand(name='Alternatif Marka', type='alternative'),
+        }
+        notes = {name: Note(name=name, type='middle') for name in ['Gül', 'Misk', 'Vanilya', 'Amber', 'Sedir']}
+        db.session.add_all([*brands.values(), *notes.values()])
+        db.session.flush()
+
+        for name, brand_type, note_names in PERFUMES:
+            perfume = Perfume(name=name, brand_id=brands[brand_type].id, gender='unisex')
+            db.session.add(perfume)
+            db.session.flush()
+            for note_name in note_names:
+                db.session.add(PerfumeNote(perfume_id=perfume.id, note_id=notes[note_name].id))
+        db.session.commit()
+    note_name_cache.invalidate()
+
+
+def test_ranked_by_weighted_overlap():
+    populate()
+    with server.app.app_context():
+        names = [p.name for p in search_perfumes_by_notes([' gül', 'VANILYA'])]
+        # İki notayı da içeren önce; Gül (daha nadir) içeren, Vanilya içerenlerden önce
+        assert names[0] == 'Lüks Gül'
+        assert names[1] == 'Alternatif Gül'
+        assert set(names[2:]) == {'Lüks Misk', 'Alternatif Vanilya'}
+
+
+def test_brand_type_filter_is_applied_before_limit():
+    populate()
+    with server.app.app_context():
+        names = [p.name for p in search_perfumes_by_notes(['Gül', 'Misk'], limit=1, brand_type='alternative')]
+        assert names == ['Alternatif Gül']
+
+
+def test_spellings_resolve_to_canonical_notes():
+    populate()
+    with server.app.app_context():
+        # Veritabanında yalnız "Misk" / "Sedir" var; İngilizce ve ASCII yazımlar aynı notaya çıkar
+        assert {p.name for p in search_perfumes_by_notes(['Musk'])} == {'Lüks Gül', 'Lüks Misk', 'Alternatif Gül'}
+        # Sedir (tek parfümde) Gül'den nadir
+        assert [p.name for p in search_perfumes_by_notes(['cedarwood', 'GUL'], brand_type='alternative')] == [
+            'Alternatif Odunsu', 'Alternatif Gül']
+        # Parfumo yolu (İngilizce nota isimleri)
+        names = [p['name'] for p in server.find_similar_perfumes_in_db(['Rose', 'White Musk', 'Vanilla'])]
+        assert names[0] == 'Alternatif Gül'
+
+
+def test_unknown_notes_return_nothing():
+    populate()
+    with server.app.app_context():
+        assert search_perfumes_by_notes(['Olmayan Nota']) == []
+
+
+if __name__ == '__main__':
+    for test in (test_ranked_by_weighted_overlap, test_brand_type_filter_is_applied_before_limit,
+                 test_spellings_resolve_to_canonical_notes, test_unknown_notes_return_nothing):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Nota Bitset Deposu Testi
+NoteVectorStore.memory_bytes() değerinin her çağrıda katalog taranmadan,
+önbellek ekleme / çıkarmalarıyla artımlı tutulduğunu ve tam hesaplamayla
+aynı kaldığını; top-K alternatiflerin eski /alternatives endpoint'indeki
+kaba kuvvet taramayla aynı olduğunu doğrular.
+
+Kullanım:
+    python -m pytest test_note_vectors.py
+    python test_note_vectors.py
+"""
+
+import random
+import sys
+
+from src.utils.note_vectors import NoteVectorStore
+
+NOTES = ['Gül', 'Misk', 'Vanilya', 'Sedir', 'Bergamot', 'Deri']
+
+
+def catalog(size):
+    return [
+        {'id': str(i), 'notes': {'top': [{'name': NOTES[i % 6]}, {'name': NOTES[(i + 1) % 6]}],
+                                 'base': [{'name': NOTES[(i + 2) % 6]}]}}
+        for i in range(size)
+    ]
+
+
+def full_memory_bytes(store):
+    """Eski tam tarama hesabı"""
+    total = sys.getsizeof(store.bitsets) + sum(sys.getsizeof(b) for b in store.bitsets)
+    total += sys.getsizeof(store.note_counts)
+    total += sum(sys.getsizeof(p) for p in store.note_postings.values())
+    total += sys.getsizeof(store._cache)
+    for alternatives, _ in store._cache.values():
+        total += sys.getsizeof(alternatives) + len(alternatives) * sys.getsizeof((0, 0.0, 0))
+    return total
+
+
+def brute_force_alternatives(perfumes, position, min_similarity=0.3):
+    """Bitsetler öncesi app.py'deki tüm katalog taraması"""
+    def names(perfume):
+        return [note['name'].lower() for notes in perfume['notes'].values() for note in notes]
+
+    target = names(perfumes[position])
+    alternatives = []
+    for other, perfume in enumerate(perfumes):
+        if other == position:
+            continue
+        other_notes = names(perfume)
+        common = set(target) & set(other_notes)
+        if common:
+            similarity = len(common) / max(len(target), len(other_notes))
+            if similarity > min_similarity:
+                alternatives.append((other, similarity, common))
+    alternatives.sort(key=lambda item: item[1], reverse=True)
+    return alternatives
+
+
+def random_catalog(size, seed):
+    rng = random.Random(seed)
+    pool = [f'Nota {i}' for i in range(15)]
+    perfumes = []
+    for i in range(size):
+        # Notasız parfümler de olsun
+        notes = rng.sample(pool, rng.randint(0, 6))
+        perfumes.append({'id': str(i), 'notes': {'top': [{'name': n} for n in notes[:3]],
+                                                 'base': [{'name': n} for n in notes[3:]]}})
+    return perfumes
+
+
+def test_top_k_matches_brute_force():
+    perfumes = random_catalog(150, seed=4)
+    store = NoteVectorStore(perfumes, top_k=5)
+    for position in range(len(perfumes)):
+        expected = brute_force_alternatives(perfumes, position)
+        top, total = store.alternatives(position)
+        assert total == len(expected)
+        assert [(other, similarity) for other, similarity, _ in top] == \
+            [(other, similarity) for other, similarity, _ in expected[:5]], position
+        assert [set(store.decode(common)) for _, _, common in top] == [common for _, _, common in expected[:5]]
+        # İkinci çağrı önbellekten aynı sonucu döndürür
+        assert store.alternatives(position) == (top, total)
+
+
+def test_memory_bytes_is_tracked_incrementally():
+    store = NoteVectorStore(catalog(60), max_cache_entries=8)
+    assert store.memory_bytes() == full_memory_bytes(store)
+
+    for position in range(20):
+        store.alternatives(position)
+        assert store.memory_bytes() == full_memory_bytes(store)
+    assert store.stats()['cache_entries'] == 8
+
+    # Bitsetler artık taranmıyor: sonradan eklenen bitset hesaba girmez
+    store.bitsets.append(1 << 4000)
+    assert store.memory_bytes() != full_memory_bytes(store)
+
+
+if __name__ == '__main__':
+    for test in (test_top_k_matches_brute_force, test_memory_bytes_is_tracked_incrementally):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
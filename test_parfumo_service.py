@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Parfumo Arama Servisi Testi
+Aramaların süreç içi worker havuzunda paylaşılan oturumla yapıldığını, aynı
+anda gelen aynı aramaların birleştirildiğini, sonuçların saklandığını,
+havuz dolunca yeni aramaların reddedildiğini ve süren aramada istek
+thread'inin beklemeden 202 döndüğünü, tekrar sorunun sonucu önbellekten
+aldığını doğrular. Ağa çıkmaz; HTTP oturumu sahte bir oturumla değiştirilir.
+
+Kullanım:
+    python -m pytest test_parfumo_service.py
+    python test_parfumo_service.py
+"""
+
+import os
+import threading
+
+import requests
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+import server
+from src.utils.parfumo_service import ParfumoBusyError, ParfumoLookupService, ParfumoPendingError
+
+PAGE = """
+<div class="p_gender_big"><i class="fa-mars"></i></div>
+<div class="w-100 mt-0-5 mb-3"><a>François Demachy</a></div>
+<div class="notes_list">
+  <span class="clickable_note_img">Bergamot</span>
+  <span class="clickable_note_img">Pepper</span>
+  <span class="clickable_note_img">Ambroxan</span>
+</div>
+<div class="barfiller_element"><span class="upper">Scent</span><span class="bold">8.1</span></div>
+"""
+
+
+class FakeResponse:
+    text = PAGE
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    """requests.Session yerine; get çağrılarını sayar, istenirse bekletir"""
+
+    def __init__(self, gate=None, fail=False):
+        self.calls = []
+        self.gate = gate
+        self.fail = fail
+
+    def get(self, url, timeout=None):
+        self.calls.append((url, timeout))
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.fail:
+            raise requests.ConnectionError('bağlantı kurulamadı')
+        return FakeResponse()
+
+    def close(self):
+        pass
+
+
+def make_service(gate=None, fail=False, **kwargs):
+    service = ParfumoLookupService(**kwargs)
+    service._ensure_started()
+    service._session = FakeSession(gate, fail)
+    return service
+
+
+def test_lookup_parses_page_in_process():
+    service = make_service()
+    result = service.lookup('Dior', 'Sauvage')
+    assert result['url'] == 'https://www.parfumo.com/Perfumes/Dior/Sauvage'
+    assert result['notes'] == ['Bergamot', 'Pepper', 'Ambroxan']
+    assert result['perfumer'] == 'François Demachy'
+    assert result['gender'] == 'Erkek'
+    assert result['ratings'] == {'Scent': '8.1'}
+    assert service._session.calls == [(result['url'], service.timeout)]
+
+    # İkinci arama önbellekten; dönen sözlük değiştirilse de önbellek bozulmaz
+    result['database_alternatives'] = []
+    again = service.lookup(' dior ', 'SAUVAGE')
+    assert 'database_alternatives' not in again
+    assert len(service._session.calls) == 1
+    assert service.stats()['cache_hits'] == 1
+    service.shutdown()
+
+
+def test_concurrent_identical_lookups_are_coalesced():
+    gate = threading.Event()
+    service = make_service(gate)
+    futures = [service.submit('Dior', 'Sauvage') for _ in range(5)]
+    gate.set()
+    results = [future.result(5) for future in futures]
+    assert all(result['notes'] == results[0]['notes'] for result in results)
+    assert len(service._session.calls) == 1
+    assert service.stats()['coalesced'] == 4
+    service.shutdown()
+
+
+def test_full_pool_rejects_and_timeout_releases_caller():
+    gate = threading.Event()
+    service = make_service(gate, max_workers=1, max_pending=2)
+    service.submit('Marka', 'Bir')
+    service.submit('Marka', 'İki')
+    try:
+        service.submit('Marka', 'Üç')
+        assert False, 'dolu havuz yeni aramayı kabul etti'
+    except ParfumoBusyError:
+        pass
+    assert service.stats()['rejected'] == 1
+
+    # Bekleyen arama için çağıran thread süre dolunca serbest kalır
+    try:
+        service.lookup('Marka', 'Bir', wait=0.05)
+        assert False, 'süren arama için ParfumoPendingError bekleniyordu'
+    except ParfumoPendingError as e:
+        assert e.retry_after == service.retry_after
+    assert service.stats()['timeouts'] == 1
+    gate.set()
+    service.shutdown()
+
+
+def test_pending_lookup_is_answered_from_cache():
+    gate = threading.Event()
+    service = make_service(gate, wait=0.05)
+    future = service.submit('Dior', 'Sauvage')
+    try:
+        service.lookup('Dior', 'Sauvage')
+        assert False, 'süren arama için ParfumoPendingError bekleniyordu'
+    except ParfumoPendingError:
+        pass
+    gate.set()
+    future.result(5)
+
+    # Tekrar sorulduğunda yeni istek atılmaz
+    assert service.lookup('Dior', 'Sauvage')['notes'] == ['Bergamot', 'Pepper', 'Ambroxan']
+    assert len(service._session.calls) == 1
+    service.shutdown()
+
+
+def test_missing_result_is_cached_for_miss_ttl():
+    service = make_service(fail=True)
+    assert service.lookup('Marka', 'Yok') is None
+    assert service.lookup('Marka', 'Yok') is None
+    assert len(service._session.calls) == 1
+
+    service.miss_ttl = 0
+    assert service.lookup('Marka', 'Yok') is None
+    assert len(service._session.calls) == 2
+    service.shutdown()
+
+
+def test_worst_case_covers_retries():
+    # 3 deneme x (5 + 15) sn + 0.6 sn bekleme
+    assert ParfumoLookupService().worst_case_seconds() == 3 * 20 + 0.6
+
+
+def test_endpoint_returns_202_until_lookup_finishes():
+    gate = threading.Event()
+    service = make_service(gate, wait=0.05)
+    original, server.parfumo_service = server.parfumo_service, service
+    client = server.app.test_client()
+    payload = {'brand': 'Dior', 'perfumeName': 'Sauvage'}
+    try:
+        response = client.post('/api/perfume/parfumo-search', json=payload)
+        assert response.status_code == 202
+        assert response.headers['Retry-After'] == '2'
+        assert response.get_json() == {'pending': True, 'retry_after': 2,
+                                       'timeout_seconds': service.worst_case_seconds()}
+
+        gate.set()
+        # Süren aramaya bağlanıp bitmesini bekle
+        service.submit('Dior', 'Sauvage').result(5)
+        response = client.post('/api/perfume/parfumo-search', json=payload)
+        assert response.status_code == 200
+        assert response.get_json()['notes'] == ['Bergamot', 'Pepper', 'Ambroxan']
+        assert len(service._session.calls) == 1
+    finally:
+        server.parfumo_service = original
+        service.shutdown()
+
+
+if __name__ == '__main__':
+    for test in (test_lookup_parses_page_in_process, test_concurrent_identical_lookups_are_coalesced,
+                 test_full_pool_rejects_and_timeout_releases_caller, test_pending_lookup_is_answered_from_cache,
+                 test_missing_result_is_cached_for_miss_ttl, test_worst_case_covers_retries,
+                 test_endpoint_returns_202_until_lookup_finishes):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
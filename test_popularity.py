@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Popülerlik Kovaları Testi
+Arama geçmişi yazılırken saatlik / günlük / tüm zamanlar kovalarının
+artırıldığını, sönümlü trend skorlarını ve /api/popular-perfumes'un arama
+geçmişi tablosunu taramadan önceden hesaplanmış görüntüden döndüğünü
+doğrular. Bellekte SQLite kullanır.
+
+Kullanım:
+    python -m pytest test_popularity.py
+    python test_popularity.py
+"""
+
+import os
+from datetime import datetime, timedelta
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+import server
+from src.models.database import db, SearchHistory, SearchTermRollup
+from src.utils.popularity import PopularityRollups
+from test_query_count import client, count_queries, populate
+
+NOW = datetime(2025, 6, 10, 12, 30)
+
+
+def events(term, count, hours_ago, search_type='name'):
+    return [{'search_term': term, 'search_type': search_type,
+             'created_at': NOW - timedelta(hours=hours_ago)}] * count
+
+
+def fresh_rollups(batches):
+    populate()
+    # Sabit tarihli kovalar saklama süresine takılmasın
+    rollups = PopularityRollups(half_life_hours=6, trending_window_hours=48, hour_retention_days=36500)
+    with server.app.app_context():
+        for batch in batches:
+            rollups.apply(batch)
+        db.session.commit()
+    return rollups
+
+
+def test_buckets_are_incremented():
+    fresh_rollups([events('Sauvage', 3, 0), events('Sauvage', 2, 1), events('Aventus', 1, 30, 'notes')])
+    with server.app.app_context():
+        rows = {(r.granularity, r.search_type, r.search_term, r.bucket_start): r.search_count
+                for r in SearchTermRollup.query.all()}
+    assert rows[('total', 'name', 'Sauvage', datetime(1970, 1, 1))] == 5
+    assert rows[('day', 'name', 'Sauvage', datetime(2025, 6, 10))] == 5
+    assert rows[('hour', 'name', 'Sauvage', datetime(2025, 6, 10, 12))] == 3
+    assert rows[('hour', 'name', 'Sauvage', datetime(2025, 6, 10, 11))] == 2
+    assert rows[('day', 'notes', 'Aventus', datetime(2025, 6, 9))] == 1
+
+
+def test_trending_decays_old_searches():
+    # Eski terim toplamda önde, yeni terim son saatlerde
+    rollups = fresh_rollups([events('Eski', 20, 40), events('Yeni', 5, 0)])
+    with server.app.app_context():
+        popular = rollups.popular_searches()
+        trending = rollups.trending(now=NOW)
+    assert [p['term'] for p in popular] == ['Eski', 'Yeni']
+    assert [t['term'] for t in trending] == ['Yeni', 'Eski']
+    assert trending[1]['count'] == 20 and trending[1]['score'] < 20 * 0.5 ** 6
+
+
+def test_rebuild_matches_incremental():
+    # Önceki testlerden kalan olaylar yeni tabloya yazılmasın
+    server.search_history_writer.flush()
+    populate()
+    for term in ('Deneme 1', 'Deneme 1', 'Deneme 2'):
+        client.post('/api/perfume/search', json={'searchType': 'name', 'searchTerm': term})
+    server.search_history_writer.flush()
+
+    with server.app.app_context():
+        incremental = sorted((r.granularity, r.search_term, r.search_count) for r in SearchTermRollup.query.all())
+        assert PopularityRollups().rebuild(batch_size=2) == 3
+        rebuilt = sorted((r.granularity, r.search_term, r.search_count) for r in SearchTermRollup.query.all())
+    assert incremental == rebuilt
+    assert ('total', 'Deneme 1', 2) in rebuilt
+
+
+def test_backfill_fills_empty_rollups_once():
+    # Yükseltilmiş kurulum: geçmiş var, kova tablosu boş
+    server.search_history_writer.flush()
+    populate()
+    with server.app.app_context():
+        db.session.add_all([SearchHistory(search_term=term, search_type='name', created_at=NOW)
+                            for term in ('Eski 1', 'Eski 1', 'Eski 2')])
+        db.session.commit()
+        assert SearchTermRollup.query.count() == 0
+
+        rollups = PopularityRollups()
+        assert rollups.backfill() == 3
+        assert rollups.popular_searches() == [{'term': 'Eski 1', 'count': 2}, {'term': 'Eski 2', 'count': 1}]
+        # Dolu tabloda tekrar üretilmez
+        assert rollups.backfill() == 0
+        assert rollups.popular_searches()[0] == {'term': 'Eski 1', 'count': 2}
+
+
+def test_endpoint_reads_snapshot():
+    # Önceki testlerden kalan olaylar yeni tabloya yazılmasın
+    server.search_history_writer.flush()
+    populate()
+    for term in ('Deneme 3', 'Deneme 3', 'Deneme 4'):
+        client.post('/api/perfume/search', json={'searchType': 'name', 'searchTerm': term})
+    server.search_history_writer.flush()
+    server.popularity_rollups.invalidate()
+
+    with count_queries() as statements:
+        data = client.get('/api/popular-perfumes').get_json()
+    assert data['popular_searches'][0] == {'term': 'Deneme 3', 'count': 2}
+    assert data['trending'][0]['term'] == 'Deneme 3'
+    assert len(data['top_rated']) == 10
+    assert not [s for s in statements if 'search_history' in s]
+
+    # Görüntü süresi dolmadan veritabanına gidilmez
+    with count_queries() as statements:
+        assert client.get('/api/popular-perfumes').get_json() == data
+    assert statements == []
+
+
+if __name__ == '__main__':
+    for test in (test_buckets_are_incremented, test_trending_decays_old_searches,
+                 test_rebuild_matches_incremental, test_backfill_fills_empty_rollups_once,
+                 test_endpoint_reads_snapshot):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Sorgu Sayısı Regresyon Testi
+server.py endpoint'lerinin sonuç sayısından bağımsız, sabit sayıda SQL
+sorgusu çalıştırdığını doğrular (N+1 lazy load kontrolü). Bellekte SQLite
+kullanır; çalışan bir sunucu ya da PostgreSQL gerekmez.
+
+Kullanım:
+    python -m pytest test_query_count.py
+    python test_query_count.py
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from sqlalchemy import event
+
+import server
+from src.utils.catalog_cache import catalog_cache
+from src.models.database import (
+    db, Brand, Note, Perfume, PerfumeFamily, PerfumeNote, PerfumeSimilarity
+)
+
+# Bir istek için izin verilen en fazla sorgu sayısı
+MAX_QUERIES = 12
+
+client = server.app.test_client()
+
+
+def populate(perfume_count=30, notes_per_perfume=6):
+    """Lüks ve alternatif parfümler, notalar ve benzerlik kayıtları oluştur"""
+    with server.app.app_context():
+        db.drop_all()
+        db.create_all()
+
+        luxury = Brand(name='Test Lüks', type='luxury')
+        alternative = Brand(name='Test Alternatif', type='alternative')
+        family = PerfumeFamily(name='Oryantal')
+        notes = [Note(name=f'Nota {i}', type=('top', 'middle', 'base')[i % 3]) for i in range(20)]
+        db.session.add_all([luxury, alternative, family, *notes])
+        db.session.flush()
+
+        perfumes = []
+        for i in range(perfume_count):
+            brand = luxury if i % 2 == 0 else alternative
+            perfume = Perfume(name=f'Deneme {i}', brand_id=brand.id, family_id=family.id,
+                              gender='unisex', price=100 + i, rating=4)
+            db.session.add(perfume)
+            db.session.flush()
+            for j in range(notes_per_perfume):
+                db.session.add(PerfumeNote(perfume_id=perfume.id, note_id=notes[(i + j) % len(notes)].id))
+            perfumes.append(perfume)
+
+        for lux in perfumes[::2]:
+            for alt in perfumes[1::2][:5]:
+                db.session.add(PerfumeSimilarity(luxury_perfume_id=lux.id, alternative_perfume_id=alt.id,
+                                                 similarity_score=50, gender_match=True))
+        db.session.commit()
+        # Veritabanı içe aktarıcı dışında yeniden kuruldu
+        catalog_cache.bump()
+        return perfumes[0].id
+
+
+@contextmanager
+def count_queries():
+    """Blok içinde bu thread'de çalışan SQL ifadelerini say (arka plan yazıcıları hariç)"""
+    with server.app.app_context():
+        engine = db.engine
+    statements = []
+    thread_id = threading.get_ident()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() == thread_id:
+            statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def search_query_count(limit):
+    with count_queries() as statements:
+        response = client.post('/api/perfume/search', json={
+            'searchType': 'name', 'searchTerm': 'Deneme', 'limit': limit
+        })
+    assert response.status_code == 200
+    assert response.get_json()['count'] == limit
+    return len(statements)
+
+
+def test_name_search_query_count_is_constant():
+    populate()
+    small = search_query_count(2)
+    large = search_query_count(10)
+    assert small == large, f"limit=2: {small} sorgu, limit=10: {large} sorgu"
+    assert large <= MAX_QUERIES
+
+
+def test_detail_and_alternatives_query_count():
+    perfume_id = populate()
+    for url in (f'/api/perfume/{perfume_id}', f'/api/perfume/{perfume_id}/alternatives',
+                '/api/luxury-perfumes', '/api/popular-perfumes'):
+        with count_queries() as statements:
+            response = client.get(url)
+        assert response.status_code == 200, url
+        assert len(statements) <= MAX_QUERIES, f"{url}: {len(statements)} sorgu"
+
+
+def test_find_alternatives_query_count_is_constant():
+    perfume_id = populate()
+    counts = []
+    for min_similarity, limit in ((0, 2), (30, 5), (90, 20)):
+        with count_queries() as statements:
+            response = client.post('/api/find-alternatives', json={
+                'luxury_perfume_id': perfume_id, 'min_similarity': min_similarity,
+                'max_price': 110, 'limit': limit
+            })
+        assert response.status_code == 200
+        alternatives = response.get_json()['alternatives']
+        assert len(alternatives) <= limit
+        assert all(a['price'] <= 110 for a in alternatives)
+        counts.append(len(statements))
+    # Alternatifler için bir, lüks parfüm için bir JOIN sorgusu
+    assert counts == [2, 2, 2], f"sorgu sayıları: {counts}"
+
+
+def test_luxury_brand_stats_single_query():
+    populate()
+    with server.app.app_context():
+        db.session.add_all([Brand(name=f'Ek Lüks {i}', type='luxury') for i in range(15)])
+        db.session.commit()
+    catalog_cache.bump()
+
+    with count_queries() as statements:
+        response = client.get('/api/brands/luxury?stats=true')
+    assert response.status_code == 200
+    # Marka sayısından bağımsız tek GROUP BY sorgusu
+    assert len(statements) == 1, f"{len(statements)} sorgu"
+
+    brands = {brand['name']: brand for brand in response.get_json()}
+    assert len(brands) == 16
+    tested = brands['Test Lüks']
+    # 15 lüks parfüm (fiyat 100, 102, ... 128), hepsinin benzerlik kaydı var
+    assert tested['perfume_count'] == 15
+    assert tested['min_price'] == 100
+    assert tested['avg_price'] == 114
+    assert tested['similarity_coverage'] == 1.0
+    empty = brands['Ek Lüks 0']
+    assert empty['perfume_count'] == 0 and empty['min_price'] is None and empty['similarity_coverage'] == 0.0
+
+    plain = client.get('/api/brands/luxury').get_json()
+    assert 'min_price' not in plain[0] and plain[0]['perfume_count'] == 15
+
+
+if __name__ == '__main__':
+    for test in (test_name_search_query_count_is_constant, test_detail_and_alternatives_query_count,
+                 test_find_alternatives_query_count_is_constant, test_luxury_brand_stats_single_query):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
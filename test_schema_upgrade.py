@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Şema Yükseltme Testi
+create_all'ın var olan tablolara eklemediği idx_perfumes_brand_name benzersiz
+indeksinin açılışta (init_db -> upgrade_schema) idempotent olarak eklendiğini,
+toplu yazmanın ON CONFLICT (brand_id, name) hedefinin bundan sonra çalıştığını
+tekrar eden satırlar yüzünden kurulamayan indeksin açılışı durdurmadığını ve
+perfumes.search_vector sütunu yokken tam metin aramasının BM25'e düştüğünü
+doğrular (sütunu ekleyen adımlar sadece PostgreSQL'de çalışır). Bellekte
+SQLite kullanır.
+
+Kullanım:
+    python -m pytest test_schema_upgrade.py
+    python test_schema_upgrade.py
+"""
+
+import os
+from datetime import datetime
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from sqlalchemy import inspect, text
+
+import server
+from src.models.database import (
+    db, Brand, Perfume, has_search_vector, search_perfumes_by_text, upgrade_schema
+)
+from src.utils import bulk_loader
+
+
+def perfume_indexes():
+    return {index['name'] for index in inspect(db.engine).get_indexes('perfumes')}
+
+
+def legacy_database():
+    """Benzersiz indeksi olmayan, eski sürümden kalma perfumes tablosu"""
+    db.drop_all()
+    db.create_all()
+    db.session.execute(text('DROP INDEX idx_perfumes_brand_name'))
+    db.session.commit()
+    brand = Brand(name='Zara', type='alternative')
+    db.session.add(brand)
+    db.session.commit()
+    return brand.id
+
+
+def rows(brand_id, *names):
+    now = datetime.utcnow()
+    return [bulk_loader.perfume_row(brand_id, {'name': name, 'gender': 'unisex'}, now) for name in names]
+
+
+def test_upgrade_adds_unique_index_for_bulk_writes():
+    with server.app.app_context():
+        brand_id = legacy_database()
+        assert 'idx_perfumes_brand_name' not in perfume_indexes()
+
+        assert upgrade_schema() == ['idx_perfumes_brand_name']
+        assert 'idx_perfumes_brand_name' in perfume_indexes()
+        # İkinci çalıştırma hata vermez
+        assert upgrade_schema() == ['idx_perfumes_brand_name']
+
+        assert set(bulk_loader.write_perfumes(rows(brand_id, 'Red Vanilla', 'Vibrant Leather'))) == {
+            'Red Vanilla', 'Vibrant Leather'}
+        # Var olan isim ON CONFLICT ile atlanır
+        assert set(bulk_loader.write_perfumes(rows(brand_id, 'Red Vanilla', 'Tuberose'))) == {'Tuberose'}
+        db.session.commit()
+        assert Perfume.query.count() == 3
+
+
+def test_duplicate_rows_do_not_block_startup():
+    with server.app.app_context():
+        brand_id = legacy_database()
+        db.session.add_all([Perfume(name='Red Vanilla', brand_id=brand_id, gender='unisex') for _ in range(2)])
+        db.session.commit()
+
+        assert upgrade_schema() == []
+        assert 'idx_perfumes_brand_name' not in perfume_indexes()
+
+        # Tekrarlar temizlenince bir sonraki açılışta indeks kurulur
+        Perfume.query.filter(Perfume.id == Perfume.query.order_by(Perfume.id.desc()).first().id).delete()
+        db.session.commit()
+        assert upgrade_schema() == ['idx_perfumes_brand_name']
+
+
+def test_text_search_without_search_vector():
+    with server.app.app_context():
+        brand_id = legacy_database()
+        db.session.add(Perfume(name='Red Vanilla', brand_id=brand_id, gender='unisex',
+                               description='Vanilya ve karamel'))
+        db.session.commit()
+
+        # PostgreSQL'e özel adımlar (tsvector sütunu, GIN indeksi) atlanır
+        assert upgrade_schema() == ['idx_perfumes_brand_name']
+        assert not has_search_vector()
+        assert [p.name for p in search_perfumes_by_text('vanilya')] == ['Red Vanilla']
+
+        # Sütun sonradan eklenirse bir sonraki yükseltmede görülür
+        db.session.execute(text('ALTER TABLE perfumes ADD COLUMN search_vector TEXT'))
+        db.session.commit()
+        assert not has_search_vector()
+        upgrade_schema()
+        assert has_search_vector()
+
+
+if __name__ == '__main__':
+    for test in (test_upgrade_adds_unique_index_for_bulk_writes, test_duplicate_rows_do_not_block_startup,
+                 test_text_search_without_search_vector):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Arama Geçmişi Yazıcısı Testi
+/api/perfume/search isteklerinin arama geçmişini istek içinde yazmadığını,
+kayıtların arka plan yazıcısı tarafından results_count ile toplu yazıldığını
+kuyruk dolduğunda düşürülen olayların sayıldığını ve geçersiz arama tipli
+bir olayın batch'teki geçerli olayları kaybettirmediğini doğrular.
+
+Kullanım:
+    python -m pytest test_search_history.py
+    python test_search_history.py
+"""
+
+import os
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+import server
+from src.models.database import db, SearchHistory
+from src.utils.search_history_writer import SearchHistoryWriter
+from test_query_count import client, count_queries, populate
+
+
+def test_search_does_not_write_in_request():
+    populate()
+    with count_queries() as statements:
+        response = client.post('/api/perfume/search', json={
+            'searchType': 'name', 'searchTerm': 'Deneme', 'limit': 4
+        })
+    assert response.status_code == 200
+    assert not [s for s in statements if s.lstrip().upper().startswith('INSERT')]
+
+
+def test_history_is_flushed_with_results_count():
+    # Önceki testlerden kalan olaylar yeni tabloya yazılmasın
+    server.search_history_writer.flush()
+    populate()
+    written = server.search_history_writer.written
+    for term, limit in (('Deneme', 3), ('Deneme 1', 1), ('olmayan parfüm', 5)):
+        client.post('/api/perfume/search', json={'searchType': 'name', 'searchTerm': term, 'limit': limit})
+
+    server.search_history_writer.flush()
+    assert server.search_history_writer.written - written == 3
+    with server.app.app_context():
+        rows = SearchHistory.query.order_by(SearchHistory.id).all()
+        counts = {row.search_term: row.results_count for row in rows}
+        assert all(row.created_at is not None for row in rows)
+    assert counts == {'Deneme': 3, 'Deneme 1': 1, 'olmayan parfüm': 0}
+
+
+def test_backpressure_drops_are_counted():
+    populate()
+    writer = SearchHistoryWriter(server.app, max_queue=2, batch_size=100, flush_interval=60)
+    accepted = [writer.record(f'terim {i}', 'name', results_count=i) for i in range(5)]
+    assert accepted == [True, True, False, False, False]
+    assert writer.stats()['dropped'] == 3
+
+    writer.stop()
+    assert writer.stats()['written'] == 2
+    assert writer.stats()['queued'] == 0
+    with server.app.app_context():
+        assert db.session.query(SearchHistory).filter(SearchHistory.search_term.like('terim %')).count() == 2
+
+
+def test_invalid_search_type_does_not_drop_batch():
+    populate()
+    writer = SearchHistoryWriter(server.app, batch_size=100, flush_interval=60, rollups=server.popularity_rollups)
+    assert writer.record('marka 1', 'name')
+    # index.html 'brand' gönderir; CHECK kısıtında yok
+    assert not writer.record('Dior', 'brand')
+    assert writer.record('marka 2', 'notes')
+    assert writer.stats()['rejected'] == 1
+
+    # Kısıta takılan bir kayıt (ör. eski bir istemciden) batch'in geri kalanını kaybettirmez
+    writer._queue.put_nowait({'search_term': 'Dior', 'search_type': 'brand', 'results_count': 0,
+                              'ip_address': None, 'user_agent': None, 'created_at': None})
+    assert writer.record('marka 3', 'text')
+
+    assert writer.flush() == 3
+    stats = writer.stats()
+    assert stats['written'] == 3 and stats['failed'] == 1 and stats['queued'] == 0
+    with server.app.app_context():
+        terms = {row.search_term for row in SearchHistory.query.filter(SearchHistory.search_term != 'Deneme')}
+    assert terms == {'marka 1', 'marka 2', 'marka 3'}
+
+
+def test_test_server_writer_has_no_background_thread():
+    # Bellek içi SQLite: tek paylaşılan bağlantı, yazma sadece flush() ile
+    assert not server.search_history_writer.background
+    client.post('/api/perfume/search', json={'searchType': 'name', 'searchTerm': 'Deneme', 'limit': 1})
+    assert server.search_history_writer._thread is None
+    assert server.search_history_writer.stats()['queued'] >= 1
+    server.search_history_writer.flush()
+    assert server.search_history_writer.stats()['queued'] == 0
+
+
+if __name__ == '__main__':
+    for test in (test_search_does_not_write_in_request, test_history_is_flushed_with_results_count,
+                 test_backpressure_drops_are_counted, test_invalid_search_type_does_not_drop_batch,
+                 test_test_server_writer_has_no_background_thread):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Vektörel Benzerlik Motoru Testi
+Paketlenmiş bit matrisleriyle hesaplanan Jaccard skorlarının küme tabanlı
+Jaccard ile aynı olduğunu ve paylaşılan bellekli çok süreçli skorlamanın
+tek süreçli skorlamayla aynı eşleşmeleri ürettiğini doğrular (boş nota
+kümeleri, satırdan fazla süreç ve boş katalog dahil).
+
+Kullanım:
+    python -m pytest test_similarity_engine.py
+    python test_similarity_engine.py
+"""
+
+import random
+
+import numpy as np
+
+from src.utils.similarity_engine import NoteMatrix, NoteVocabulary, block_matches, pairwise_jaccard
+from src.utils.similarity_shards import score_sharded, shard_metadata
+
+NOTES = [f'nota {i}' for i in range(40)]
+GENDERS = ['men', 'women', 'unisex']
+
+
+def note_sets(rng, count):
+    # Boş kümeler de olsun
+    return [set(rng.sample(NOTES, rng.randint(0, 8))) for _ in range(count)]
+
+
+def set_jaccard(left, right):
+    union = left | right
+    return len(left & right) / len(union) if union else 0.0
+
+
+def test_packed_jaccard_matches_sets():
+    rng = random.Random(3)
+    luxury_sets, alternative_sets = note_sets(rng, 25), note_sets(rng, 31)
+    vocabulary = NoteVocabulary()
+    luxury = NoteMatrix.from_note_sets(vocabulary, luxury_sets)
+    # Sözlük ikinci katalogla büyür: genişlikler farklı, pairwise_jaccard eşitler
+    alternative = NoteMatrix.from_note_sets(vocabulary, alternative_sets + [{'yeni nota'}])
+    alternative_sets = alternative_sets + [{'yeni nota'}]
+
+    expected = np.array([[set_jaccard(l, a) for a in alternative_sets] for l in luxury_sets])
+    assert np.allclose(pairwise_jaccard(luxury, alternative), expected)
+    assert np.allclose(pairwise_jaccard(luxury, alternative, slice(5, 9)), expected[5:9])
+
+    for query in luxury_sets[:10] + [set(), {'yeni nota', 'sözlükte yok'}]:
+        ids = vocabulary.encode(query, create=False)
+        scores = alternative.jaccard(ids, vocabulary.distinct_count(query))
+        assert np.allclose(scores, [set_jaccard(query, a) for a in alternative_sets]), query
+
+
+def single_process(luxury, alternative, metadata, min_score):
+    rows, columns, scores = block_matches(
+        pairwise_jaccard(luxury, alternative),
+        metadata['luxury_genders'], metadata['luxury_families'],
+        metadata['alternative_genders'], metadata['alternative_families'], min_score
+    )
+    return sorted(zip(rows.tolist(), columns.tolist(), scores.tolist()))
+
+
+def sharded(luxury, alternative, metadata, workers, block_size, min_score):
+    pairs, matches = 0, []
+    for scored, rows, columns, scores in score_sharded(
+            luxury.dense(), luxury.sizes, alternative.dense(), alternative.sizes,
+            metadata, workers, block_size, min_score):
+        pairs += scored
+        matches.extend(zip(rows.tolist(), columns.tolist(), scores.tolist()))
+    return pairs, sorted(matches)
+
+
+def catalog(rng, luxury_count, alternative_count):
+    # Hat gibi: önce tüm notalar sözlüğe, sonra aynı genişlikte iki matris
+    vocabulary = NoteVocabulary()
+    luxury_rows = [vocabulary.encode(notes) for notes in note_sets(rng, luxury_count)]
+    alternative_rows = [vocabulary.encode(notes) for notes in note_sets(rng, alternative_count)]
+    luxury, alternative = NoteMatrix(vocabulary, luxury_rows), NoteMatrix(vocabulary, alternative_rows)
+    metadata = shard_metadata(
+        [rng.choice(GENDERS) for _ in range(luxury_count)], [rng.randint(-1, 2) for _ in range(luxury_count)],
+        [rng.choice(GENDERS) for _ in range(alternative_count)], [rng.randint(-1, 2) for _ in range(alternative_count)]
+    )
+    return luxury, alternative, metadata
+
+
+def test_sharded_matches_single_process():
+    rng = random.Random(5)
+    for luxury_count, alternative_count, workers, block_size in (
+            (37, 29, 3, 8),    # birden çok blok
+            (3, 12, 4, 1),     # satırdan fazla süreç
+            (5, 7, 2, 64),     # tek blok
+            (0, 9, 2, 4),      # boş lüks katalog
+    ):
+        luxury, alternative, metadata = catalog(rng, luxury_count, alternative_count)
+        for min_score in (0, 30):
+            expected = single_process(luxury, alternative, metadata, min_score)
+            pairs, matches = sharded(luxury, alternative, metadata, workers, block_size, min_score)
+            assert pairs == luxury_count * alternative_count
+            assert len(matches) == len(expected)
+            assert all(m[:2] == e[:2] and abs(m[2] - e[2]) < 1e-9 for m, e in zip(matches, expected)), (
+                luxury_count, workers)
+
+
+if __name__ == '__main__':
+    for test in (test_packed_jaccard_matches_sets, test_sharded_matches_single_process):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benzerlik Hattı Testi
+SimilarityPipeline'ın yazdığı skorların tek çiftlik calculate_similarity_score
+ile aynı olduğunu, değişikliklerden sonra artımlı çalıştırmanın tam yeniden
+hesaplamayla aynı tabloyu ürettiğini ve değişiklik yokken hiçbir çiftin
+yeniden hesaplanmadığını doğrular. Bellekte SQLite kullanır.
+
+Kullanım:
+    python -m pytest test_similarity_pipeline.py
+    python test_similarity_pipeline.py
+"""
+
+import os
+import random
+from decimal import Decimal
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+import server
+from src.models.database import (
+    db, Brand, Note, Perfume, PerfumeFamily, PerfumeNote, PerfumeSimilarity, calculate_similarity_score
+)
+from src.utils.data_importer import DataImporter
+from src.utils.similarity_pipeline import MIN_SCORE, SimilarityPipeline
+
+NOTES = ['Gül', 'Rose', 'Misk', 'Musk', 'Vanilya', 'Sedir', 'Bergamot', 'Deri', 'Amber', 'Paçuli', 'Iris']
+GENDERS = ['men', 'women', 'unisex']
+
+
+def populate(seed=7):
+    rng = random.Random(seed)
+    with server.app.app_context():
+        db.drop_all()
+        db.create_all()
+
+        brands = {brand_type: Brand(name=f'{brand_type} marka', type=brand_type)
+                  for brand_type in ('luxury', 'alternative')}
+        families = [PerfumeFamily(name=name) for name in ('Odunsu', 'Çiçeksi')]
+        notes = [Note(name=name, type='middle') for name in NOTES]
+        db.session.add_all([*brands.values(), *families, *notes])
+        db.session.flush()
+
+        for brand_type, count in (('luxury', 14), ('alternative', 23)):
+            for i in range(count):
+                family = rng.choice(families + [None])
+                perfume = Perfume(
+                    name=f'{brand_type} {i}', brand_id=brands[brand_type].id, gender=rng.choice(GENDERS),
+                    family_id=family.id if family else None, price=Decimal(rng.randint(100, 900))
+                )
+                db.session.add(perfume)
+                db.session.flush()
+                # Notasız parfümler de olsun
+                for note in rng.sample(notes, rng.randint(0, 5)):
+                    db.session.add(PerfumeNote(perfume_id=perfume.id, note_id=note.id))
+        db.session.commit()
+
+
+def similarity_rows():
+    return sorted(
+        (row.luxury_perfume_id, row.alternative_perfume_id, str(row.similarity_score), row.gender_match,
+         str(row.price_difference))
+        for row in PerfumeSimilarity.query.all()
+    )
+
+
+def expected_scores():
+    """Tüm çiftler için tek çiftlik skor (eşik üstündekiler)"""
+    luxury = Perfume.query.join(Brand).filter(Brand.type == 'luxury').all()
+    alternative = Perfume.query.join(Brand).filter(Brand.type == 'alternative').all()
+    expected = {}
+    for lux in luxury:
+        for alt in alternative:
+            score = calculate_similarity_score(lux, alt)
+            if score >= MIN_SCORE:
+                expected[(lux.id, alt.id)] = round(score, 2)
+    return expected
+
+
+def test_pipeline_matches_pairwise_score():
+    populate()
+    with server.app.app_context():
+        stats = SimilarityPipeline(block_size=4).run_full()
+        expected = expected_scores()
+        rows = {(row.luxury_perfume_id, row.alternative_perfume_id): float(row.similarity_score)
+                for row in PerfumeSimilarity.query.all()}
+        assert stats['pairs_scored'] == 14 * 23
+        assert set(rows) == set(expected)
+        assert all(abs(rows[pair] - expected[pair]) < 0.011 for pair in expected)
+
+
+def test_incremental_after_mutations_matches_full_rebuild():
+    populate()
+    with server.app.app_context():
+        DataImporter().calculate_all_similarities(full_rebuild=True)
+
+        luxury = Perfume.query.filter_by(name='luxury 0').one()
+        PerfumeNote.query.filter_by(perfume_id=luxury.id).delete()
+        db.session.add(PerfumeNote(perfume_id=luxury.id, note_id=Note.query.filter_by(name='Misk').one().id))
+        changed = Perfume.query.filter_by(name='alternative 1').one()
+        changed.gender = 'men' if changed.gender != 'men' else 'women'
+        Perfume.query.filter_by(name='alternative 2').one().price = Decimal(1)
+        # Kaldırılan parfümün benzerlik satırları artımlı çalıştırmaya kalır
+        removed = Perfume.query.filter_by(name='alternative 3').one()
+        PerfumeNote.query.filter_by(perfume_id=removed.id).delete()
+        Perfume.query.filter_by(id=removed.id).delete()
+        brand = Brand.query.filter_by(type='alternative').one()
+        added = Perfume(name='alternative yeni', brand_id=brand.id, gender='women')
+        db.session.add(added)
+        db.session.flush()
+        db.session.add(PerfumeNote(perfume_id=added.id, note_id=Note.query.filter_by(name='Rose').one().id))
+        db.session.commit()
+
+        stats = DataImporter().calculate_all_similarities()
+        assert stats['mode'] == 'incremental'
+        assert stats['changed_luxury'] == 1 and stats['changed_alternative'] == 3
+        assert stats['removed_perfumes'] == 1
+        assert 0 < stats['pairs_recomputed'] < 14 * 23
+        incremental = similarity_rows()
+
+        SimilarityPipeline(block_size=4).run_full()
+        assert incremental == similarity_rows()
+
+
+def test_noop_incremental_recomputes_nothing():
+    populate()
+    with server.app.app_context():
+        SimilarityPipeline().run_full()
+        before = similarity_rows()
+        stats = SimilarityPipeline().run_incremental()
+        assert stats['pairs_recomputed'] == 0
+        assert stats['rows_deleted'] == 0 and stats['rows_written'] == 0
+        assert similarity_rows() == before
+
+
+if __name__ == '__main__':
+    for test in (test_pipeline_matches_pairwise_score, test_incremental_after_mutations_matches_full_rebuild,
+                 test_noop_incremental_recomputes_nothing):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
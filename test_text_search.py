@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tam Metin Arama Testi
+searchType 'text' için SQLite (süreç içi BM25) yolunu ve JSON katalog
+indeksini dener: Türkçe ekli kelimeler köklerine indirgenmeli, sonuçlar
+skora göre sıralı gelmeli. Bellekte SQLite kullanır.
+
+Kullanım:
+    python -m pytest test_text_search.py
+    python test_text_search.py
+"""
+
+import os
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+import server
+from src.models.database import db, Brand, Perfume
+from src.utils.bm25 import tokenize
+from src.utils.search_index import PerfumeSearchIndex
+
+client = server.app.test_client()
+
+DESCRIPTIONS = [
+    ('Ferah Akşam', 'Turunçgillerin ferah açılışı, zencefil ve fesleğenle devam eder.'),
+    ('Gül Bahçesi', 'Çiçeklerin kraliçesi gül ve yasemin; çiçeksi ve romantik.'),
+    ('Odunsu Gece', 'Sandal ağacı ve sedir ile odunsu, kalıcı bir iz bırakır.'),
+    ('Fresh Citrus', 'A fresh citrus opening with ginger and basil.'),
+    ('Pudralı Süsen', 'İris ve menekşe; pudralı ve zarif.'),
+]
+
+
+def populate():
+    with server.app.app_context():
+        db.drop_all()
+        db.create_all()
+
+        brand = Brand(name='Test Marka', type='alternative')
+        db.session.add(brand)
+        db.session.flush()
+        for name, description in DESCRIPTIONS:
+            db.session.add(Perfume(name=name, brand_id=brand.id, gender='unisex', description=description))
+        db.session.commit()
+
+
+def test_turkish_suffixes_share_a_stem():
+    assert tokenize('çiçeklerin') == tokenize('Çiçek')
+    assert tokenize('turunçgillerin') == tokenize('turunçgil')
+    assert tokenize('IRMAK') == tokenize('ırmak')
+
+
+def test_text_search_endpoint():
+    populate()
+    response = client.post('/api/perfume/search', json={
+        'searchType': 'text', 'searchTerm': 'çiçek gül'
+    })
+    assert response.status_code == 200
+    names = [r['name'] for r in response.get_json()['results']]
+    assert names == ['Gül Bahçesi']
+
+    response = client.post('/api/perfume/search', json={
+        'searchType': 'text', 'searchTerm': 'ferah zencefil'
+    })
+    names = [r['name'] for r in response.get_json()['results']]
+    assert names[0] == 'Ferah Akşam'
+
+    # 'İ' str.lower() ile 'i̇' olur; terim BM25'e ham iletilmeli
+    response = client.post('/api/perfume/search', json={
+        'searchType': 'text', 'searchTerm': 'İRİS'
+    })
+    names = [r['name'] for r in response.get_json()['results']]
+    assert names == ['Pudralı Süsen']
+
+
+def test_json_catalog_text_search_with_filters():
+    perfumes = [
+        {'id': str(i), 'name': name, 'description': description,
+         'gender': 'women' if i % 2 else 'men', 'notes': {}, 'brand': {'name': 'Test'}}
+        for i, (name, description) in enumerate(DESCRIPTIONS)
+    ]
+    index = PerfumeSearchIndex(perfumes)
+    assert [p['name'] for p in index.search('odunsu', 'text')] == ['Odunsu Gece']
+    # Cinsiyet filtresi BM25 sonuçlarına maske olarak uygulanır
+    assert [p['name'] for p in index.search('ferah fresh', 'text', gender='women')] == ['Fresh Citrus']
+    assert [p['name'] for p in index.search('İris', 'text')] == ['Pudralı Süsen']
+
+
+if __name__ == '__main__':
+    for test in (test_turkish_suffixes_share_a_stem, test_text_search_endpoint,
+                 test_json_catalog_text_search_with_filters):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")